@@ -1,41 +1,85 @@
-from dash import Dash, html, dcc
-import dash
-
-
-app = Dash(
-    __name__,
-    use_pages=True,
-    suppress_callback_exceptions=True
-)
-
-
-app.layout = html.Div(children=[
-    # Crear un contenedor para el encabezado
-    html.Div(className='header', children=[
-        html.Img(className='sm_logo', src='assets/imgs/UNMSM.png'),  # Incluir una imagen en el encabezado
-        html.H1('Técnicas de Modelamiento', className='main_title'),  # Título principal de la aplicación
-        # Agregar un contenedor para el nombre y el código
-        html.Div(children=[
-            html.H3('Carlos Josué Pariguana Angulo', className='name'),
-            html.H4('Código: 21140100', className='code')
-        ], className='name_code')
-    ]),
-
-    html.Div(className='contenedor_navegacion', children=[
-
-        dcc.Link(html.Button('Ley de Enfriamiento de Newton', className='boton edo_1'), href='/'),
-        dcc.Link(html.Button('Modelo de Crecimiento Logístico', className='boton edo_2'), href='/edo2'),
-        dcc.Link(html.Button('Modelo de Decaimiento Radioactivo', className='boton edo_3'), href='/edo3'),
-        dcc.Link(html.Button('Ecuación de Crecimiento Exponencial', className='boton edo_4'), href='/edo4'),
-        dcc.Link(html.Button('Modelo SIR', className='boton edo_5'), href='/edo5'),  # Cuarto intento para el botón del modelo SIR.
-        dcc.Link(html.Button('Modelo de Lotka-Volterra', className='boton edo_6'), href='/edo6'),  # Segundo intento del boton de L-V
-        dcc.Link(html.Button('Otro Modelo', className='boton edo_7'), href='/edo7') #tercer intento para el botón que haremos ws
-    ]),
-
-    dash.page_container
-
-])
-
-
-if __name__ == '__main__':
-    app.run(debug=True, port='1256')
+import uuid
+from dash import Dash, html, dcc
+import dash
+from utils.api import api
+from utils.metricas import instrumentar, exponer_metricas
+from utils.coalescencia import ID_PESTANA, registrar_sesiones
+from utils.figuras import PLANTILLA
+
+# Compresión gzip/brotli de las respuestas (opcional: pip install flask-compress brotli)
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+
+app = Dash(
+    __name__,
+    use_pages=True,
+    suppress_callback_exceptions=True
+)
+
+if Compress is not None:
+    # Brotli si el navegador lo acepta, si no gzip; las figuras van como JSON
+    app.server.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.server.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html', 'text/css', 'application/javascript']
+    Compress(app.server)
+
+# Rutas REST con los resultados de los modelos (/api/modelos)
+app.server.register_blueprint(api)
+
+# Tiempos, errores y bytes de los callbacks de las páginas, en formato Prometheus (/metrics)
+instrumentar('pages')
+app.server.add_url_rule('/metrics', 'metricas', exponer_metricas)
+
+# Cookie de sesión: identifica las peticiones de un mismo navegador para descartar las superadas
+registrar_sesiones(app.server)
+
+
+# Contenido fijo del layout (se arma una vez)
+CONTENIDO = [
+    # Crear un contenedor para el encabezado
+    html.Div(className='header', children=[
+        html.Img(className='sm_logo', src='assets/imgs/UNMSM.png'),  # Incluir una imagen en el encabezado
+        html.H1('Técnicas de Modelamiento', className='main_title'),  # Título principal de la aplicación
+        # Agregar un contenedor para el nombre y el código
+        html.Div(children=[
+            html.H3('Carlos Josué Pariguana Angulo', className='name'),
+            html.H4('Código: 21140100', className='code')
+        ], className='name_code')
+    ]),
+
+    html.Div(className='contenedor_navegacion', children=[
+
+        dcc.Link(html.Button('Ley de Enfriamiento de Newton', className='boton edo_1'), href='/'),
+        dcc.Link(html.Button('Modelo de Crecimiento Logístico', className='boton edo_2'), href='/edo2'),
+        dcc.Link(html.Button('Modelo de Decaimiento Radioactivo', className='boton edo_3'), href='/edo3'),
+        dcc.Link(html.Button('Ecuación de Crecimiento Exponencial', className='boton edo_4'), href='/edo4'),
+        dcc.Link(html.Button('Modelo SIR', className='boton edo_5'), href='/edo5'),  # Cuarto intento para el botón del modelo SIR.
+        dcc.Link(html.Button('Modelo de Lotka-Volterra', className='boton edo_6'), href='/edo6'),  # Segundo intento del boton de L-V
+        dcc.Link(html.Button('Otro Modelo', className='boton edo_7'), href='/edo7'), #tercer intento para el botón que haremos ws
+        dcc.Link(html.Button('Barrido SIR', className='boton edo_8'), href='/edo8'),
+        dcc.Link(html.Button('Retrato de Fase L-V', className='boton edo_9'), href='/edo9')
+    ]),
+
+    dash.page_container,
+
+    # Plantilla de Plotly para las figuras que se calculan en el navegador (assets/modelos_cliente.js)
+    dcc.Store(id='plantilla_plotly', data=PLANTILLA)
+]
+
+
+def layout():
+    # Se arma en cada carga de la página: cada pestaña recibe su propio id (ver coalescencia.solo_vigentes)
+    return html.Div(children=CONTENIDO + [dcc.Store(id=ID_PESTANA, data=uuid.uuid4().hex)])
+
+app.layout = layout
+
+
+# Servidor de desarrollo. En producción: gunicorn -c gunicorn.conf.py wsgi:server (ver wsgi.py)
+if __name__ == '__main__':
+    # Compilar los núcleos de Numba (o cargarlos de la caché) mientras el servidor arranca
+    from utils.nucleos import precompilar_en_segundo_plano
+    precompilar_en_segundo_plano()
+
+    app.run(debug=True, port='1256')
@@ -0,0 +1,228 @@
+/**
+ * Evaluación en el navegador de los modelos con solución exacta.
+ *
+ * Cada función reproduce la figura de su versión en Python (utils/funciones.py
+ * y utils/campo_vectores.py), así las páginas 1 a 4 no necesitan ir al servidor
+ * mientras el usuario escribe. Si el modo servidor está activo solo se avisa
+ * al callback de Python a través de un dcc.Store.
+ */
+(function () {
+
+    /** Igual que np.linspace: el último punto es exactamente `fin` */
+    function linspace(inicio, fin, cant) {
+        var valores = new Array(cant);
+        var paso = cant > 1 ? (fin - inicio) / (cant - 1) : 0;
+        for (var i = 0; i < cant; i++) {
+            valores[i] = i * paso + inicio;
+        }
+        if (cant > 1) {
+            valores[cant - 1] = fin;
+        }
+        return valores;
+    }
+
+    /** Igual que coordenadas_campo_vectores con u = 1: primero los tallos y luego las puntas */
+    function campoVectores(t_values, y_values, pendiente, scale) {
+        var arrowScale = 0.3;
+        var angulo = Math.PI / 9;
+        var tallosX = [], tallosY = [], puntasX = [], puntasY = [];
+
+        for (var i = 0; i < y_values.length; i++) {
+            for (var j = 0; j < t_values.length; j++) {
+                var x = t_values[j], y = y_values[i];
+                var dx = scale, dy = pendiente(x, y) * scale;
+                var finX = x + dx, finY = y + dy;
+                var largo = Math.hypot(dx, dy) * arrowScale;
+                var tallo = Math.atan2(dy, dx);
+
+                tallosX.push(x, finX, NaN);
+                tallosY.push(y, finY, NaN);
+                puntasX.push(finX - largo * Math.cos(tallo + angulo), finX, finX - largo * Math.cos(tallo - angulo), NaN);
+                puntasY.push(finY - largo * Math.sin(tallo + angulo), finY, finY - largo * Math.sin(tallo - angulo), NaN);
+            }
+        }
+
+        return {
+            type: 'scatter',
+            x: tallosX.concat(puntasX),
+            y: tallosY.concat(puntasY),
+            mode: 'lines',
+            line: {color: 'black', width: 1},
+            showlegend: false
+        };
+    }
+
+    function eje(titulo, extra) {
+        return Object.assign({
+            title: {text: titulo},
+            mirror: true,
+            showline: true,
+            linecolor: 'green',
+            gridcolor: 'gray',
+            showgrid: false
+        }, extra || {});
+    }
+
+    function layout(plantilla, titulo, ejeX, ejeY, show_field) {
+        var resultado = {
+            title: {text: titulo, x: 0.5, y: 0.92, xanchor: 'center'},
+            xaxis: ejeX,
+            yaxis: ejeY,
+            width: 800,
+            template: plantilla,
+            margin: {l: 10, r: 10, t: 90, b: 0},
+            legend: {orientation: 'h', y: 1.1}
+        };
+        if (show_field) {
+            resultado.hovermode = 'closest';
+        }
+        return resultado;
+    }
+
+    function faltan(valores) {
+        return valores.some(function (v) { return v === null || v === undefined || v === ''; });
+    }
+
+    /**
+     * Envuelve una función de figura para el modo cliente/servidor: retorna
+     * [figura, no_update] o, con el modo servidor activo, [no_update, aviso] donde
+     * el aviso lleva una marca de tiempo y los ids que dispararon el cambio.
+     */
+    function modo(construir) {
+        return function () {
+            var args = Array.prototype.slice.call(arguments);
+            var plantilla = args.pop();
+            var modo_calculo = args.pop() || [];
+            var sin_cambio = window.dash_clientside.no_update;
+
+            if (modo_calculo.indexOf('servidor') !== -1) {
+                var disparadores = window.dash_clientside.callback_context.triggered.map(function (t) {
+                    return t.prop_id.split('.')[0];
+                });
+                return [sin_cambio, {marca: Date.now(), disparadores: disparadores}];
+            }
+            if (faltan(args)) {
+                return [sin_cambio, sin_cambio];
+            }
+            return [construir.apply(null, args.concat([plantilla])), sin_cambio];
+        };
+    }
+
+    function ley_enfriamiento_newton(T0, t0, t, k, Ta, cant, scale, toggle_vectors, plantilla) {
+        var show_field = toggle_vectors.indexOf('show_field') !== -1;
+        var t_values = linspace(0, t, cant);
+        var data = [];
+
+        if (show_field) {
+            data.push(campoVectores(t_values, linspace(0, T0, cant), function (ti, T) { return k * (T - Ta); }, scale));
+        }
+        data.push({
+            type: 'scatter',
+            x: t_values,
+            y: t_values.map(function (ti) { return (T0 - Ta) * Math.exp(k * ti) + Ta; }),
+            line: {color: 'blue'},
+            name: 'Ley de enfriamiento de Newton'
+        });
+        data.push({
+            type: 'scatter',
+            x: [0, t],
+            y: [Ta, Ta],
+            mode: 'lines',
+            line: {color: 'red', dash: 'dash'},
+            name: 'Temperatura Ambiente'
+        });
+
+        return {
+            data: data,
+            layout: layout(plantilla, 'Campo de vectores de dT/dt = k(T-Ta)', eje('Tiempo (t)'), eje('Temperatura (T)'), show_field)
+        };
+    }
+
+    function ecuacion_logistica(P0, t0, t, r, K, cant, scale, toggle_vectors, plantilla) {
+        var show_field = toggle_vectors.indexOf('show_field') !== -1;
+        var t_values = linspace(0, t, cant);
+        var data = [];
+
+        if (show_field) {
+            data.push(campoVectores(t_values, linspace(0, K + 5, cant), function (ti, P) { return r * P * (1 - P / K); }, scale));
+        }
+        data.push({
+            type: 'scatter',
+            x: t_values,
+            y: t_values.map(function (ti) {
+                return K * P0 * Math.exp(r * ti) / (P0 * Math.exp(r * ti) + (K - P0) * Math.exp(r * t0));
+            }),
+            line: {color: 'blue'},
+            name: 'Ecuación Logística'
+        });
+        data.push({
+            type: 'scatter',
+            x: [0, t],
+            y: [K, K],
+            mode: 'lines',
+            line: {color: 'red', dash: 'dash'},
+            name: 'Capacidad de carga'
+        });
+
+        return {
+            data: data,
+            layout: layout(plantilla, 'Campo de vectores de dP/dt = rP(1 - P/K)', eje('Tiempo (t)'), eje('Población (P)'), show_field)
+        };
+    }
+
+    function modelo_decaimiento_radioactivo(N0, t0, t, k, cant, scale, toggle_vectors, plantilla) {
+        var show_field = toggle_vectors.indexOf('show_field') !== -1;
+        var t_values = linspace(t0, t, cant);
+        var data = [];
+
+        if (show_field) {
+            data.push(campoVectores(t_values, linspace(0, N0, cant), function (ti, N) { return -k * N; }, scale));
+        }
+        data.push({
+            type: 'scatter',
+            x: t_values,
+            y: t_values.map(function (ti) { return N0 * Math.exp(-k * ti); }),
+            line: {color: 'blue'},
+            name: 'Modelo de Decaimiento Radioactivo'
+        });
+
+        var titulo = show_field ? 'Campo de vectores de dN/dt = -kN' : 'Decaimiento Radioactivo';
+        return {
+            data: data,
+            layout: layout(plantilla, titulo, eje('Tiempo (t)'), eje('Número de Núcleos (N)'), show_field)
+        };
+    }
+
+    function modelo_crecimiento_exponencial(N0, t0, t, r, cant, scale, toggle_vectors, plantilla) {
+        var show_field = toggle_vectors.indexOf('show_field') !== -1;
+        var t_values = linspace(t0, t, cant);
+        var data = [];
+
+        if (show_field) {
+            data.push(campoVectores(t_values, linspace(0, N0 * 2, cant), function (ti, N) { return r * N; }, scale));
+        }
+        data.push({
+            type: 'scatter',
+            x: t_values,
+            y: t_values.map(function (ti) { return N0 * Math.exp(r * ti); }),
+            line: {color: 'blue'},
+            name: 'Crecimiento Exponencial'
+        });
+
+        var titulo = show_field ? 'Campo de vectores de dN/dt = rN' : 'Crecimiento Exponencial';
+        return {
+            data: data,
+            layout: layout(plantilla, titulo, eje('Tiempo (t)', {range: [0, t]}), eje('Población (N)'), show_field)
+        };
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        modelos: {
+            ley_enfriamiento_newton: modo(ley_enfriamiento_newton),
+            ecuacion_logistica: modo(ecuacion_logistica),
+            modelo_decaimiento_radioactivo: modo(modelo_decaimiento_radioactivo),
+            modelo_crecimiento_exponencial: modo(modelo_crecimiento_exponencial)
+        }
+    });
+
+})();
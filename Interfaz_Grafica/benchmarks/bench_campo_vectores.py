@@ -0,0 +1,62 @@
+"""
+Compara `plotly.figure_factory.create_quiver` con `utils.crear_campo_vectores`.
+
+Uso (desde la carpeta Interfaz_Grafica):
+
+    python -m benchmarks.bench_campo_vectores [--completo]
+
+`create_quiver` recalcula las puntas dentro de un bucle por flecha (costo
+cuadrático), por lo que con 200x200 tarda horas; solo se mide con `--completo`.
+"""
+import sys
+import time
+import numpy as np
+import plotly.figure_factory as ff
+from utils.campo_vectores import coordenadas_campo_vectores, crear_campo_vectores
+
+
+def medir(funcion, repeticiones: int):
+    """
+    Retorna el mejor tiempo (en segundos) de `repeticiones` llamadas a `funcion`.
+    """
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+def malla(n: int):
+    """
+    Retorna una malla n x n con el campo de la ecuación logística (el peor caso de las páginas).
+    """
+    t_values = np.linspace(0, 60, n)
+    P_values = np.linspace(0, 155, n)
+    T, P = np.meshgrid(t_values, P_values)
+    return T, P, np.ones_like(T), 0.15 * P * (1 - P / 150)
+
+def comprobar(n: int = 15):
+    """
+    Verifica que la geometría coincida con la de `create_quiver`.
+    """
+    T, P, U, V = malla(n)
+    referencia = ff.create_quiver(T, P, U, V, scale=1).data[0]
+    x, y = coordenadas_campo_vectores(T, P, U, V, scale=1)
+    ref_x = np.array(referencia.x, dtype=float)
+    ref_y = np.array(referencia.y, dtype=float)
+    assert np.allclose(x, ref_x, equal_nan=True) and np.allclose(y, ref_y, equal_nan=True)
+
+
+if __name__ == '__main__':
+    comprobar()
+
+    completo = '--completo' in sys.argv
+
+    for n in (15, 25, 40, 200):
+        T, P, U, V = malla(n)
+        t_np = medir(lambda: crear_campo_vectores(T, P, U, V, scale=1), 20)
+        if n > 40 and not completo:
+            print(f'{n}x{n}: create_quiver    (omitido) | crear_campo_vectores {t_np * 1e3:7.2f} ms')
+            continue
+        t_ff = medir(lambda: ff.create_quiver(T, P, U, V, scale=1), 3)
+        print(f'{n}x{n}: create_quiver {t_ff * 1e3:9.2f} ms | crear_campo_vectores {t_np * 1e3:7.2f} ms | x{t_ff / t_np:,.0f}')
@@ -0,0 +1,117 @@
+"""
+Compara el costo de integrar Lotka-Volterra por miles de períodos con Runge-Kutta adaptativo
+(Dormand-Prince 5(4), 'dopri5') y con los métodos simplécticos en coordenadas logarítmicas
+('verlet' de orden 2, 'yoshida4' y 'yoshida6', ver `integradores.verlet_separable`), a igual
+error en la cantidad conservada V (ver `modelos.conservada_lotka_volterra`).
+
+Cada método se mide con varias resoluciones (rtol en 'dopri5', pasos por período en los
+simplécticos). El error de cada corrida es el máximo de |V - V0| relativo a V0 - V(x*, y*),
+como la 'deriva' de `modelos.orbitas_lotka_volterra`. Luego, para cada error objetivo, se
+muestra la corrida más rápida de cada método que lo cumple y su costo relativo a 'dopri5'.
+
+Uso (desde la carpeta Interfaz_Grafica):
+
+    python -m benchmarks.bench_lotka_volterra [--periodos 1000] [--repeticiones 3]
+
+Con Numba instalado todos los métodos usan núcleos compilados (`nucleos.py`); con
+TM_NUCLEOS=0 se comparan las versiones de NumPy.
+"""
+import argparse
+import numpy as np
+from utils.integradores import integrar_edo
+from utils.modelos import rhs_lotka_volterra, conservada_lotka_volterra, paso_lotka_volterra
+from utils import nucleos
+from benchmarks.bench_campo_vectores import medir
+
+
+# Parámetros de la página 6
+PARAMETROS = (0.1, 0.02, 0.01, 0.1)
+INICIAL = (40, 9)
+
+# Puntos de salida por período donde se evalúa V (con menos pasos por período que puntos, el paso
+# queda limitado a la separación entre puntos)
+PUNTOS_POR_PERIODO = 20
+
+# Resoluciones de cada método
+RESOLUCIONES = {
+    'dopri5': [{'rtol': rtol, 'atol': rtol * 1e-3} for rtol in (1e-4, 1e-5, 1e-6, 1e-7, 1e-8, 1e-9, 1e-10)],
+    'verlet': [{'pasos_por_periodo': n} for n in (20, 32, 64, 128, 256, 512, 1024)],
+    'yoshida4': [{'pasos_por_periodo': n} for n in (20, 32, 64, 128, 256)],
+    'yoshida6': [{'pasos_por_periodo': n} for n in (20, 32, 48, 64, 96, 128)]
+}
+
+OBJETIVOS = (1e-2, 1e-3, 1e-4, 1e-5, 1e-6, 1e-7)
+
+
+def deriva(y):
+    """
+    Retorna el máximo de |V - V0| relativo a V0 - V(x*, y*) a lo largo de la solución `y` (inf si no es finita).
+    """
+    alpha, beta, delta, gamma = PARAMETROS
+    V = conservada_lotka_volterra(y[:, 0], y[:, 1], *PARAMETROS)
+    V_eq = conservada_lotka_volterra(gamma / delta, alpha / beta, *PARAMETROS)
+    return float(np.max(np.abs(V - V[0])) / (V[0] - V_eq)) if np.all(np.isfinite(V)) else np.inf
+
+def corrida(metodo: str, resolucion, t_values):
+    """
+    Retorna la función que integra con `metodo` y `resolucion` (un elemento de `RESOLUCIONES`).
+    """
+    f = rhs_lotka_volterra(*PARAMETROS)
+    if metodo == 'dopri5':
+        opciones = dict(resolucion)
+    else:
+        opciones = {'paso': paso_lotka_volterra(PARAMETROS[0], PARAMETROS[3], resolucion['pasos_por_periodo'])}
+    return lambda: integrar_edo(f, INICIAL, t_values, metodo=metodo, max_pasos=10**8, **opciones)
+
+def ejecutar(periodos: int, repeticiones: int):
+    """
+    Retorna la lista de resultados {metodo, resolucion, segundos, error} de todas las resoluciones.
+    """
+    periodo = 2 * np.pi / np.sqrt(PARAMETROS[0] * PARAMETROS[3])
+    t_values = np.linspace(0, periodos * periodo, periodos * PUNTOS_POR_PERIODO + 1)
+
+    resultados = []
+    for metodo, resoluciones in RESOLUCIONES.items():
+        for resolucion in resoluciones:
+            integrar = corrida(metodo, resolucion, t_values)
+            try:
+                error = deriva(integrar())  # También compila o carga el núcleo antes de medir
+            except RuntimeError:
+                continue
+            segundos = medir(integrar, repeticiones)
+            texto = ', '.join(f'{clave}={valor:g}' for clave, valor in resolucion.items())
+            resultados.append({'metodo': metodo, 'resolucion': texto, 'segundos': segundos, 'error': error})
+            print(f'{metodo:<10}{texto:<32}{segundos * 1e3:>12.2f}{error:>14.2e}')
+    return resultados
+
+def comparar(resultados):
+    """
+    Imprime, para cada error objetivo, la corrida más rápida de cada método que lo cumple.
+    """
+    print(f'\n{"Error":>8}' + ''.join(f'{metodo:>24}' for metodo in RESOLUCIONES) + f'{"vs dopri5":>24}')
+    for objetivo in OBJETIVOS:
+        mejores = {}
+        for metodo in RESOLUCIONES:
+            cumplen = [r for r in resultados if r['metodo'] == metodo and r['error'] <= objetivo]
+            mejores[metodo] = min(cumplen, key=lambda r: r['segundos']) if cumplen else None
+
+        celdas = ''.join(f'{mejores[m]["segundos"] * 1e3:>21.2f} ms' if mejores[m] else f'{"-":>24}' for m in RESOLUCIONES)
+        base = mejores['dopri5']
+        simplecticos = [mejores[m] for m in RESOLUCIONES if m != 'dopri5' and mejores[m]]
+        if base and simplecticos:
+            rapido = min(simplecticos, key=lambda r: r['segundos'])
+            relacion = f'{base["segundos"] / rapido["segundos"]:.1f}x ({rapido["metodo"]})'
+        else:
+            relacion = '-'
+        print(f'{objetivo:>8.0e}{celdas}{relacion:>24}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--periodos', type=int, default=1000, help='Períodos de las oscilaciones pequeñas a integrar')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Repeticiones por medición (se toma la mejor)')
+    args = parser.parse_args()
+
+    print(f'Períodos: {args.periodos}, núcleos compilados: {"sí" if nucleos.DISPONIBLE else "no"}')
+    print(f'{"Método":<10}{"Resolución":<32}{"Tiempo ms":>12}{"Error de V":>14}')
+    comparar(ejecutar(args.periodos, args.repeticiones))
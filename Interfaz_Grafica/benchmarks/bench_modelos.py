@@ -0,0 +1,213 @@
+"""
+Mide cada función de `utils/funciones.py` en tres etapas por separado:
+
+- calculo: la solución del modelo (`calcular_*` o `trayectoria_*` sin la caché de trayectorias).
+- figura: construir la figura con la trayectoria ya en caché (sin la caché de figuras).
+- serializacion: convertir la figura a JSON como la envían las páginas (`codificar_figura` y `to_json_plotly`).
+
+Cada función se mide con varios valores de `cant` (el mallado del campo en los modelos
+con solución exacta, el máximo de puntos por curva en SIR y Lotka-Volterra, las réplicas
+en el SIR estocástico, la resolución en el barrido y las condiciones iniciales por eje en el
+retrato de fase) y, cuando aplica, con el campo de vectores activado y desactivado.
+
+Uso (desde la carpeta Interfaz_Grafica):
+
+    python -m benchmarks.bench_modelos [--salida actual.json] [--comparar base.json] [--tolerancia 0.25]
+
+Antes de medir se comprueba que cada figura (un diccionario armado con `utils.figuras`)
+sea igual a la que resulta de validarla con `go.Figure`, que los integradores retornen la
+condición inicial cuando el tiempo total es cero y que los miembros del barrido SIR coincidan
+con el modelo SIR integrado solo.
+
+Con `--comparar` se marcan como regresión los casos cuya etapa tarde más que la base
+por encima de la tolerancia (relativa) y del piso de ruido (absoluto); en ese caso
+el script termina con código 1.
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import numpy as np
+import plotly
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+from utils import funciones
+from utils import modelos
+from utils import estocastico
+from utils import nucleos
+from utils.integradores import METODOS, integrar_edo
+from utils.codificacion import codificar_figura
+from benchmarks.bench_campo_vectores import medir
+
+
+# Diferencias menores a este tiempo (segundos) se consideran ruido
+PISO_RUIDO = 0.5e-3
+
+def _barrido(N, I0, R0, t, beta_min, beta_max, gamma_min, gamma_max, resolucion):
+    # El mismo cálculo que hace modelo_SIR_barrido antes de construir la figura
+    B, G = np.meshgrid(np.linspace(beta_min, beta_max, resolucion), np.linspace(gamma_min, gamma_max, resolucion))
+    return modelos.barrido_SIR.__wrapped__(B, G, I0, N, R0, t)
+
+# (nombre, función de la figura, función del cálculo, argumentos(cant, campo), valores de cant, usa campo)
+CASOS = [
+    ('ley_enfriamiento_newton', funciones.ley_enfriamiento_newton, modelos.calcular_enfriamiento_newton.__wrapped__,
+     lambda cant, campo: ((21, 95, -0.05, 0, 20, cant), (1, campo)), (10, 15, 30, 60), True),
+    ('ecuacion_logistica', funciones.ecuacion_logistica, modelos.calcular_ecuacion_logistica.__wrapped__,
+     lambda cant, campo: ((150, 10, 0.15, 0, 60, cant), (1, campo)), (10, 15, 30, 60), True),
+    ('modelo_decaimiento_radioactivo', funciones.modelo_decaimiento_radioactivo, modelos.calcular_decaimiento_radioactivo.__wrapped__,
+     lambda cant, campo: ((100, 0.1, 0, 60, cant), (1, campo)), (10, 15, 30, 60), True),
+    ('modelo_crecimiento_exponencial', funciones.modelo_crecimiento_exponencial, modelos.calcular_crecimiento_exponencial.__wrapped__,
+     lambda cant, campo: ((150, 0.855395, 0, 5, cant), (1, campo)), (10, 15, 30, 60), True),
+    ('modelo_SIR_cambiante', funciones.modelo_SIR_cambiante, modelos.trayectoria_SIR.__wrapped__,
+     lambda cant, campo: ((1000, 1, 0, 160, 0.3, 0.1), (cant,)), (90, 500, 2000), False),
+    ('modelo_SIR_estocastico', funciones.modelo_SIR_estocastico, estocastico.resumen_SIR_estocastico.__wrapped__,
+     lambda cant, campo: ((1000, 1, 0, 160, 0.3, 0.1, cant, 'tau', 200), ()), (100, 1000, 5000), False),
+    ('modelo_lotka_volterra', funciones.modelo_lotka_volterra, modelos.trayectoria_lotka_volterra.__wrapped__,
+     lambda cant, campo: ((0.1, 0.02, 0.01, 0.1, 40, 9, 200), (cant,)), (100, 500, 2000), False),
+    ('modelo_SIR_barrido', funciones.modelo_SIR_barrido, _barrido,
+     lambda cant, campo: ((1000, 1, 0, 160, 0.1, 0.6, 0.05, 0.3, cant), ()), (10, 30, 60), False),
+    ('retrato_fase_lotka_volterra', funciones.retrato_fase_lotka_volterra, modelos.orbitas_lotka_volterra.__wrapped__,
+     lambda cant, campo: ((0.1, 0.02, 0.01, 0.1, cant, 3, 100, 300), (20, ('campo', 'nulclinas', 'equilibrios') if campo else ())), (5, 12, 20), True),
+]
+
+ETAPAS = ('calculo', 'figura', 'serializacion')
+
+
+def comprobar():
+    """
+    Verifica que las figuras no cambien al pasar por la validación de `go.Figure`
+    (mismo JSON que envían las páginas), con el menor `cant` de cada caso.
+    """
+    for nombre, figura, _, argumentos, valores_cant, usa_campo in CASOS:
+        for campo in ((True, False) if usa_campo else (False,)):
+            args_calculo, args_figura = argumentos(valores_cant[0], campo)
+            fig = figura.__wrapped__(*args_calculo, *args_figura)
+            validada = go.Figure(fig)
+            assert json.loads(to_json_plotly(codificar_figura(fig))) == json.loads(to_json_plotly(codificar_figura(validada))), (nombre, campo)
+
+    comprobar_tiempo_cero()
+    comprobar_barrido()
+
+def comprobar_tiempo_cero():
+    """
+    Verifica que cada integrador (con y sin núcleo compilado) retorne la condición inicial
+    repetida cuando t_values no avanza (p. ej. tiempo total 0 en las páginas 5 y 6).
+    """
+    lotka_volterra = modelos.rhs_lotka_volterra(0.1, 0.02, 0.01, 0.1)
+    sin_nucleo = lambda t, y: lotka_volterra(t, y)
+    sin_nucleo.particion = lotka_volterra.particion
+    sin_nucleo.jacobiano = lambda t, y: np.array([[0.1 - 0.02 * y[1], -0.02 * y[0]], [0.01 * y[1], 0.01 * y[0] - 0.1]])
+
+    t_values = np.zeros(5)
+    for metodo in METODOS:
+        for f in ((sin_nucleo,) if metodo == 'rosenbrock' else (lotka_volterra, sin_nucleo)):
+            y = integrar_edo(f, [40, 9], t_values, metodo=metodo)
+            assert np.array_equal(y, np.tile([40.0, 9.0], (5, 1))), (metodo, f is lotka_volterra and nucleos.DISPONIBLE)
+
+def comprobar_barrido(resolucion: int = 20, tolerancia: float = 1e-6):
+    """
+    Verifica que cada miembro del barrido SIR (todos integrados a la vez) tenga el mismo pico y
+    tamaño final que `calcular_SIR` integrado solo con las mismas tolerancias, con un error
+    relativo a N de a lo más `tolerancia`: el control de error no debe relajarse con más miembros.
+    """
+    N, t = 1000, 160
+    B, G = np.meshgrid(np.linspace(0.1, 0.6, resolucion), np.linspace(0.05, 0.3, resolucion))
+    barrido = _barrido(N, 1, 0, t, 0.1, 0.6, 0.05, 0.3, resolucion)
+
+    for beta, gamma, pico, tamano in zip(B.ravel(), G.ravel(), barrido['pico_infectados'].ravel(), barrido['tamano_final'].ravel()):
+        solo = modelos.calcular_SIR.__wrapped__(N, 1, 0, t, beta, gamma, 400)
+        error = max(abs(solo['I'].max() - pico), abs(N - solo['S'][-1] - tamano)) / N
+        assert error <= tolerancia, (beta, gamma, error)
+
+def medir_caso(figura, calculo, args_calculo, args_figura, repeticiones: int):
+    """
+    Retorna un diccionario con el mejor tiempo de cada etapa y los bytes del JSON.
+    """
+    argumentos = args_calculo + args_figura
+
+    # Calentar la caché de trayectorias para que la etapa de la figura no incluya el cálculo
+    fig = figura.__wrapped__(*argumentos)
+    texto = to_json_plotly(codificar_figura(fig))
+
+    return {
+        'calculo': medir(lambda: calculo(*args_calculo), repeticiones),
+        'figura': medir(lambda: figura.__wrapped__(*argumentos), repeticiones),
+        'serializacion': medir(lambda: to_json_plotly(codificar_figura(fig)), repeticiones),
+        'bytes': len(texto.encode())
+    }
+
+def ejecutar(repeticiones: int, filtro: str = None):
+    """
+    Retorna la lista de resultados de todos los casos (o solo los que contienen `filtro`).
+    """
+    resultados = []
+    for nombre, figura, calculo, argumentos, valores_cant, usa_campo in CASOS:
+        if filtro and filtro not in nombre:
+            continue
+        for cant in valores_cant:
+            for campo in ((True, False) if usa_campo else (False,)):
+                args_calculo, args_figura = argumentos(cant, campo)
+                resultado = medir_caso(figura, calculo, args_calculo, args_figura, repeticiones)
+                resultados.append({'funcion': nombre, 'cant': cant, 'campo': campo, **resultado})
+                print(f'{nombre:<32}{cant:>6}{"sí" if campo else "no":>7}'
+                      + ''.join(f'{resultado[etapa] * 1e3:>17.2f}' for etapa in ETAPAS)
+                      + f'{resultado["bytes"]:>12,}')
+    return resultados
+
+def clave_caso(resultado):
+    return (resultado['funcion'], resultado['cant'], resultado['campo'])
+
+def comparar(actuales, base, tolerancia: float):
+    """
+    Retorna la lista de regresiones (caso, etapa, tiempo base, tiempo actual) respecto a `base`.
+    """
+    referencia = {clave_caso(r): r for r in base['resultados']}
+    regresiones = []
+    for resultado in actuales:
+        anterior = referencia.get(clave_caso(resultado))
+        if anterior is None:
+            continue
+        for etapa in ETAPAS:
+            antes, ahora = anterior[etapa], resultado[etapa]
+            if ahora > antes * (1 + tolerancia) and ahora - antes > PISO_RUIDO:
+                regresiones.append((clave_caso(resultado), etapa, antes, ahora))
+    return regresiones
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticiones', type=int, default=5, help='Repeticiones por medición (se toma la mejor)')
+    parser.add_argument('--solo', default=None, help='Medir solo las funciones cuyo nombre contiene este texto')
+    parser.add_argument('--salida', default=None, help='Archivo JSON donde guardar los resultados')
+    parser.add_argument('--comparar', default=None, help='Archivo JSON de una corrida anterior (línea base)')
+    parser.add_argument('--tolerancia', type=float, default=0.25, help='Aumento relativo permitido antes de marcar una regresión')
+    args = parser.parse_args()
+
+    print(f'{"Función":<32}{"cant":>6}{"campo":>7}' + ''.join(f'{etapa + " ms":>17}' for etapa in ETAPAS) + f'{"bytes":>12}')
+    comprobar()
+    resultados = ejecutar(args.repeticiones, args.solo)
+
+    if args.salida:
+        datos = {
+            'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plotly': plotly.__version__,
+            'repeticiones': args.repeticiones,
+            'resultados': resultados
+        }
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo, indent=2, ensure_ascii=False)
+        print(f'\nResultados guardados en {args.salida}')
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(resultados, base, args.tolerancia)
+        if regresiones:
+            print(f'\nRegresiones respecto a {args.comparar} (tolerancia {args.tolerancia:.0%}):')
+            for (nombre, cant, campo), etapa, antes, ahora in regresiones:
+                print(f'  {nombre} cant={cant} campo={campo} {etapa}: {antes * 1e3:.2f} ms -> {ahora * 1e3:.2f} ms (x{ahora / antes:.2f})')
+            sys.exit(1)
+        print(f'\nSin regresiones respecto a {args.comparar}')
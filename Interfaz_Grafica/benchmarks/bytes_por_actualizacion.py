@@ -0,0 +1,44 @@
+"""
+Mide los bytes que viajan al navegador por actualización en cada página:
+la figura completa frente al `dash.Patch` con solo los datos que cambian.
+
+Uso (desde la carpeta Interfaz_Grafica):
+
+    python -m benchmarks.bytes_por_actualizacion
+"""
+from plotly.io.json import to_json_plotly
+from utils import *
+from utils.parches import parche_figura
+from utils.codificacion import codificar_figura
+
+
+# Página, parámetros por defecto de la página y el mismo llamado con un parámetro cambiado
+PAGINAS = [
+    ('page1 (Newton)', ley_enfriamiento_newton, (21, 95, -0.05, 0, 20, 15, 1, True), (21, 95, -0.06, 0, 20, 15, 1, True)),
+    ('page1 (tamaño del vector)', ley_enfriamiento_newton, (21, 95, -0.05, 0, 20, 15, 1, True), (21, 95, -0.05, 0, 20, 15, 1.5, True)),
+    ('page2 (Logística)', ecuacion_logistica, (150, 10, 0.15, 0, 60, 15, 1, True), (150, 10, 0.2, 0, 60, 15, 1, True)),
+    ('page3 (Decaimiento)', modelo_decaimiento_radioactivo, (100, 0.1, 0, 60, 15, 1, True), (100, 0.1, 0, 60, 15, 1.5, True)),
+    ('page4 (Exponencial)', modelo_crecimiento_exponencial, (150, 0.855395, 0, 5, 15, 1, True), (150, 0.855395, 0, 6, 15, 1, True)),
+    ('page5 (SIR)', modelo_SIR_cambiante, (1000, 1, 0, 160, 0.3, 0.1, 90), (1000, 1, 0, 160, 0.35, 0.1, 90)),
+    ('page6 (Lotka-Volterra)', modelo_lotka_volterra, (0.1, 0.02, 0.01, 0.1, 40, 9, 200, 100), (0.1, 0.02, 0.01, 0.1, 45, 9, 200, 100)),
+    ('page8 (Barrido SIR)', modelo_SIR_barrido, (1000, 1, 0, 160, 0.1, 0.6, 0.05, 0.3, 30), (1000, 1, 0, 160, 0.1, 0.7, 0.05, 0.3, 30)),
+]
+
+
+def bytes_actualizacion(funcion, antes, despues):
+    """
+    Retorna (bytes de la figura completa, bytes del parche) al pasar de `antes` a `despues`.
+    """
+    funcion(*antes)
+    fig = funcion(*despues)
+
+    # Si solo cambió el tamaño del vector, las páginas envían solo la traza del campo
+    trazas = [0] if antes[:-2] == despues[:-2] and antes[-1] == despues[-1] else None
+    return len(to_json_plotly(codificar_figura(fig)).encode()), len(to_json_plotly(parche_figura(fig, trazas=trazas)).encode())
+
+
+if __name__ == '__main__':
+    print(f'{"Página":<28}{"Figura":>12}{"Parche":>12}{"Ahorro":>9}')
+    for nombre, funcion, antes, despues in PAGINAS:
+        completa, parche = bytes_actualizacion(funcion, antes, despues)
+        print(f'{nombre:<28}{completa:>12,}{parche:>12,}{1 - parche / completa:>9.0%}')
@@ -0,0 +1,112 @@
+"""
+Mide cuántas peticiones por segundo atiende el servidor de producción (gunicorn con
+wsgi.py y gunicorn.conf.py) al aumentar la cantidad de workers.
+
+Para cada cantidad de workers se levanta gunicorn en un puerto local y varios clientes
+concurrentes piden `/api/modelos/SIR_estocastico` en dos fases:
+
+- calculo: parámetros distintos en cada petición (todas calculan; limitadas por CPU).
+- compartida: los mismos parámetros otra vez. Las trayectorias ya están en la memoria
+  compartida, así que las responde cualquier worker sin recalcular, aunque la haya
+  calculado otro.
+
+Uso (desde la carpeta Interfaz_Grafica, requiere gunicorn):
+
+    python -m benchmarks.escalado_workers [--workers 1 2 4] [--clientes 8] [--peticiones 48] [--replicas 500]
+
+En la fase de cálculo la aceleración es casi lineal hasta la cantidad de núcleos de la
+máquina (`os.cpu_count()`, se muestra al inicio); con más workers que núcleos se mantiene.
+"""
+import argparse
+import concurrent.futures
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import numpy as np
+
+
+# Parámetros fijos del SIR estocástico; beta cambia en cada petición de la fase de cálculo
+PARAMETROS = 'N=1000&I0=1&R0=0&t=160&gamma=0.1&cant=100&metodo=tau'
+
+
+def puerto_libre():
+    """
+    Retorna un puerto TCP libre de la máquina local.
+    """
+    with socket.socket() as conexion:
+        conexion.bind(('127.0.0.1', 0))
+        return conexion.getsockname()[1]
+
+def levantar(workers: int, puerto: int, espera: float = 120.0):
+    """
+    Retorna el proceso de gunicorn con `workers` workers, cuando ya responde.
+    """
+    entorno = dict(os.environ, TM_WORKERS=str(workers), TM_BIND=f'127.0.0.1:{puerto}')
+    proceso = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:server'],
+                               env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    limite = time.perf_counter() + espera
+    while time.perf_counter() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f'gunicorn terminó con código {proceso.returncode}')
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{puerto}/api/modelos', timeout=1).read()
+            return proceso
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    proceso.terminate()
+    raise RuntimeError(f'gunicorn no respondió en {espera} s')
+
+def pedir(url: str):
+    """
+    Retorna la duración (segundos) de un GET a `url`.
+    """
+    inicio = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=300) as respuesta:
+        respuesta.read()
+    return time.perf_counter() - inicio
+
+def fase(urls, clientes: int):
+    """
+    Retorna (peticiones por segundo, latencia p50, latencia p95) de pedir `urls` con `clientes` concurrentes.
+    """
+    inicio = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(clientes) as clientes_http:
+        duraciones = list(clientes_http.map(pedir, urls))
+    total = time.perf_counter() - inicio
+    return len(urls) / total, float(np.percentile(duraciones, 50)), float(np.percentile(duraciones, 95))
+
+def medir(workers: int, clientes: int, peticiones: int, replicas: int):
+    """
+    Retorna {fase: (peticiones por segundo, p50, p95)} con `workers` workers.
+    """
+    puerto = puerto_libre()
+    proceso = levantar(workers, puerto)
+    try:
+        base = f'http://127.0.0.1:{puerto}/api/modelos/SIR_estocastico?{PARAMETROS}&replicas={replicas}'
+        urls = [f'{base}&beta={0.3 + 1e-4 * i:.4f}' for i in range(peticiones)]
+        pedir(f'{base}&beta=0.25')  # Primera petición fuera de la medición
+        return {'calculo': fase(urls, clientes), 'compartida': fase(urls, clientes)}
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Cantidades de workers a medir')
+    parser.add_argument('--clientes', type=int, default=8, help='Clientes concurrentes')
+    parser.add_argument('--peticiones', type=int, default=48, help='Peticiones por fase')
+    parser.add_argument('--replicas', type=int, default=500, help='Réplicas del SIR estocástico por petición')
+    args = parser.parse_args()
+
+    print(f'CPUs: {os.cpu_count()}, clientes: {args.clientes}, peticiones por fase: {args.peticiones}, réplicas: {args.replicas}')
+    print(f'{"Workers":>8}{"Fase":>12}{"pet/s":>10}{"Aceleración":>13}{"p50 ms":>10}{"p95 ms":>10}')
+    referencia = {}
+    for workers in args.workers:
+        for nombre, (por_segundo, p50, p95) in medir(workers, args.clientes, args.peticiones, args.replicas).items():
+            referencia.setdefault(nombre, por_segundo)
+            print(f'{workers:>8}{nombre:>12}{por_segundo:>10.1f}{por_segundo / referencia[nombre]:>12.2f}x{p50 * 1e3:>10.1f}{p95 * 1e3:>10.1f}')
@@ -0,0 +1,95 @@
+"""
+Comprueba el descarte de peticiones superadas (`coalescencia.solo_vigentes`) cuando dos
+pestañas piden a la vez el mismo cálculo cacheado, y mide cuánto esperan las que se unen
+a un cálculo en curso.
+
+Caso: la pestaña A pide una figura (caché de figuras que llama a la de trayectorias) y,
+mientras se calcula, la pestaña B pide la misma figura y A pide otra. La primera petición de
+A se descarta, pero B debe recibir su figura aunque se haya unido al cálculo de A.
+
+Uso (desde la carpeta Interfaz_Grafica):
+
+    python -m benchmarks.peticiones_superadas [--demora 0.3]
+"""
+import argparse
+import threading
+import time
+from dash.exceptions import PreventUpdate
+from utils.cache import CacheLRU, cachear
+from utils.coalescencia import UnVuelo, solo_vigentes
+
+
+def pestanas(demora: float):
+    """
+    Retorna ({(pestaña, x): resultado o 'descartada'}, {(pestaña, x): segundos}) del caso
+    de dos pestañas con cachés anidadas.
+    """
+    trayectorias = cachear(CacheLRU(nombre='trayectorias'), etapa='calculo')
+    figuras = cachear(CacheLRU(nombre='figuras'), etapa='figura')
+
+    @trayectorias
+    def trayectoria(x):
+        time.sleep(demora)
+        return {'x': x}
+
+    @figuras
+    def figura(x):
+        return trayectoria(x)['x']
+
+    @solo_vigentes
+    def callback(x):
+        return figura(x)
+
+    resultados, tiempos = {}, {}
+    def pedir(pestana, x):
+        inicio = time.perf_counter()
+        try:
+            resultados[(pestana, x)] = callback(x, pestana)
+        except PreventUpdate:
+            resultados[(pestana, x)] = 'descartada'
+        tiempos[(pestana, x)] = time.perf_counter() - inicio
+
+    hilos = [threading.Thread(target=pedir, args=argumentos) for argumentos in (('A', 1), ('B', 1), ('A', 2))]
+    for hilo in hilos:
+        hilo.start()
+        time.sleep(demora / 6)
+    for hilo in hilos:
+        hilo.join()
+    return resultados, tiempos
+
+def comprobar(demora: float = 0.3):
+    """
+    Verifica que el descarte de una pestaña no llegue a otra que esperaba el mismo cálculo, y
+    que un error compartido se lance como una instancia distinta en cada hilo.
+    """
+    resultados, _ = pestanas(demora)
+    assert resultados == {('A', 1): 'descartada', ('B', 1): 1, ('A', 2): 2}, resultados
+
+    vuelo, errores = UnVuelo(), []
+    def fallar():
+        time.sleep(demora / 3)
+        raise ValueError('fallo')
+    def pedir():
+        try:
+            vuelo.ejecutar('clave', fallar)
+        except ValueError as error:
+            errores.append(error)
+    hilos = [threading.Thread(target=pedir) for _ in range(3)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(errores) == 3 and len({id(error) for error in errores}) == 3, errores
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--demora', type=float, default=0.3, help='Segundos que tarda el cálculo de la trayectoria')
+    args = parser.parse_args()
+
+    comprobar(args.demora)
+    resultados, tiempos = pestanas(args.demora)
+    print(f'{"Petición":<12}{"Resultado":>12}{"ms":>10}')
+    for (pestana, x), resultado in resultados.items():
+        print(f'{pestana + " x=" + str(x):<12}{str(resultado):>12}{tiempos[(pestana, x)] * 1e3:>10.1f}')
+    print('\nOK: el descarte de una pestaña no afecta a las demás')
@@ -0,0 +1,66 @@
+"""
+Reporta el tamaño de la figura que envía cada página con sus parámetros por defecto:
+
+- listas: los datos como listas JSON de números (como se enviaban antes).
+- f8 / f4: los datos como arreglos binarios de Plotly en precisión doble / simple.
+- gzip / br: el tamaño de la respuesta comprimida (br solo si `brotli` está instalado).
+
+Uso (desde la carpeta Interfaz_Grafica):
+
+    python -m benchmarks.tamano_respuestas
+"""
+import gzip
+import json
+import numpy as np
+from plotly.io.json import to_json_plotly
+from utils.codificacion import codificar_figura, decodificar_arreglo
+from benchmarks.bytes_por_actualizacion import PAGINAS
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def figura_listas(fig):
+    """
+    Retorna el JSON de la figura con todos los datos de las trazas como listas de números.
+    """
+    figura = fig.to_dict() if hasattr(fig, 'to_dict') else dict(fig, data=[dict(traza) for traza in fig['data']])
+    for traza in figura['data']:
+        for propiedad in ('x', 'y', 'z'):
+            if propiedad in traza:
+                valor = decodificar_arreglo(traza[propiedad])
+                traza[propiedad] = np.asarray(valor).tolist() if isinstance(valor, np.ndarray) else valor
+    return json.dumps(figura, separators=(',', ':'), allow_nan=True).replace('NaN', 'null')
+
+def tamanos(texto: str):
+    """
+    Retorna (bytes sin comprimir, bytes con gzip, bytes con brotli o None).
+    """
+    datos = texto.encode()
+    return len(datos), len(gzip.compress(datos, 6)), len(brotli.compress(datos)) if brotli else None
+
+
+if __name__ == '__main__':
+    variantes = [
+        ('listas', figura_listas),
+        ('f8', lambda fig: to_json_plotly(codificar_figura(fig, float32=False))),
+        ('f4', lambda fig: to_json_plotly(codificar_figura(fig, float32=True)))
+    ]
+
+    print(f'{"Página":<28}{"Formato":>8}{"Bytes":>12}{"gzip":>11}{"br":>11}{"Ahorro":>9}')
+    vistas = set()
+    for nombre, funcion, antes, _ in PAGINAS:
+        if (funcion, antes) in vistas:
+            continue
+        vistas.add((funcion, antes))
+
+        fig = funcion(*antes)
+        base = None
+        for formato, serializar in variantes:
+            crudo, comprimido_gz, comprimido_br = tamanos(serializar(fig))
+            base = base or crudo
+            mejor = comprimido_br or comprimido_gz
+            br = f'{comprimido_br:>11,}' if comprimido_br else f'{"-":>11}'
+            print(f'{nombre:<28}{formato:>8}{crudo:>12,}{comprimido_gz:>11,}{br}{1 - mejor / base:>9.0%}')
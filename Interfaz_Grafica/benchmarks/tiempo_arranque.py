@@ -0,0 +1,94 @@
+"""
+Mide el tiempo de arranque de la aplicación (importar `app`, que con `use_pages=True`
+importa todas las páginas) y reporta el costo de importación de cada módulo con
+`python -X importtime`.
+
+Uso (desde la carpeta Interfaz_Grafica):
+
+    python -m benchmarks.tiempo_arranque [--top 20] [--repeticiones 5] [--presupuesto 1.5]
+
+Con `--presupuesto` (segundos) el script termina con código 1 si el mejor arranque
+en frío lo supera, o si al arrancar se importó algún módulo de `DIFERIDOS`, que las
+páginas deben importar solo cuando se usan.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+# Módulos pesados que no deben cargarse al arrancar la aplicación
+DIFERIDOS = ('sympy', 'matplotlib', 'scipy', 'pandas')
+
+# Carpeta Interfaz_Grafica (donde está app.py)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def importar_app(importtime: bool = False):
+    """
+    Importa `app` en un proceso nuevo y retorna (segundos, salida de error, módulos cargados).
+    """
+    codigo = 'import sys, app; print(",".join(sys.modules))'
+    opciones = ['-X', 'importtime'] if importtime else []
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable, *opciones, '-c', codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    segundos = time.perf_counter() - inicio
+    return segundos, proceso.stderr, set(proceso.stdout.strip().split(','))
+
+def leer_importtime(texto: str):
+    """
+    Retorna la lista de (módulo, propio en s, acumulado en s, nivel) de la salida de `-X importtime`.
+    """
+    modulos = []
+    for linea in texto.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        propio, acumulado, nombre = linea[len('import time:'):].split('|')
+        nivel = (len(nombre) - len(nombre.lstrip())) // 2
+        modulos.append((nombre.strip(), int(propio) / 1e6, int(acumulado) / 1e6, nivel))
+    return modulos
+
+def por_paquete(modulos):
+    """
+    Retorna {paquete de primer nivel: segundos propios} ordenado de mayor a menor.
+    """
+    totales = {}
+    for nombre, propio, _, _ in modulos:
+        paquete = nombre.split('.')[0]
+        totales[paquete] = totales.get(paquete, 0) + propio
+    return dict(sorted(totales.items(), key=lambda item: -item[1]))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--top', type=int, default=20, help='Cantidad de módulos y paquetes a mostrar')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Arranques en frío a medir')
+    parser.add_argument('--presupuesto', type=float, default=None, help='Máximo de segundos permitido para arrancar')
+    args = parser.parse_args()
+
+    # Costo por módulo (una corrida con -X importtime, que agrega su propio costo)
+    _, salida, cargados = importar_app(importtime=True)
+    modulos = leer_importtime(salida)
+
+    print(f'{"Módulo (acumulado)":<48}{"Propio":>10}{"Acumulado":>12}')
+    for nombre, propio, acumulado, _ in sorted(modulos, key=lambda m: -m[2])[:args.top]:
+        print(f'{nombre:<48}{propio * 1e3:>8.1f}ms{acumulado * 1e3:>10.1f}ms')
+
+    print(f'\n{"Paquete (propio)":<48}{"Total":>10}')
+    for paquete, segundos in list(por_paquete(modulos).items())[:args.top]:
+        print(f'{paquete:<48}{segundos * 1e3:>8.1f}ms')
+
+    # Tiempo real de arranque (mejor de varias corridas, incluye el intérprete)
+    mejor = min(importar_app()[0] for _ in range(args.repeticiones))
+    print(f'\nArranque en frío: {mejor:.3f} s (mejor de {args.repeticiones})')
+
+    cargados_diferidos = sorted(m for m in DIFERIDOS if m in cargados)
+    if cargados_diferidos:
+        print(f'Módulos pesados cargados al arrancar: {", ".join(cargados_diferidos)}')
+
+    if args.presupuesto is not None:
+        if mejor > args.presupuesto or cargados_diferidos:
+            print(f'FALLA: el presupuesto es {args.presupuesto:.3f} s sin {", ".join(DIFERIDOS)}')
+            sys.exit(1)
+        print(f'OK: dentro del presupuesto de {args.presupuesto:.3f} s')
@@ -0,0 +1,42 @@
+# Configuración de gunicorn para producción (desde la carpeta Interfaz_Grafica):
+#
+#     gunicorn -c gunicorn.conf.py wsgi:server
+#
+# Variables de entorno: TM_BIND (dirección, por defecto 0.0.0.0:1256), TM_WORKERS (procesos,
+# por defecto la cantidad de CPUs), TM_HILOS (hilos por worker), TM_TRANSMISION y
+# TM_METRICAS_DIR (ver abajo) y las de wsgi.py.
+import os
+import shutil
+import tempfile
+
+bind = os.environ.get('TM_BIND', '0.0.0.0:1256')
+workers = int(os.environ.get('TM_WORKERS') or os.cpu_count() or 1)
+threads = int(os.environ.get('TM_HILOS', '1'))
+
+# Las corridas que se muestran mientras se calculan (utils/corridas.py) viven en un solo worker:
+# con varios se apaga ese modo, salvo que el balanceador use sesiones fijas y se pida TM_TRANSMISION=1
+if workers > 1:
+    os.environ.setdefault('TM_TRANSMISION', '0')
+
+# Cada worker tiene sus propias métricas: con varios, /metrics suma los volcados de todos en
+# una carpeta nueva en cada arranque (ver utils/metricas.py)
+metricas_temporales = None
+if workers > 1 and not os.environ.get('TM_METRICAS_DIR'):
+    metricas_temporales = os.environ['TM_METRICAS_DIR'] = tempfile.mkdtemp(prefix='tm_metricas_')
+
+# wsgi.py se importa una vez en el maestro (bibliotecas, núcleos y memoria compartida) y los
+# workers se crean con fork a partir de él
+preload_app = True
+
+# Los cálculos largos (barrido, análisis simbólico) van en segundo plano, pero un SIR
+# estocástico grande puede tardar varios segundos
+timeout = 120
+
+
+def post_fork(server, worker):
+    from wsgi import despues_de_fork
+    despues_de_fork()
+
+def on_exit(server):
+    if metricas_temporales:
+        shutil.rmtree(metricas_temporales, ignore_errors=True)
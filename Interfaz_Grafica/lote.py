@@ -0,0 +1,299 @@
+"""
+Ejecuta un modelo sobre todas las filas de una tabla de parámetros, sin la interfaz:
+no importa Dash ni Plotly y solo usa las funciones de cálculo de `utils/modelos.py`
+(las mismas que usan las gráficas de `utils/funciones.py`).
+
+Las filas se reparten por bloques entre varios procesos y cada proceso escribe sus
+resultados directamente en arreglos `.npy` mapeados en memoria (uno por salida del
+modelo, de forma (filas,) + forma de la salida), así la tabla puede tener millones
+de filas sin pasar los resultados entre procesos ni cargarlos en memoria.
+
+Uso (desde la carpeta Interfaz_Grafica):
+
+    python lote.py parametros.csv --modelo SIR --salida resultados [--fijo cant=400] [--procesos 8] [--parquet]
+
+La tabla puede ser CSV (una columna por parámetro) o JSON (lista de objetos u objeto
+de listas). Los parámetros que no están en la tabla se toman de `--fijo` o del valor
+por defecto de la función. En la carpeta de salida quedan:
+
+- <salida>.npy: una por salida del modelo (p. ej. t.npy, S.npy, I.npy, R.npy).
+- estado.npy: 0 si la fila se calculó, 1 si falló (p. ej. el integrador no convergió).
+- parametros.npz: los parámetros de cada fila.
+- lote.json: el modelo, la cantidad de filas y la forma de cada salida.
+- resultados.parquet: con --parquet (requiere pyarrow), una fila por parámetro y una columna de listas por salida.
+
+Los arreglos se leen con `np.load('resultados/S.npy', mmap_mode='r')`.
+"""
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from utils.registro import MODELOS, firma, convertir, faltantes
+
+
+# Valores de estado.npy
+ESTADO_OK, ESTADO_ERROR, ESTADO_PENDIENTE = 0, 1, 255
+
+# Errores de una fila que no detienen el lote
+ERRORES_FILA = (RuntimeError, ValueError, FloatingPointError, ZeroDivisionError, OverflowError)
+
+
+# Funciones
+
+def leer_tabla(ruta: str):
+    """
+    Retorna un diccionario {columna: arreglo} con la tabla de parámetros (CSV o JSON).
+    Las columnas con todos sus valores numéricos quedan como float; las demás como texto.
+    """
+    with open(ruta, encoding='utf-8') as archivo:
+        if ruta.lower().endswith('.json'):
+            datos = json.load(archivo)
+            if isinstance(datos, list):
+                columnas = {clave: [fila[clave] for fila in datos] for clave in (datos[0] if datos else {})}
+            else:
+                columnas = datos
+        else:
+            lector = csv.DictReader(archivo)
+            columnas = {clave: [] for clave in lector.fieldnames or ()}
+            for fila in lector:
+                for clave in columnas:
+                    columnas[clave].append(fila[clave])
+
+    tabla = {}
+    for clave, valores in columnas.items():
+        try:
+            tabla[clave.strip()] = np.array([float(v) for v in valores])
+        except (TypeError, ValueError):
+            tabla[clave.strip()] = np.array([str(v) for v in valores])
+    return tabla
+
+def leer_fijos(pares):
+    """
+    Retorna un diccionario con los parámetros de `--fijo clave=valor` (numéricos si se puede).
+    """
+    fijos = {}
+    for par in pares or ():
+        clave, _, valor = par.partition('=')
+        try:
+            fijos[clave.strip()] = float(valor)
+        except ValueError:
+            fijos[clave.strip()] = valor.strip()
+    return fijos
+
+def argumentos_fila(firma_modelo, tabla, fijos, fila: int):
+    """
+    Retorna los argumentos de la función para una fila de la tabla.
+    """
+    argumentos = {}
+    for nombre, parametro in firma_modelo.parameters.items():
+        if nombre in tabla:
+            valor = tabla[nombre][fila]
+        elif nombre in fijos:
+            valor = fijos[nombre]
+        else:
+            continue  # Valor por defecto de la función
+        argumentos[nombre] = convertir(valor, parametro.annotation)
+    return argumentos
+
+def _inicializar_proceso():
+    # Un proceso por núcleo ya reparte el trabajo: el SIR estocástico no abre su propio pool
+    os.environ['TM_PROCESOS'] = '1'
+    from utils import nucleos
+    nucleos.precompilar_nucleos()
+
+def ejecutar_bloque(modelo: str, directorio: str, tabla, fijos, inicio: int):
+    """
+    Calcula las filas de un bloque y las escribe en los .npy mapeados en memoria.
+    Retorna la cantidad de filas que fallaron.
+
+    Parámetros:
+    -------
+    - modelo: Nombre en `MODELOS`.
+    - directorio: Carpeta de salida (con los .npy ya creados).
+    - tabla: Columnas del bloque ({parámetro: arreglo}).
+    - fijos: Parámetros iguales en todas las filas.
+    - inicio: Índice de la primera fila del bloque en la tabla completa.
+    """
+
+    funcion, claves = MODELOS[modelo]
+    calcular = funcion.__wrapped__  # En un lote cada fila es distinta: sin la caché de trayectorias
+    firma_modelo = firma(modelo)
+
+    salidas = {clave: np.load(os.path.join(directorio, f'{clave}.npy'), mmap_mode='r+') for clave in claves}
+    estado = np.load(os.path.join(directorio, 'estado.npy'), mmap_mode='r+')
+
+    filas = len(next(iter(tabla.values()))) if tabla else 0
+    errores = 0
+    for fila in range(filas):
+        try:
+            datos = calcular(**argumentos_fila(firma_modelo, tabla, fijos, fila))
+            for clave in claves:
+                salidas[clave][inicio + fila] = datos[clave]
+            estado[inicio + fila] = ESTADO_OK
+        except ERRORES_FILA:
+            estado[inicio + fila] = ESTADO_ERROR
+            errores += 1
+
+    for arreglo in (*salidas.values(), estado):
+        arreglo.flush()
+    return errores
+
+def preparar_salida(modelo: str, directorio: str, tabla, fijos, filas: int):
+    """
+    Calcula la primera fila para conocer la forma de cada salida y crea los .npy
+    (mapeados en memoria) y parametros.npz. Retorna el diccionario de lote.json.
+    """
+
+    funcion, claves = MODELOS[modelo]
+    calcular = funcion.__wrapped__
+    firma_modelo = firma(modelo)
+
+    falta = faltantes(modelo, set(tabla) | set(fijos))
+    if falta:
+        raise ValueError(f'Faltan parámetros para {modelo}: {", ".join(falta)} (agregarlos a la tabla o con --fijo)')
+
+    muestra = calcular(**argumentos_fila(firma_modelo, tabla, fijos, 0))
+    os.makedirs(directorio, exist_ok=True)
+
+    formas = {}
+    for clave in claves:
+        valor = np.asarray(muestra[clave])
+        dtype = valor.dtype if valor.dtype.kind in 'iub' else np.float64
+        np.lib.format.open_memmap(os.path.join(directorio, f'{clave}.npy'), mode='w+', dtype=dtype, shape=(filas,) + valor.shape)
+        formas[clave] = {'forma': list(valor.shape), 'dtype': np.dtype(dtype).str}
+
+    estado = np.lib.format.open_memmap(os.path.join(directorio, 'estado.npy'), mode='w+', dtype=np.uint8, shape=(filas,))
+    estado[:] = ESTADO_PENDIENTE
+    estado.flush()
+
+    np.savez(os.path.join(directorio, 'parametros.npz'), **tabla)
+
+    return {
+        'modelo': modelo,
+        'filas': filas,
+        'parametros': [nombre for nombre in firma_modelo.parameters if nombre in tabla],
+        'fijos': fijos,
+        'salidas': formas
+    }
+
+def ejecutar_lote(modelo: str, tabla, fijos, directorio: str, procesos: int = None, bloque: int = 1000, mostrar=None):
+    """
+    Ejecuta el modelo sobre todas las filas de la tabla y retorna el diccionario de lote.json.
+
+    Parámetros:
+    -------
+    - modelo: Nombre en `MODELOS`.
+    - tabla: Diccionario {parámetro: arreglo} con una entrada por fila.
+    - fijos: Parámetros iguales en todas las filas.
+    - directorio: Carpeta de salida.
+    - procesos: Procesos a usar (por defecto la cantidad de CPUs; 1 para calcular en este proceso).
+    - bloque: Filas por tarea.
+    - mostrar: Función que recibe (filas hechas, filas totales) para informar el avance.
+    """
+
+    if modelo not in MODELOS:
+        raise ValueError(f'Modelo desconocido: {modelo!r} (opciones: {", ".join(MODELOS)})')
+
+    filas = len(next(iter(tabla.values()))) if tabla else 0
+    if filas == 0:
+        raise ValueError('La tabla de parámetros no tiene filas')
+
+    inicio_reloj = time.perf_counter()
+    resumen = preparar_salida(modelo, directorio, tabla, fijos, filas)
+    procesos = procesos or os.cpu_count() or 1
+    bloques = [(inicio, {clave: columna[inicio:inicio + bloque] for clave, columna in tabla.items()}) for inicio in range(0, filas, bloque)]
+
+    errores = hechas = 0
+    if procesos == 1:
+        _inicializar_proceso()
+        for inicio, columnas in bloques:
+            errores += ejecutar_bloque(modelo, directorio, columnas, fijos, inicio)
+            hechas += len(next(iter(columnas.values())))
+            if mostrar:
+                mostrar(hechas, filas)
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_proceso) as pool:
+            tareas = {pool.submit(ejecutar_bloque, modelo, directorio, columnas, fijos, inicio): len(next(iter(columnas.values())))
+                      for inicio, columnas in bloques}
+            for tarea in as_completed(tareas):
+                errores += tarea.result()
+                hechas += tareas[tarea]
+                if mostrar:
+                    mostrar(hechas, filas)
+
+    resumen['errores'] = errores
+    resumen['segundos'] = round(time.perf_counter() - inicio_reloj, 3)
+    with open(os.path.join(directorio, 'lote.json'), 'w', encoding='utf-8') as archivo:
+        json.dump(resumen, archivo, indent=2, ensure_ascii=False)
+    return resumen
+
+def exportar_parquet(directorio: str, filas_por_grupo: int = 10000):
+    """
+    Escribe resultados.parquet a partir de los .npy del lote: una columna por parámetro
+    y una columna de listas por salida (con el sufijo '_salida' si se llama como un
+    parámetro, p. ej. 't'). Lee los .npy por grupos, sin cargarlos enteros.
+    """
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with open(os.path.join(directorio, 'lote.json'), encoding='utf-8') as archivo:
+        resumen = json.load(archivo)
+
+    salidas = {clave: np.load(os.path.join(directorio, f'{clave}.npy'), mmap_mode='r') for clave in resumen['salidas']}
+    estado = np.load(os.path.join(directorio, 'estado.npy'), mmap_mode='r')
+
+    with np.load(os.path.join(directorio, 'parametros.npz')) as archivo:
+        parametros = {clave: archivo[clave] for clave in archivo.files}
+
+    escritor = None
+    for inicio in range(0, resumen['filas'], filas_por_grupo):
+        fin = min(inicio + filas_por_grupo, resumen['filas'])
+        columnas = {clave: pa.array(valores[inicio:fin]) for clave, valores in parametros.items()}
+        columnas['estado'] = pa.array(estado[inicio:fin])
+        for clave, valores in salidas.items():
+            plano = np.ascontiguousarray(valores[inicio:fin]).reshape(fin - inicio, -1)
+            columnas[f'{clave}_salida' if clave in parametros else clave] = pa.FixedSizeListArray.from_arrays(pa.array(plano.ravel()), max(plano.shape[1], 1))
+        tabla = pa.table(columnas)
+        if escritor is None:
+            escritor = pq.ParquetWriter(os.path.join(directorio, 'resultados.parquet'), tabla.schema)
+        escritor.write_table(tabla)
+
+    if escritor is not None:
+        escritor.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('tabla', help='Tabla de parámetros (.csv o .json)')
+    parser.add_argument('--modelo', required=True, choices=sorted(MODELOS), help='Modelo a ejecutar')
+    parser.add_argument('--salida', required=True, help='Carpeta donde se escriben los resultados')
+    parser.add_argument('--fijo', action='append', default=[], metavar='CLAVE=VALOR', help='Parámetro igual en todas las filas (se puede repetir)')
+    parser.add_argument('--procesos', type=int, default=None, help='Procesos a usar (por defecto la cantidad de CPUs)')
+    parser.add_argument('--bloque', type=int, default=1000, help='Filas por tarea')
+    parser.add_argument('--parquet', action='store_true', help='Exportar también resultados.parquet (requiere pyarrow)')
+    args = parser.parse_args()
+
+    if args.parquet and importlib.util.find_spec('pyarrow') is None:  # Se comprueba antes de calcular todo el lote
+        parser.error('--parquet requiere pyarrow (pip install pyarrow)')
+
+    def mostrar(hechas, total):
+        print(f'\r{hechas:,}/{total:,} filas', end='', file=sys.stderr, flush=True)
+
+    try:
+        resumen = ejecutar_lote(args.modelo, leer_tabla(args.tabla), leer_fijos(args.fijo), args.salida, args.procesos, args.bloque, mostrar)
+    except ValueError as error:
+        parser.error(str(error))
+
+    print(file=sys.stderr)
+    print(f'{resumen["filas"]:,} filas en {resumen["segundos"]:.2f} s ({resumen["filas"] / max(resumen["segundos"], 1e-9):,.0f} filas/s), '
+          f'{resumen["errores"]} con error. Resultados en {args.salida}')
+
+    if args.parquet:
+        exportar_parquet(args.salida)
+        print(f'Exportado {os.path.join(args.salida, "resultados.parquet")}')
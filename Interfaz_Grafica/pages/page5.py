@@ -1,97 +1,217 @@
-###################################################################################
-#
-# Librerías
-#
-###################################################################################
-import dash  # Importa la biblioteca principal de Dash para construir la aplicación web
-from dash import dcc, html, Input, Output, callback  # Importa componentes esenciales de Dash
-from utils import modelo_SIR_cambiante   # Importa la función modelo_SIR_cambiante desde un módulo utils personalizado
-
-# Registra una página en la aplicación Dash con el nombre 'Edo-5' y la ruta '/edo5'
-dash.register_page(
-    __name__,
-    path='/edo5',
-    name='Edo-5'
-)
-
-###################################################################################
-#
-# Layout HTML
-#
-###################################################################################
-# Define el layout de la página usando componentes HTML y de Dash
-layout = html.Div(className='Pages', children=[
-
-    # Contenedor para los parámetros de entrada
-    html.Div(className='div_parametros', children=[
-
-        html.H2('PARÁMETROS'),  # Título para la sección de parámetros
-
-        # Contenedor flexible para organizar los parámetros de entrada
-        html.Div(className='div_flex', children=[
-            html.Div([ 
-                html.H3('Población Total (N)'),  
-                dcc.Input(type='number', value=1000, id='poblacion_total')  
-            ]),
-            html.Div([ 
-                html.H3('Tasa de Transmisión (beta)'),  
-                dcc.Input(type='number', value=0.3, id='beta')  
-            ]),    
-        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),  # Espacio entre elementos
-
-        # Otra fila para los parámetros
-        html.Div(className='div_flex', children=[
-            html.Div([ 
-                html.H3('Infectados Iniciales (I0)'),  
-                dcc.Input(type='number', value=1, id='infectados_ini')  
-            ]),
-            html.Div([ 
-                html.H3('Tasa de Recuperación (gamma)'),  
-                dcc.Input(type='number', value=0.1, id='gamma')  
-            ]),
-        ], style={'display': 'flex', 'align-items': 'center', 'gap': '75px'}),  # Espacio entre elementos,
-
-        # Otra fila para los parámetros 
-        html.Div(className='div_flex', children=[
-            html.Div([ 
-                html.H3('Recuperados Iniciales (R0)'),  
-                dcc.Input(type='number', value=0, id='recuperados_ini')  
-            ]),
-             html.Div([ 
-                html.H3('Tiempo Total (días)'),  
-                dcc.Input(type='number', value=160, id='tiempo_total')  
-            ]),
-        ], style={'display': 'flex', 'align-items': 'center', 'gap': '48px'}),  # Espacio entre elementos,
-    ]),  
-
-    # Contenedor para la gráfica
-    html.Div(className='div_grafica', children=[  
-        html.H2('GRÁFICA DEL MODELO SIR'),  
-        dcc.Loading(  
-            type='default',  
-            children=dcc.Graph(id='figure_sir')  
-        )
-    ])
-])
-
-###################################################################################
-#
-# Callback
-#
-###################################################################################
-
-# Define un callback para actualizar la gráfica basado en las entradas del usuario
-@callback(
-    Output('figure_sir', 'figure'),  
-    Input('poblacion_total', 'value'),  
-    Input('infectados_ini', 'value'),  
-    Input('recuperados_ini', 'value'),  
-    Input('tiempo_total', 'value'),  
-    Input('beta', 'value'),  
-    Input('gamma', 'value')  
-)
-def grafica_sir(N, I0, R0, t, beta, gamma):
-    # Llama a la función modelo_SIR_cambiante para generar la gráfica basada en los parámetros de entrada
-    fig = modelo_SIR_cambiante(N, I0, R0, t, beta, gamma, 90)  # Usar 100 como cantidad de particiones
-    
-    return fig  # Devuelve la figura para ser mostrada en el componente gráfico.
\ No newline at end of file
+###################################################################################
+#
+# Librerías
+#
+###################################################################################
+import dash  # Importa la biblioteca principal de Dash para construir la aplicación web
+from dash import dcc, html, Input, Output, State, callback, ctx, no_update  # Importa componentes esenciales de Dash
+import numpy as np
+from dash.exceptions import PreventUpdate  # Cancela la actualización sin cambiar la gráfica
+from utils.parches import figura_o_parche, parche_figura  # Actualizaciones parciales de la figura
+from utils.submuestreo import ventana_relayout  # Ventana visible a partir del zoom
+from utils.coalescencia import ESPERA_ESCRITURA, ID_PESTANA, solo_vigentes  # Entradas con espera y peticiones superadas
+from utils import modelo_SIR_cambiante, modelo_SIR_estocastico, figura_SIR   # Importa la función modelo_SIR_cambiante desde un módulo utils personalizado
+from utils.modelos import rhs_SIR, MAX_PASOS_TRAYECTORIA  # Lado derecho del modelo para la transmisión por bloques
+from utils.corridas import TRANSMISION, iniciar_corrida, obtener_corrida, cancelar_corrida, fue_cancelada  # Integraciones en curso
+
+# Registra una página en la aplicación Dash con el nombre 'Edo-5' y la ruta '/edo5'
+dash.register_page(
+    __name__,
+    path='/edo5',
+    name='Edo-5'
+)
+
+# Puntos por curva que se envían al navegador (LTTB sobre la trayectoria completa)
+PUNTOS_MAXIMOS = 400
+
+# Puntos del eje temporal en el modo estocástico (percentiles de las réplicas en cada uno)
+PUNTOS_ESTOCASTICOS = 200
+
+# Réplicas permitidas en el modo estocástico
+MIN_REPLICAS = 10
+MAX_REPLICAS = 20000
+
+###################################################################################
+#
+# Layout HTML
+#
+###################################################################################
+# Define el layout de la página usando componentes HTML y de Dash
+layout = html.Div(className='Pages', children=[
+
+    # Contenedor para los parámetros de entrada
+    html.Div(className='div_parametros', children=[
+
+        html.H2('PARÁMETROS'),  # Título para la sección de parámetros
+
+        # Contenedor flexible para organizar los parámetros de entrada
+        html.Div(className='div_flex', children=[
+            html.Div([ 
+                html.H3('Población Total (N)'),  
+                dcc.Input(type='number', value=1000, debounce=ESPERA_ESCRITURA, id='poblacion_total')  
+            ]),
+            html.Div([ 
+                html.H3('Tasa de Transmisión (beta)'),  
+                dcc.Input(type='number', value=0.3, debounce=ESPERA_ESCRITURA, id='beta')  
+            ]),    
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),  # Espacio entre elementos
+
+        # Otra fila para los parámetros
+        html.Div(className='div_flex', children=[
+            html.Div([ 
+                html.H3('Infectados Iniciales (I0)'),  
+                dcc.Input(type='number', value=1, debounce=ESPERA_ESCRITURA, id='infectados_ini')  
+            ]),
+            html.Div([ 
+                html.H3('Tasa de Recuperación (gamma)'),  
+                dcc.Input(type='number', value=0.1, debounce=ESPERA_ESCRITURA, id='gamma')  
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '75px'}),  # Espacio entre elementos,
+
+        # Otra fila para los parámetros 
+        html.Div(className='div_flex', children=[
+            html.Div([ 
+                html.H3('Recuperados Iniciales (R0)'),  
+                dcc.Input(type='number', value=0, debounce=ESPERA_ESCRITURA, id='recuperados_ini')  
+            ]),
+             html.Div([ 
+                html.H3('Tiempo Total (días)'),  
+                dcc.Input(type='number', value=160, debounce=ESPERA_ESCRITURA, id='tiempo_total')  
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '48px'}),  # Espacio entre elementos,
+
+        # Modelo determinista o estocástico (réplicas con mediana y bandas de percentiles)
+        html.Div(className='div_flex', children=[
+            html.Div([
+                html.H3('Modelo'),
+                dcc.RadioItems(
+                    options=[
+                        {'label': 'Determinista', 'value': 'determinista'},
+                        {'label': 'Estocástico (tau-leaping)', 'value': 'tau'},
+                        {'label': 'Estocástico (Gillespie)', 'value': 'gillespie'}
+                    ],
+                    value='determinista',
+                    id='tipo_sir'
+                )
+            ]),
+            html.Div([
+                html.H3('Réplicas'),
+                dcc.Input(type='number', value=1000, min=MIN_REPLICAS, max=MAX_REPLICAS, step=10, debounce=True, id='replicas_sir')
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '48px'}),  # Espacio entre elementos
+
+        # Mostrar la solución por partes mientras se integra (útil con tiempos largos)
+        dcc.Checklist(
+            options=[{'label': 'Mostrar mientras se calcula', 'value': 'transmitir', 'disabled': not TRANSMISION}],
+            value=[],
+            id='modo_sir'
+        ),
+        dcc.Store(id='corrida_sir'),  # Id de la corrida en curso y bloques ya enviados
+        dcc.Interval(id='intervalo_sir', interval=100, disabled=True)  # Pide los bloques nuevos
+    ]),  
+
+    # Contenedor para la gráfica
+    html.Div(className='div_grafica', children=[  
+        html.H2('GRÁFICA DEL MODELO SIR'),  
+        html.Div(id='aviso_sir', style={'color': 'red'}),  # Parámetros no válidos o corrida que falló
+        dcc.Loading(  
+            type='default',  
+            target_components={'figure_sir': 'figure'},  # Sin indicador al agregar bloques (extendData)
+            children=dcc.Graph(id='figure_sir')  
+        )
+    ])
+])
+
+###################################################################################
+#
+# Callback
+#
+###################################################################################
+
+# Define un callback para actualizar la gráfica basado en las entradas del usuario
+@callback(
+    Output('figure_sir', 'figure'),  
+    Output('corrida_sir', 'data'),
+    Output('intervalo_sir', 'disabled'),
+    Output('aviso_sir', 'children'),
+    Input('poblacion_total', 'value'),  
+    Input('infectados_ini', 'value'),  
+    Input('recuperados_ini', 'value'),  
+    Input('tiempo_total', 'value'),  
+    Input('beta', 'value'),  
+    Input('gamma', 'value'),  
+    Input('modo_sir', 'value'),
+    Input('tipo_sir', 'value'),
+    Input('replicas_sir', 'value'),
+    Input('figure_sir', 'relayoutData'),  # Zoom o desplazamiento sobre la gráfica
+    State('corrida_sir', 'data'),
+    State(ID_PESTANA, 'data')  # Id de la pestaña (peticiones superadas)
+)
+@solo_vigentes
+def grafica_sir(N, I0, R0, t, beta, gamma, modo, tipo, replicas, relayout, corrida):
+    transmitir = TRANSMISION and 'transmitir' in (modo or [])
+    estocastico = tipo in ('tau', 'gillespie')
+
+    if ctx.triggered_id == 'figure_sir':
+        # Zoom: recortar la trayectoria completa de la caché a la ventana visible
+        ventana = ventana_relayout(relayout)
+        if ventana is None or transmitir or estocastico:
+            raise PreventUpdate  # El evento no cambió el eje del tiempo (o la figura ya tiene todos sus puntos)
+        fig = modelo_SIR_cambiante(N, I0, R0, t, beta, gamma, PUNTOS_MAXIMOS, ventana or None)
+        return parche_figura(fig), no_update, no_update, no_update  # Solo los datos de la ventana y su rango
+
+    # Parámetros nuevos: la corrida que se estaba mostrando ya no sirve
+    cancelar_corrida(corrida and corrida['id'])
+
+    if estocastico:
+        # Réplicas simuladas en varios procesos (el límite del campo también se aplica aquí); cambiar de modelo cambia las trazas
+        replicas = min(max(int(replicas or 1000), MIN_REPLICAS), MAX_REPLICAS)
+        try:
+            fig = modelo_SIR_estocastico(N, I0, R0, t, beta, gamma, replicas, tipo, PUNTOS_ESTOCASTICOS)
+        except ValueError as error:  # Compartimentos no válidos (p. ej. I0 + R0 > N): la gráfica anterior queda
+            return no_update, None, True, str(error)
+        return figura_o_parche(fig, entradas_completas=['tipo_sir']), None, True, ''
+
+    if transmitir:
+        # Integrar en segundo plano y enviar lo que esté listo en los primeros milisegundos
+        nueva = iniciar_corrida(rhs_SIR(N, beta, gamma), [N - I0 - R0, I0, R0], np.linspace(0, t, PUNTOS_MAXIMOS), max_pasos=MAX_PASOS_TRAYECTORIA)
+        t_values, y, leidos, terminada = nueva.leer(0, espera=0.03)
+        curvas = [(t_values, y[:, i] if y.size else y) for i in range(3)]
+        if terminada:
+            cancelar_corrida(nueva.id)
+        aviso = f'La integración se detuvo: {nueva.error}' if terminada and nueva.error else ''
+        return figura_o_parche(figura_SIR(curvas, [0, t]), entradas_completas=['tipo_sir']), {'id': nueva.id, 'leidos': leidos}, terminada, aviso
+
+    # Llama a la función modelo_SIR_cambiante para generar la gráfica basada en los parámetros de entrada
+    fig = modelo_SIR_cambiante(N, I0, R0, t, beta, gamma, PUNTOS_MAXIMOS)
+    return figura_o_parche(fig, entradas_completas=['tipo_sir']), None, True, ''  # Figura completa la primera vez, luego solo los datos que cambian
+
+# Agrega a las curvas los bloques nuevos de la corrida en curso (modo transmisión)
+@callback(
+    Output('figure_sir', 'extendData'),
+    Output('corrida_sir', 'data', allow_duplicate=True),
+    Output('intervalo_sir', 'disabled', allow_duplicate=True),
+    Output('aviso_sir', 'children', allow_duplicate=True),
+    Input('intervalo_sir', 'n_intervals'),
+    State('corrida_sir', 'data'),
+    prevent_initial_call=True
+)
+def transmitir_sir(n_intervals, corrida):
+    actual = obtener_corrida(corrida['id']) if corrida else None
+    if actual is None:
+        if corrida is None or fue_cancelada(corrida['id']):
+            raise PreventUpdate  # La corrida se reemplazó o ya se envió completa
+        # Descartada por MAX_CORRIDAS (o de otro worker): dejar de consultar y avisar
+        return no_update, None, True, 'La corrida se descartó antes de terminar; cambie un parámetro para volver a calcular.'
+
+    t_values, y, leidos, terminada = actual.leer(corrida['leidos'])
+    if terminada and leidos == len(actual.bloques):
+        cancelar_corrida(actual.id)  # Ya se envió todo
+    aviso = f'La integración se detuvo: {actual.error}' if terminada and actual.error else no_update
+
+    if leidos == corrida['leidos']:
+        return no_update, no_update, terminada, aviso
+
+    # extendData: (datos nuevos, índices de las trazas S, I y R)
+    nuevos = {'x': [t_values.tolist()] * 3, 'y': [y[:, i].tolist() for i in range(3)]}
+    return (nuevos, [0, 1, 2]), {'id': actual.id, 'leidos': leidos}, terminada, aviso
@@ -1,82 +1,190 @@
-import dash
-from dash import dcc, html, Input, Output, callback
-from utils import modelo_lotka_volterra
-
-# Registrar página
-dash.register_page(
-    __name__,
-    path='/edo6',
-    name='Edo-6'
-)
-
-# Layout de la página
-layout = html.Div(className='Pages', children=[
-
-    html.Div(className='div_parametros', children=[
-
-        html.H2('PARÁMETROS'),
-
-        # Sección de parámetros
-        html.Div(className='div_flex', children=[
-            html.Div([
-                html.H3('Tasa de Crecimiento (alpha)'),
-                dcc.Input(type='number', value=0.1, id='alpha')
-            ]),
-            html.Div([
-                html.H3('Tasa de Depredación (beta)'),
-                dcc.Input(type='number', value=0.02, id='beta')
-            ]),
-        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),
-
-        html.Div(className='div_flex', children=[
-            html.Div([
-                html.H3('Tasa de Crecimiento Depredador (delta)'),
-                dcc.Input(type='number', value=0.01, id='delta')
-            ]),
-            html.Div([
-                html.H3('Tasa de Mortalidad Depredador (gamma)'),
-                dcc.Input(type='number', value=0.1, id='gamma')
-            ]),
-        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),
-
-        html.Div(className='div_flex', children=[
-            html.Div([
-                html.H3('Población Inicial de Presas (x0)'),
-                dcc.Input(type='number', value=40, id='x0')
-            ]),
-            html.Div([
-                html.H3('Población Inicial de Depredadores (y0)'),
-                dcc.Input(type='number', value=9, id='y0')
-            ]),
-        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),
-
-        html.Div([
-            html.H3('Tiempo Total (días)'),
-            dcc.Input(type='number', value=200, id='tiempo_total')
-        ]),
-    ]),
-
-    # Contenedor para la gráfica
-    html.Div(className='div_grafica', children=[
-        html.H2('GRÁFICA DEL MODELO LOTKA-VOLTERRA'),
-        dcc.Loading(
-            type='default',
-            children=dcc.Graph(id='figure_lv')
-        )
-    ])
-])
-
-# Callback para actualizar la gráfica
-@callback(
-    Output('figure_lv', 'figure'),
-    Input('alpha', 'value'),
-    Input('beta', 'value'),
-    Input('delta', 'value'),
-    Input('gamma', 'value'),
-    Input('x0', 'value'),
-    Input('y0', 'value'),
-    Input('tiempo_total', 'value')
-)
-def grafica_lv(alpha, beta, delta, gamma, x0, y0, t):
-    fig = modelo_lotka_volterra(alpha, beta, delta, gamma, x0, y0, t, 100)
-    return fig
\ No newline at end of file
+import dash
+from dash import dcc, html, Input, Output, State, callback, ctx, no_update
+import numpy as np
+from dash.exceptions import PreventUpdate
+from utils.parches import figura_o_parche, parche_figura
+from utils.submuestreo import ventana_relayout
+from utils.coalescencia import ESPERA_ESCRITURA, ID_PESTANA, solo_vigentes
+from utils import modelo_lotka_volterra, figura_lotka_volterra
+from utils.modelos import rhs_lotka_volterra, paso_lotka_volterra, MAX_PASOS_TRAYECTORIA, PASOS_POR_PERIODO
+from utils.corridas import TRANSMISION, iniciar_corrida, obtener_corrida, cancelar_corrida, fue_cancelada
+
+# Registrar página
+dash.register_page(
+    __name__,
+    path='/edo6',
+    name='Edo-6'
+)
+
+# Puntos por curva que se envían al navegador (LTTB sobre la trayectoria completa)
+PUNTOS_MAXIMOS = 400
+
+# Layout de la página
+layout = html.Div(className='Pages', children=[
+
+    html.Div(className='div_parametros', children=[
+
+        html.H2('PARÁMETROS'),
+
+        # Sección de parámetros
+        html.Div(className='div_flex', children=[
+            html.Div([
+                html.H3('Tasa de Crecimiento (alpha)'),
+                dcc.Input(type='number', value=0.1, debounce=ESPERA_ESCRITURA, id='alpha')
+            ]),
+            html.Div([
+                html.H3('Tasa de Depredación (beta)'),
+                dcc.Input(type='number', value=0.02, debounce=ESPERA_ESCRITURA, id='beta')
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),
+
+        html.Div(className='div_flex', children=[
+            html.Div([
+                html.H3('Tasa de Crecimiento Depredador (delta)'),
+                dcc.Input(type='number', value=0.01, debounce=ESPERA_ESCRITURA, id='delta')
+            ]),
+            html.Div([
+                html.H3('Tasa de Mortalidad Depredador (gamma)'),
+                dcc.Input(type='number', value=0.1, debounce=ESPERA_ESCRITURA, id='gamma')
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),
+
+        html.Div(className='div_flex', children=[
+            html.Div([
+                html.H3('Población Inicial de Presas (x0)'),
+                dcc.Input(type='number', value=40, debounce=ESPERA_ESCRITURA, id='x0')
+            ]),
+            html.Div([
+                html.H3('Población Inicial de Depredadores (y0)'),
+                dcc.Input(type='number', value=9, debounce=ESPERA_ESCRITURA, id='y0')
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),
+
+        html.Div([
+            html.H3('Tiempo Total (días)'),
+            dcc.Input(type='number', value=200, debounce=ESPERA_ESCRITURA, id='tiempo_total')
+        ]),
+
+        # Método de integración: los simplécticos mantienen las órbitas cerradas en tiempos largos
+        html.Div(className='div_flex', children=[
+            html.Div([
+                html.H3('Método de Integración'),
+                dcc.Dropdown(
+                    options=[
+                        {'label': 'Runge-Kutta adaptativo (RK45)', 'value': 'dopri5'},
+                        {'label': 'Simpléctico Störmer-Verlet (orden 2)', 'value': 'verlet'},
+                        {'label': 'Simpléctico Yoshida (orden 4)', 'value': 'yoshida4'},
+                        {'label': 'Simpléctico Yoshida (orden 6)', 'value': 'yoshida6'}
+                    ],
+                    value='dopri5',
+                    clearable=False,
+                    id='metodo_lv'
+                )
+            ], style={'width': '300px'}),
+            html.Div([
+                html.H3('Pasos por Período'),
+                dcc.Input(type='number', value=PASOS_POR_PERIODO, min=4, step=1, debounce=ESPERA_ESCRITURA, id='pasos_lv')
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),
+
+        # Mostrar la solución por partes mientras se integra (útil con tiempos largos)
+        dcc.Checklist(
+            options=[{'label': 'Mostrar mientras se calcula', 'value': 'transmitir', 'disabled': not TRANSMISION}],
+            value=[],
+            id='modo_lv'
+        ),
+        dcc.Store(id='corrida_lv'),  # Id de la corrida en curso y bloques ya enviados
+        dcc.Interval(id='intervalo_lv', interval=100, disabled=True)  # Pide los bloques nuevos
+    ]),
+
+    # Contenedor para la gráfica
+    html.Div(className='div_grafica', children=[
+        html.H2('GRÁFICA DEL MODELO LOTKA-VOLTERRA'),
+        html.Div(id='aviso_lv', style={'color': 'red'}),  # Corrida que falló o se descartó
+        dcc.Loading(
+            type='default',
+            target_components={'figure_lv': 'figure'},  # Sin indicador al agregar bloques (extendData)
+            children=dcc.Graph(id='figure_lv')
+        )
+    ])
+])
+
+# Callback para actualizar la gráfica
+@callback(
+    Output('figure_lv', 'figure'),
+    Output('corrida_lv', 'data'),
+    Output('intervalo_lv', 'disabled'),
+    Output('aviso_lv', 'children'),
+    Input('alpha', 'value'),
+    Input('beta', 'value'),
+    Input('delta', 'value'),
+    Input('gamma', 'value'),
+    Input('x0', 'value'),
+    Input('y0', 'value'),
+    Input('tiempo_total', 'value'),
+    Input('metodo_lv', 'value'),
+    Input('pasos_lv', 'value'),
+    Input('modo_lv', 'value'),
+    Input('figure_lv', 'relayoutData'),  # Zoom o desplazamiento sobre la gráfica
+    State('corrida_lv', 'data'),
+    State(ID_PESTANA, 'data')  # Id de la pestaña (peticiones superadas)
+)
+@solo_vigentes
+def grafica_lv(alpha, beta, delta, gamma, x0, y0, t, metodo, pasos, modo, relayout, corrida):
+    transmitir = TRANSMISION and 'transmitir' in (modo or [])
+    paso = None if metodo == 'dopri5' else paso_lotka_volterra(alpha, gamma, pasos or PASOS_POR_PERIODO)
+
+    if ctx.triggered_id == 'figure_lv':
+        # Zoom: recortar la trayectoria completa de la caché a la ventana visible
+        ventana = ventana_relayout(relayout)
+        if ventana is None or transmitir:
+            raise PreventUpdate  # El evento no cambió el eje del tiempo
+        fig = modelo_lotka_volterra(alpha, beta, delta, gamma, x0, y0, t, PUNTOS_MAXIMOS, ventana or None, metodo, paso)
+        return parche_figura(fig), no_update, no_update, no_update  # Solo los datos de la ventana y su rango
+
+    # Parámetros nuevos: la corrida que se estaba mostrando ya no sirve
+    cancelar_corrida(corrida and corrida['id'])
+
+    if transmitir:
+        # Integrar en segundo plano y enviar lo que esté listo en los primeros milisegundos
+        opciones = {} if paso is None else {'paso': paso}
+        nueva = iniciar_corrida(rhs_lotka_volterra(alpha, beta, delta, gamma), [x0, y0], np.linspace(0, t, PUNTOS_MAXIMOS), metodo=metodo, max_pasos=MAX_PASOS_TRAYECTORIA, **opciones)
+        t_values, y, leidos, terminada = nueva.leer(0, espera=0.03)
+        curvas = [(t_values, y[:, i] if y.size else y) for i in range(2)]
+        if terminada:
+            cancelar_corrida(nueva.id)
+        aviso = f'La integración se detuvo: {nueva.error}' if terminada and nueva.error else ''
+        return figura_o_parche(figura_lotka_volterra(curvas, [0, t])), {'id': nueva.id, 'leidos': leidos}, terminada, aviso
+
+    fig = modelo_lotka_volterra(alpha, beta, delta, gamma, x0, y0, t, PUNTOS_MAXIMOS, None, metodo, paso)
+    return figura_o_parche(fig), None, True, ''  # Figura completa la primera vez, luego solo los datos que cambian
+
+# Agrega a las curvas los bloques nuevos de la corrida en curso (modo transmisión)
+@callback(
+    Output('figure_lv', 'extendData'),
+    Output('corrida_lv', 'data', allow_duplicate=True),
+    Output('intervalo_lv', 'disabled', allow_duplicate=True),
+    Output('aviso_lv', 'children', allow_duplicate=True),
+    Input('intervalo_lv', 'n_intervals'),
+    State('corrida_lv', 'data'),
+    prevent_initial_call=True
+)
+def transmitir_lv(n_intervals, corrida):
+    actual = obtener_corrida(corrida['id']) if corrida else None
+    if actual is None:
+        if corrida is None or fue_cancelada(corrida['id']):
+            raise PreventUpdate  # La corrida se reemplazó o ya se envió completa
+        # Descartada por MAX_CORRIDAS (o de otro worker): dejar de consultar y avisar
+        return no_update, None, True, 'La corrida se descartó antes de terminar; cambie un parámetro para volver a calcular.'
+
+    t_values, y, leidos, terminada = actual.leer(corrida['leidos'])
+    if terminada and leidos == len(actual.bloques):
+        cancelar_corrida(actual.id)  # Ya se envió todo
+    aviso = f'La integración se detuvo: {actual.error}' if terminada and actual.error else no_update
+
+    if leidos == corrida['leidos']:
+        return no_update, no_update, terminada, aviso
+
+    # extendData: (datos nuevos, índices de las trazas de presas y depredadores)
+    nuevos = {'x': [t_values.tolist()] * 2, 'y': [y[:, i].tolist() for i in range(2)]}
+    return (nuevos, [0, 1]), {'id': actual.id, 'leidos': leidos}, terminada, aviso
@@ -1,122 +1,180 @@
-import dash
-from dash import dcc, html, Input, Output, callback
-import numpy as np
-import sympy as sp
-import matplotlib.pyplot as plt
-import io
-import base64
-
-# Registrar la página en la aplicación Dash
-dash.register_page(
-    __name__,
-    path='/edo7',  # Ruta para acceder a esta página
-    name='Edo-7'   # Nombre que se mostrará en el menú de navegación
-)
-
-# Función que calcula los resultados y genera la gráfica
-def calcular_y_graficar():
-    # Definimos las variables simbólicas
-    x, y = sp.symbols('x y')
-
-    # Definimos las ecuaciones diferenciales del sistema
-    x_prima = x*(5-y)
-    y_prima = y*(5-x)
-
-    #x_prima = x * (5 - (5/8) * x - y)
-    #y_prima = y * (5 - (5/8) * y - x)
-
-    # Calculamos los puntos de equilibrio resolviendo las ecuaciones
-    puntos_equilibrio = sp.solve([x_prima, y_prima], (x, y))
-
-    # Creamos la matriz Jacobiana del sistema
-    Jacobiano = sp.Matrix([
-        [sp.diff(x_prima, x), sp.diff(x_prima, y)],
-        [sp.diff(y_prima, x), sp.diff(y_prima, y)]
-    ])
-
-    # Evaluamos el Jacobiano en cada punto de equilibrio y hallamos los autovalores
-    resultados = []
-    for punto in puntos_equilibrio:
-        Evaluar_Jacobiano = Jacobiano.subs({x: punto[0], y: punto[1]})  # Sustituimos el punto en el Jacobiano
-        autovalores = Evaluar_Jacobiano.eigenvals()  # Calculamos los autovalores
-        resultados.append({
-            'punto': punto,
-            'Jacobiano': Evaluar_Jacobiano,
-            'autovalores': autovalores
-        })
-
-    # Graficamos el campo de vectores del sistema
-    X, Y = np.mgrid[-1:10:100j, -1:10:100j]  # Creamos una malla para los ejes x e y
-    U = X*(5-Y) # Definimos la componente x del campo de vectores
-    V = Y*(5-X)  # Definimos la componente y del campo de vectores
-
-    #U = X * (5 - (5/8) * X - Y)  # Definimos la componente x del campo de vectores
-    #V = Y * (5 - (5/8) * Y - X)  # Definimos la componente y del campo de vectores
-    
-    fig, ax = plt.subplots()  # Creamos una figura y un eje para la gráfica
-    ax.streamplot(Y, X, V, U, color='blue')  # Dibujamos el campo de vectores
-    
-    # Añadimos los puntos de equilibrio a la gráfica
-    for punto in puntos_equilibrio:
-        ax.plot(float(punto[0]), float(punto[1]), 'o', color='red')
-
-    ax.set_title('Campo de vectores del sistema 1')  # Título de la gráfica
-    ax.set_xlabel('x')  # Etiqueta del eje x
-    ax.set_ylabel('y')  # Etiqueta del eje y
-
-    # Convertimos la gráfica a formato base64 para que sea legible por Dash
-    buf = io.BytesIO()  # Creamos un buffer en memoria
-    plt.savefig(buf, format='png')  # Guardamos la figura en el buffer
-    buf.seek(0)  # Volvemos al inicio del buffer
-    img_str = base64.b64encode(buf.read()).decode('utf-8')  # Codificamos la imagen a base64
-    plt.close(fig)  # Cerramos la figura
-
-    return resultados, f"data:image/png;base64,{img_str}", puntos_equilibrio, Jacobiano  # Retornamos los resultados
-
-# Layout de la página
-layout = html.Div(className='Pages', children=[
-    html.H2('Modelo de Ecuaciones Diferenciales'),  # Título de la página
-    
-    html.Button("Calcular", id='calcular-button', n_clicks=0),  # Botón para calcular
-    
-    html.Div(id='resultados', style={'margin-top': '20px'}),  # Div para mostrar resultados
-    
-    html.Img(id='grafica', style={'width': '100%', 'height': 'auto', 'margin-top': '20px'})  # Imagen para la gráfica
-])
-
-# Callback para actualizar los resultados y la gráfica
-@callback(
-    Output('resultados', 'children'),  # Salida para los resultados
-    Output('grafica', 'src'),  # Salida para la imagen
-    Input('calcular-button', 'n_clicks')  # Entrada que detecta los clics en el botón
-)
-def actualizar_resultados(n_clicks):
-    if n_clicks > 0:  # Solo se ejecuta si el botón ha sido clicado
-        resultados, img_src, puntos_equilibrio, Jacobiano = calcular_y_graficar()  # Llamamos a la función de cálculo
-        
-        # Formateo de resultados
-        resultados_texto = []
-
-        # Mostrar puntos de equilibrio
-        resultados_texto.append(html.Div(f"Los puntos de equilibrio son: {puntos_equilibrio}"))
-        resultados_texto.append(html.Div("#########################################"))
-        
-        # Mostrar Jacobiano
-        jacobiano_str = str(Jacobiano).replace('Matrix', '').replace('[', '').replace(']', '')
-        jacobiano_lines = jacobiano_str.split('], ')  # Separamos las líneas de la matriz
-        jacobiano_pretty = '\n'.join(['[ ' + line.strip() + ' ]' for line in jacobiano_lines])  # Formato vertical
-        resultados_texto.append(html.Pre(f"Esta es la Matriz Jacobiano:\n{jacobiano_pretty}", style={'white-space': 'pre-wrap'}))
-        resultados_texto.append(html.Div("##########################################"))
-
-        # Evaluar resultados en puntos de equilibrio
-        for res in resultados:
-            resultados_texto.append(html.Div(f"Evaluado en el punto: {res['punto']}"))
-            jacobiano_evaluado_str = str(res['Jacobiano']).replace('Matrix', '').replace('[', '').replace(']', '')
-            jacobiano_evaluado_lines = jacobiano_evaluado_str.split('], ')
-            jacobiano_evaluado_pretty = '\n'.join(['[ ' + line.strip() + ' ]' for line in jacobiano_evaluado_lines])  # Formato vertical
-            resultados_texto.append(html.Pre(f"Jacobiano evaluado:\n{jacobiano_evaluado_pretty}", style={'white-space': 'pre-wrap'}))
-            resultados_texto.append(html.Div(f"Autovalores: {res['autovalores']}"))  # Mostramos los autovalores
-            resultados_texto.append(html.Div("#######################################"))
-
-        return resultados_texto, img_src  # Retornamos los resultados y la imagen
-    return '', ''  # Retorno vacío si no se ha clicado el botón
\ No newline at end of file
+import dash
+from dash import dcc, html, Input, Output, State
+from utils.figuras import traza, eje, figura, figura_vacia, layout as layout_figura, layout_modelo
+from utils.codificacion import codificar_figura
+from utils.lineas_flujo import crear_lineas_flujo
+from utils.segundo_plano import callback_segundo_plano
+
+# Registrar la página en la aplicación Dash
+dash.register_page(
+    __name__,
+    path='/edo7',  # Ruta para acceder a esta página
+    name='Edo-7'   # Nombre que se mostrará en el menú de navegación
+)
+
+# Puntos de salida de la trayectoria integrada
+PUNTOS_TRAYECTORIA = 1000
+
+# Función que calcula los resultados y genera la gráfica
+def calcular_y_graficar(f_x, f_y, x0=None, y0=None, t=None, metodo='rosenbrock', set_progress=lambda texto: None):
+    # sympy tarda en importarse; se carga la primera vez que se usa la página y no al arrancar la app
+    set_progress('Resolviendo el sistema...')
+    from utils.simbolico import analizar_sistema
+
+    # Análisis simbólico del sistema (se resuelve y compila una sola vez por sistema)
+    analisis = analizar_sistema(f_x, f_y)
+    set_progress('Trazando las líneas de flujo...')
+
+    # Graficamos las líneas de flujo del sistema (figura interactiva en lugar de una imagen)
+    lineas = crear_lineas_flujo(analisis.campo, (-1, 10), (-1, 10), line=dict(color='blue', width=1), name='Líneas de flujo', hoverinfo='skip')
+
+    # Añadimos los puntos de equilibrio a la gráfica
+    equilibrios = traza(
+        'scatter',
+        x=[punto[0] for punto in analisis.equilibrios_num],
+        y=[punto[1] for punto in analisis.equilibrios_num],
+        mode='markers',
+        marker=dict(color='red', size=9),
+        name='Puntos de equilibrio'
+    )
+
+    trazas = [lineas, equilibrios]
+    fig_tiempo, pasos = figura_vacia(), None
+
+    # Trayectoria desde (x0, y0): con 'rosenbrock' el Jacobiano simbólico (ya compilado) se usa en cada paso,
+    # así los sistemas rígidos se integran en ventanas largas sin los pasos diminutos de un método explícito
+    if None not in (x0, y0, t) and t > 0:
+        set_progress('Integrando la trayectoria...')
+        t_values, solucion, pasos = analisis.trayectoria(x0, y0, t, PUNTOS_TRAYECTORIA, metodo)
+
+        trazas.append(traza('scatter', x=solucion[:, 0], y=solucion[:, 1], mode='lines', line=dict(color='green', width=2), name='Trayectoria'))
+        fig_tiempo = figura([
+            traza('scatter', x=t_values, y=solucion[:, 0], mode='lines', name='x(t)'),
+            traza('scatter', x=t_values, y=solucion[:, 1], mode='lines', name='y(t)')
+        ], layout_modelo(f'Solución del sistema ({pasos} pasos del integrador)', 'Tiempo', 'Valor'))
+
+    fig = figura(trazas, layout_figura(
+        'Campo de vectores del sistema 1',  # Título de la gráfica
+        eje('x', contorno=False, range=[-1, 10]),  # Etiqueta y rango del eje x
+        eje('y', contorno=False, range=[-1, 10], scaleanchor='x'),  # Etiqueta y rango del eje y
+        width=700,
+        height=650,
+        showlegend=False
+    ))
+
+    return analisis.textos, fig, fig_tiempo, pasos  # Retornamos los resultados ya en texto, las figuras y los pasos
+
+# Layout de la página
+layout = html.Div(className='Pages', children=[
+    html.H2('Modelo de Ecuaciones Diferenciales'),  # Título de la página
+
+    # Ecuaciones del sistema (se pueden cambiar, p. ej. x*(5 - (5/8)*x - y))
+    html.H3("x' ="),
+    dcc.Input(type='text', value='x*(5-y)', id='ecuacion_x', debounce=True),
+    html.H3("y' ="),
+    dcc.Input(type='text', value='y*(5-x)', id='ecuacion_y', debounce=True),
+    
+    # Trayectoria a integrar (tiempo vacío para solo analizar el sistema)
+    html.Div(className='div_flex', children=[
+        html.Div([
+            html.H3('x(0)'),
+            dcc.Input(type='number', value=1, id='x0_edo7', debounce=True)
+        ]),
+        html.Div([
+            html.H3('y(0)'),
+            dcc.Input(type='number', value=1, id='y0_edo7', debounce=True)
+        ]),
+        html.Div([
+            html.H3('Tiempo'),
+            dcc.Input(type='number', value=5, min=0, id='tiempo_edo7', debounce=True)
+        ]),
+        html.Div([
+            html.H3('Método de Integración'),
+            dcc.Dropdown(
+                options=[
+                    {'label': 'Rígido: Rosenbrock con Jacobiano simbólico', 'value': 'rosenbrock'},
+                    {'label': 'Runge-Kutta adaptativo (RK45)', 'value': 'dopri5'}
+                ],
+                value='rosenbrock',
+                clearable=False,
+                id='metodo_edo7'
+            )
+        ], style={'width': '350px'}),
+    ], style={'display': 'flex', 'align-items': 'center', 'gap': '40px'}),
+
+    html.Button("Calcular", id='calcular-button', n_clicks=0),  # Botón para calcular
+    
+    # Avance del cálculo, visible bajo el indicador de carga
+    html.Div(id='progreso_edo7', style={'margin-top': '10px'}),
+
+    dcc.Loading(
+        type='default',
+        overlay_style={'visibility': 'visible', 'opacity': 0.5},
+        children=[
+            html.Div(id='resultados', style={'margin-top': '20px'}),  # Div para mostrar resultados
+
+            dcc.Graph(id='grafica', style={'margin-top': '20px'}),  # Gráfica interactiva del sistema
+
+            dcc.Graph(id='grafica_tiempo_edo7', style={'margin-top': '20px'})  # Trayectoria en el tiempo
+        ]
+    )
+])
+
+# Callback para actualizar los resultados y la gráfica (en segundo plano: sympy puede tardar).
+# Cada trabajo corre en un proceso aparte, así que `CACHE_ANALISIS` no sobrevive entre clics: las mismas
+# entradas se responden desde la caché en disco del administrador (la clave ignora n_clicks, argumento 0,
+# y el callback no corre al cargar la página), y el mismo sistema con otra condición inicial, tiempo o
+# método reutiliza los equilibrios guardados en el mismo disco (`simbolico.CACHE_RESOLUCIONES`)
+@callback_segundo_plano(
+    Output('resultados', 'children'),  # Salida para los resultados
+    Output('grafica', 'figure'),  # Salida para la gráfica
+    Output('grafica_tiempo_edo7', 'figure'),  # Salida para la trayectoria en el tiempo
+    Input('calcular-button', 'n_clicks'),  # Entrada que detecta los clics en el botón
+    State('ecuacion_x', 'value'),  # Ecuación de x'
+    State('ecuacion_y', 'value'),  # Ecuación de y'
+    State('x0_edo7', 'value'),  # Condición inicial de x
+    State('y0_edo7', 'value'),  # Condición inicial de y
+    State('tiempo_edo7', 'value'),  # Tiempo final de la trayectoria
+    State('metodo_edo7', 'value'),  # Integrador
+    progreso=Output('progreso_edo7', 'children'),  # Texto con el avance del cálculo
+    running=[(Output('calcular-button', 'disabled'), True, False)],
+    cache_args_to_ignore=[0],
+    prevent_initial_call=True
+)
+def actualizar_resultados(set_progress, n_clicks, f_x, f_y, x0, y0, t, metodo):
+    if n_clicks > 0:  # Solo se ejecuta si el botón ha sido clicado
+        try:
+            textos, fig, fig_tiempo, pasos = calcular_y_graficar(f_x or '', f_y or '', x0, y0, t, metodo, set_progress)  # Llamamos a la función de cálculo
+        except (ValueError, RuntimeError) as error:  # Ecuación no válida o trayectoria que el integrador no pudo seguir
+            return html.Div(str(error), style={'color': 'red'}), figura_vacia(), figura_vacia()
+
+        # Formateo de resultados
+        resultados_texto = []
+
+        # Mostrar puntos de equilibrio
+        resultados_texto.append(html.Div(f"Los puntos de equilibrio son: {textos['puntos_equilibrio']}"))
+        resultados_texto.append(html.Div("#########################################"))
+        
+        # Mostrar Jacobiano
+        jacobiano_str = textos['jacobiano'].replace('Matrix', '').replace('[', '').replace(']', '')
+        jacobiano_lines = jacobiano_str.split('], ')  # Separamos las líneas de la matriz
+        jacobiano_pretty = '\n'.join(['[ ' + line.strip() + ' ]' for line in jacobiano_lines])  # Formato vertical
+        resultados_texto.append(html.Pre(f"Esta es la Matriz Jacobiano:\n{jacobiano_pretty}", style={'white-space': 'pre-wrap'}))
+        resultados_texto.append(html.Div("##########################################"))
+
+        # Evaluar resultados en puntos de equilibrio
+        for res in textos['resultados']:
+            resultados_texto.append(html.Div(f"Evaluado en el punto: {res['punto']}"))
+            jacobiano_evaluado_str = res['Jacobiano'].replace('Matrix', '').replace('[', '').replace(']', '')
+            jacobiano_evaluado_lines = jacobiano_evaluado_str.split('], ')
+            jacobiano_evaluado_pretty = '\n'.join(['[ ' + line.strip() + ' ]' for line in jacobiano_evaluado_lines])  # Formato vertical
+            resultados_texto.append(html.Pre(f"Jacobiano evaluado:\n{jacobiano_evaluado_pretty}", style={'white-space': 'pre-wrap'}))
+            resultados_texto.append(html.Div(f"Autovalores: {res['autovalores']}"))  # Mostramos los autovalores
+            resultados_texto.append(html.Div("#######################################"))
+
+        # Costo de la trayectoria integrada
+        if pasos is not None:
+            resultados_texto.append(html.Div(f"Pasos del integrador ({metodo}): {pasos}"))
+
+        return resultados_texto, codificar_figura(fig), codificar_figura(fig_tiempo)  # Retornamos los resultados y las gráficas (datos como arreglos binarios)
+    return '', figura_vacia(), figura_vacia()  # Retorno vacío si no se ha clicado el botón
\ No newline at end of file
@@ -0,0 +1,114 @@
+###################################################################################
+#
+# Librerías
+#
+###################################################################################
+import dash  # Importa la biblioteca principal de Dash para construir la aplicación web
+from dash import dcc, html, Input, Output  # Importa componentes esenciales de Dash
+from utils.parches import figura_o_parche  # Actualizaciones parciales de la figura
+from utils.segundo_plano import callback_segundo_plano  # Callbacks largos fuera del worker web
+from utils import modelo_SIR_barrido  # Importa la función modelo_SIR_barrido desde un módulo utils personalizado
+
+# Registra una página en la aplicación Dash con el nombre 'Edo-8' y la ruta '/edo8'
+dash.register_page(
+    __name__,
+    path='/edo8',
+    name='Edo-8'
+)
+
+###################################################################################
+#
+# Layout HTML
+#
+###################################################################################
+# Define el layout de la página usando componentes HTML y de Dash
+layout = html.Div(className='Pages', children=[
+
+    # Contenedor para los parámetros de entrada
+    html.Div(className='div_parametros', children=[
+
+        html.H2('PARÁMETROS'),  # Título para la sección de parámetros
+
+        # Rango de la tasa de transmisión
+        html.Div(className='div_flex', children=[
+            html.Div([
+                html.H3('Beta mínimo'),
+                dcc.Input(type='number', value=0.1, id='beta_min')
+            ]),
+            html.Div([
+                html.H3('Beta máximo'),
+                dcc.Input(type='number', value=0.6, id='beta_max')
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),  # Espacio entre elementos
+
+        # Rango de la tasa de recuperación
+        html.Div(className='div_flex', children=[
+            html.Div([
+                html.H3('Gamma mínimo'),
+                dcc.Input(type='number', value=0.05, id='gamma_min')
+            ]),
+            html.Div([
+                html.H3('Gamma máximo'),
+                dcc.Input(type='number', value=0.3, id='gamma_max')
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),  # Espacio entre elementos
+
+        # Condiciones iniciales y tiempo
+        html.Div(className='div_flex', children=[
+            html.Div([
+                html.H3('Población Total (N)'),
+                dcc.Input(type='number', value=1000, id='poblacion_barrido')
+            ]),
+            html.Div([
+                html.H3('Infectados Iniciales (I0)'),
+                dcc.Input(type='number', value=1, id='infectados_barrido')
+            ]),
+            html.Div([
+                html.H3('Tiempo Total (días)'),
+                dcc.Input(type='number', value=160, id='tiempo_barrido')
+            ]),
+        ]),
+
+        html.H3('Resolución del Barrido'),  # Cantidad de valores por eje
+        dcc.Slider(min=5, max=60, step=1, value=30, marks=None, tooltip={'placement': 'bottom', 'always_visible': True}, id='resolucion_barrido'),
+    ]),
+
+    # Contenedor para la gráfica
+    html.Div(className='div_grafica', children=[
+        html.H2('BARRIDO DE PARÁMETROS DEL MODELO SIR'),
+        html.Div(id='progreso_barrido'),  # Avance del barrido mientras se calcula
+        dcc.Loading(
+            type='default',
+            overlay_style={'visibility': 'visible', 'opacity': 0.5},  # Deja ver la figura anterior mientras se calcula
+            children=dcc.Graph(id='figure_barrido')
+        )
+    ])
+])
+
+###################################################################################
+#
+# Callback
+#
+###################################################################################
+
+# Define un callback para actualizar los mapas de calor basado en las entradas del usuario.
+# Corre en segundo plano: si se cambian los parámetros antes de terminar, el cálculo anterior se cancela.
+@callback_segundo_plano(
+    Output('figure_barrido', 'figure'),
+    Input('poblacion_barrido', 'value'),
+    Input('infectados_barrido', 'value'),
+    Input('tiempo_barrido', 'value'),
+    Input('beta_min', 'value'),
+    Input('beta_max', 'value'),
+    Input('gamma_min', 'value'),
+    Input('gamma_max', 'value'),
+    Input('resolucion_barrido', 'value'),
+    progreso=Output('progreso_barrido', 'children')
+)
+def grafica_barrido(set_progress, N, I0, t, beta_min, beta_max, gamma_min, gamma_max, resolucion):
+    set_progress(f'Integrando {resolucion or 0}×{resolucion or 0} combinaciones de beta y gamma...')
+
+    # Llama a la función modelo_SIR_barrido para integrar todas las combinaciones a la vez
+    fig = modelo_SIR_barrido(N, I0, 0, t, beta_min, beta_max, gamma_min, gamma_max, resolucion)
+
+    return figura_o_parche(fig)  # Figura completa la primera vez, luego solo los mapas que cambian.
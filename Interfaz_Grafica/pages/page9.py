@@ -0,0 +1,110 @@
+import dash
+from dash import dcc, html, Input, Output, State, callback
+from dash.exceptions import PreventUpdate
+from utils.codificacion import codificar_figura
+from utils.coalescencia import ESPERA_ESCRITURA, ID_PESTANA, solo_vigentes
+from utils import retrato_fase_lotka_volterra
+
+# Registrar página
+dash.register_page(
+    __name__,
+    path='/edo9',
+    name='Edo-9'
+)
+
+# Puntos de cada órbita que se envían al navegador
+PUNTOS_ORBITA = 300
+
+# Layout de la página
+layout = html.Div(className='Pages', children=[
+
+    html.Div(className='div_parametros', children=[
+
+        html.H2('PARÁMETROS'),
+
+        # Sección de parámetros (ids propios: la página 6 ya usa alpha, beta, ...)
+        html.Div(className='div_flex', children=[
+            html.Div([
+                html.H3('Tasa de Crecimiento (alpha)'),
+                dcc.Input(type='number', value=0.1, debounce=ESPERA_ESCRITURA, id='alpha_fase')
+            ]),
+            html.Div([
+                html.H3('Tasa de Depredación (beta)'),
+                dcc.Input(type='number', value=0.02, debounce=ESPERA_ESCRITURA, id='beta_fase')
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),
+
+        html.Div(className='div_flex', children=[
+            html.Div([
+                html.H3('Tasa de Crecimiento Depredador (delta)'),
+                dcc.Input(type='number', value=0.01, debounce=ESPERA_ESCRITURA, id='delta_fase')
+            ]),
+            html.Div([
+                html.H3('Tasa de Mortalidad Depredador (gamma)'),
+                dcc.Input(type='number', value=0.1, debounce=ESPERA_ESCRITURA, id='gamma_fase')
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),
+
+        html.Div(className='div_flex', children=[
+            html.Div([
+                html.H3('Tiempo de cada Órbita'),
+                dcc.Input(type='number', value=100, debounce=ESPERA_ESCRITURA, id='tiempo_fase')
+            ]),
+            html.Div([
+                html.H3('Extensión (veces el equilibrio)'),
+                dcc.Input(type='number', value=3, min=0.5, step=0.5, debounce=ESPERA_ESCRITURA, id='extension_fase')
+            ]),
+        ], style={'display': 'flex', 'align-items': 'center', 'gap': '95px'}),
+
+        # Malla de condiciones iniciales: órbitas x órbitas, integradas a la vez
+        html.H3('Condiciones Iniciales por Eje'),
+        dcc.Slider(min=2, max=30, step=1, value=12, marks=None, tooltip={'placement': 'bottom', 'always_visible': True}, id='orbitas_fase'),
+
+        html.H3('Mallado del Campo de Direcciones'),
+        dcc.Slider(min=5, max=40, step=1, value=20, marks=None, tooltip={'placement': 'bottom', 'always_visible': True}, id='mallado_fase'),
+
+        dcc.Checklist(
+            options=[
+                {'label': 'Campo de direcciones', 'value': 'campo'},
+                {'label': 'Nulclinas', 'value': 'nulclinas'},
+                {'label': 'Equilibrios', 'value': 'equilibrios'}
+            ],
+            value=['campo', 'nulclinas', 'equilibrios'],
+            id='capas_fase'
+        )
+    ]),
+
+    # Contenedor para la gráfica
+    html.Div(className='div_grafica', children=[
+        html.H2('RETRATO DE FASE DEL MODELO LOTKA-VOLTERRA'),
+        dcc.Loading(
+            type='default',
+            overlay_style={'visibility': 'visible', 'opacity': 0.5},  # Deja ver las órbitas anteriores mientras se calcula
+            children=dcc.Graph(id='figure_fase')
+        )
+    ])
+])
+
+# Callback para actualizar el retrato de fase
+@callback(
+    Output('figure_fase', 'figure'),
+    Input('alpha_fase', 'value'),
+    Input('beta_fase', 'value'),
+    Input('delta_fase', 'value'),
+    Input('gamma_fase', 'value'),
+    Input('tiempo_fase', 'value'),
+    Input('extension_fase', 'value'),
+    Input('orbitas_fase', 'value'),
+    Input('mallado_fase', 'value'),
+    Input('capas_fase', 'value'),
+    State(ID_PESTANA, 'data')  # Id de la pestaña (peticiones superadas)
+)
+@solo_vigentes
+def grafica_fase(alpha, beta, delta, gamma, t, extension, orbitas, mallado, capas):
+    # El equilibrio (gamma / delta, alpha / beta) y la región de la malla necesitan valores positivos
+    if not all(valor is not None and valor > 0 for valor in (alpha, beta, delta, gamma, t, extension)):
+        raise PreventUpdate
+
+    # Todas las órbitas de la malla en una sola integración; la figura completa cambia de rangos
+    fig = retrato_fase_lotka_volterra(alpha, beta, delta, gamma, orbitas, extension, t, PUNTOS_ORBITA, mallado, tuple(capas or ()))
+    return codificar_figura(fig)
@@ -1 +1,26 @@
-from .funciones import *
\ No newline at end of file
+# Las funciones de las gráficas (y con ellas NumPy y Plotly) se importan la primera vez
+# que se piden, así `import utils.cache` o `import utils.modelos` no cargan todo el paquete
+import importlib
+
+__all__ = [
+    'ley_enfriamiento_newton',
+    'ecuacion_logistica',
+    'modelo_decaimiento_radioactivo',
+    'modelo_crecimiento_exponencial',
+    'modelo_SIR_cambiante',
+    'modelo_SIR_estocastico',
+    'modelo_lotka_volterra',
+    'modelo_SIR_barrido',
+    'figura_SIR',
+    'figura_lotka_volterra',
+    'retrato_fase_lotka_volterra'
+]
+
+
+def __getattr__(nombre):
+    if nombre in __all__:
+        return getattr(importlib.import_module('.funciones', __name__), nombre)
+    raise AttributeError(f'module {__name__!r} has no attribute {nombre!r}')
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,190 @@
+# Librerias
+import json
+import numpy as np
+from flask import Blueprint, Response, request
+from .cache import clave_canonica, huella
+from .registro import MODELOS, firma, convertir, faltantes
+from .estocastico import admite_gillespie, validar_compartimentos, MAX_EVENTOS_TOTALES
+
+
+# Rutas REST con los resultados de los modelos (sin figuras), en el mismo servidor Flask de la app
+api = Blueprint('api', __name__, url_prefix='/api')
+
+# Cambiarla invalida los ETag ya entregados (p. ej. si cambia el cálculo de algún modelo)
+VERSION = 1
+
+# Valores máximos de los parámetros que controlan el costo del cálculo
+LIMITES = {
+    'cant': 100000,
+    'replicas': 20000,
+    'orbitas': 50
+}
+
+# Puntos máximos de una respuesta con varias trayectorias (órbitas² x cant)
+MAX_PUNTOS = 10**7
+
+FORMATOS = ('json', 'binario')
+
+
+# Funciones
+
+def _error(estado: int, mensaje: str):
+    return Response(json.dumps({'error': mensaje}, ensure_ascii=False), status=estado, mimetype='application/json')
+
+def leer_parametros(nombre: str, consulta):
+    """
+    Retorna los argumentos de la función de cálculo del modelo a partir de la consulta (query string).
+    Lanza ValueError si falta algún parámetro, no es numérico (o entero, si la función lo
+    anota como int) o supera `LIMITES`.
+
+    Parámetros:
+    -------
+    - nombre: Modelo en `MODELOS`.
+    - consulta: Diccionario {parámetro: texto} (p. ej. `request.args`).
+    """
+
+    falta = faltantes(nombre, consulta)
+    if falta:
+        raise ValueError(f'Faltan parámetros: {", ".join(falta)}')
+
+    argumentos = {}
+    for parametro, datos in firma(nombre).parameters.items():
+        if parametro not in consulta:
+            continue
+        texto = consulta[parametro]
+        if isinstance(datos.default, str):
+            argumentos[parametro] = texto
+            continue
+        try:
+            valor = float(texto)
+        except ValueError:
+            raise ValueError(f'El parámetro {parametro} debe ser numérico: {texto!r}')
+        if not np.isfinite(valor):
+            raise ValueError(f'El parámetro {parametro} debe ser finito')
+        if datos.annotation is int and not valor.is_integer():
+            raise ValueError(f'El parámetro {parametro} debe ser entero: {texto!r}')
+        if parametro in LIMITES and not 0 < valor <= LIMITES[parametro]:
+            raise ValueError(f'El parámetro {parametro} debe estar entre 1 y {LIMITES[parametro]}')
+        argumentos[parametro] = convertir(valor, datos.annotation)
+    if argumentos.get('orbitas', 1) ** 2 * argumentos.get('cant', 1) > MAX_PUNTOS:
+        raise ValueError(f'orbitas² x cant debe ser a lo más {MAX_PUNTOS}')
+
+    # Las réplicas estocásticas necesitan compartimentos válidos (S0 = N - I0 - R0 >= 0)
+    if nombre == 'SIR_estocastico':
+        validar_compartimentos(argumentos['N'], argumentos['I0'], argumentos['R0'])
+
+    # Gillespie simula cada evento: su costo crece con N x replicas (tau-leaping no depende de N)
+    if argumentos.get('metodo') == 'gillespie' and not admite_gillespie(argumentos['N'], argumentos['I0'], argumentos['R0'], argumentos['replicas']):
+        raise ValueError(f'Con metodo=gillespie, N x replicas debe ser a lo más unos {MAX_EVENTOS_TOTALES // 2:.0e} (usar metodo=tau)')
+    return argumentos
+
+def etiqueta(nombre: str, argumentos, salidas, formato: str):
+    """
+    Retorna el ETag de una respuesta: la huella de los parámetros normalizados (igual para
+    15 y 15.0, en cualquier proceso y después de reiniciar), las salidas pedidas y el formato.
+    """
+    clave = clave_canonica(MODELOS[nombre][0].__wrapped__, (), argumentos)
+    return huella((VERSION, nombre, clave, tuple(salidas), formato))
+
+def coincide(etag: str, if_none_match):
+    """
+    Retorna True si el ETag está en `If-None-Match`. flask-compress agrega a los ETag
+    de las respuestas comprimidas el algoritmo (':br', ':gzip'), que también se aceptan.
+    """
+    return if_none_match.star_tag or any(e.split(':', 1)[0] == etag for e in if_none_match.as_set())
+
+def cuerpo_json(nombre: str, argumentos, datos, salidas):
+    """
+    Retorna el JSON compacto de la respuesta: modelo, parámetros y cada salida como lista.
+    """
+    return json.dumps({
+        'modelo': nombre,
+        'parametros': argumentos,
+        'salidas': {clave: np.asarray(datos[clave]).tolist() for clave in salidas}
+    }, separators=(',', ':'), ensure_ascii=False)
+
+def cuerpo_binario(datos, salidas):
+    """
+    Retorna (bytes, descripción) con las salidas concatenadas como arreglos C little-endian.
+    La descripción indica de cada una su dtype, forma y posición (bytes desde el inicio).
+    """
+    partes, descripcion, inicio = [], [], 0
+    for clave in salidas:
+        arreglo = np.ascontiguousarray(datos[clave])
+        arreglo = arreglo.astype(arreglo.dtype.newbyteorder('<'), copy=False)
+        partes.append(arreglo.tobytes())
+        descripcion.append({'nombre': clave, 'dtype': arreglo.dtype.str, 'forma': list(arreglo.shape), 'inicio': inicio, 'bytes': arreglo.nbytes})
+        inicio += arreglo.nbytes
+    return b''.join(partes), descripcion
+
+
+# Rutas
+
+@api.get('/modelos')
+def listar_modelos():
+    """
+    Lista los modelos con sus parámetros (y valores por defecto) y sus salidas.
+    """
+    modelos = {
+        nombre: {
+            'parametros': {p: (None if d.default is d.empty else d.default) for p, d in firma(nombre).parameters.items()},
+            'salidas': list(claves)
+        }
+        for nombre, (_, claves) in MODELOS.items()
+    }
+    return Response(json.dumps(modelos, ensure_ascii=False), mimetype='application/json')
+
+@api.get('/modelos/<nombre>')
+def calcular_modelo(nombre):
+    """
+    Retorna las salidas del modelo para los parámetros de la consulta.
+
+    Consulta: los parámetros del modelo (ver /api/modelos) y opcionalmente
+    `formato` ('json' o 'binario') y `salidas` (lista separada por comas).
+
+    Con formato binario el cuerpo son los arreglos concatenados y el encabezado
+    `X-Arreglos` (JSON) indica el dtype, la forma y la posición de cada uno.
+    Si `If-None-Match` coincide con el ETag se responde 304 sin calcular.
+    """
+
+    if nombre not in MODELOS:
+        return _error(404, f'Modelo desconocido: {nombre!r}')
+    funcion, claves = MODELOS[nombre]
+
+    consulta = request.args.to_dict()
+    formato = consulta.pop('formato', 'json')
+    salidas = [s for s in consulta.pop('salidas', ','.join(claves)).split(',') if s]
+    if formato not in FORMATOS:
+        return _error(400, f'Formato desconocido: {formato!r} (opciones: {", ".join(FORMATOS)})')
+    desconocidas = [s for s in salidas if s not in claves]
+    if desconocidas:
+        return _error(400, f'Salidas desconocidas: {", ".join(desconocidas)} (opciones: {", ".join(claves)})')
+    sobrantes = [p for p in consulta if p not in firma(nombre).parameters]
+    if sobrantes:
+        return _error(400, f'Parámetros desconocidos: {", ".join(sobrantes)}')
+
+    try:
+        argumentos = leer_parametros(nombre, consulta)
+    except ValueError as error:
+        return _error(400, str(error))
+
+    # El ETag sale solo de los parámetros: si el cliente ya tiene la respuesta no se calcula nada
+    etag = etiqueta(nombre, argumentos, salidas, formato)
+    if coincide(etag, request.if_none_match):
+        respuesta = Response(status=304)
+    else:
+        try:
+            datos = funcion(**argumentos)
+        except (RuntimeError, ValueError, FloatingPointError, ZeroDivisionError, OverflowError) as error:
+            return _error(422, str(error))
+
+        if formato == 'json':
+            respuesta = Response(cuerpo_json(nombre, argumentos, datos, salidas), mimetype='application/json')
+        else:
+            contenido, descripcion = cuerpo_binario(datos, salidas)
+            respuesta = Response(contenido, mimetype='application/octet-stream')
+            respuesta.headers['X-Arreglos'] = json.dumps(descripcion, separators=(',', ':'))
+
+    respuesta.set_etag(etag)
+    respuesta.headers['Cache-Control'] = 'no-cache'  # Guardar, pero revalidar siempre con If-None-Match
+    return respuesta
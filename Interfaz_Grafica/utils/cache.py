@@ -0,0 +1,489 @@
+# Librerias
+import contextvars
+import functools
+import hashlib
+import inspect
+import io
+import mmap
+import multiprocessing
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+from .coalescencia import UN_VUELO, verificar_vigente
+from .metricas import contar_cache, medir_etapa
+
+
+# Funciones
+
+_firma = functools.lru_cache(maxsize=None)(inspect.signature)
+
+def normalizar(valor):
+    """
+    Retorna una versión canónica y hashable de un parámetro.
+
+    Los números se convierten a float (15, 15.0 y np.int64(15) dan la misma clave),
+    las secuencias a tuplas y los arreglos de NumPy a su tipo, forma y huella de sus bytes.
+    """
+    if valor is None or isinstance(valor, (bool, np.bool_, str)):
+        return bool(valor) if isinstance(valor, np.bool_) else valor
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        return float(valor)
+    if isinstance(valor, np.ndarray):
+        datos = np.ascontiguousarray(valor)
+        return ('ndarray', datos.dtype.str, datos.shape, hashlib.sha1(datos.tobytes()).hexdigest())
+    if isinstance(valor, (list, tuple)):
+        return tuple(normalizar(v) for v in valor)
+    if isinstance(valor, dict):
+        return tuple(sorted((k, normalizar(v)) for k, v in valor.items()))
+    return repr(valor)
+
+def clave_canonica(funcion, args, kwargs):
+    """
+    Retorna la clave (nombre, parámetros normalizados) de una llamada, sin importar
+    si los argumentos se pasaron por posición o por nombre.
+    """
+    enlace = _firma(funcion).bind(*args, **kwargs)
+    enlace.apply_defaults()
+    return (funcion.__qualname__,) + tuple(normalizar(v) for v in enlace.arguments.values())
+
+def huella(clave):
+    """
+    Retorna un identificador hexadecimal estable de una clave (igual en todos los procesos).
+    """
+    return hashlib.sha256(repr(clave).encode('utf-8')).hexdigest()
+
+def tamano_trayectoria(datos):
+    """
+    Bytes ocupados por un diccionario de arreglos.
+    """
+    return sum(np.asarray(v).nbytes for v in datos.values())
+
+def _proceso_vivo(pid: int):
+    """
+    Retorna False si no existe un proceso con ese pid (POSIX: la señal 0 solo lo comprueba;
+    `BackendMemoriaCompartida` solo se usa con procesos creados con fork).
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Existe pero es de otro usuario
+    return True
+
+def solo_lectura(datos):
+    """
+    Marca como solo lectura los arreglos de un diccionario, para que nadie modifique lo guardado en la cache.
+    """
+    for v in datos.values():
+        if isinstance(v, np.ndarray):
+            v.flags.writeable = False
+    return datos
+
+
+# Backends
+
+class BackendDisco:
+    """
+    Guarda trayectorias (diccionarios de arreglos) como archivos .npz en un directorio,
+    para compartirlas entre varios procesos del servidor.
+
+    La escritura es atómica (archivo temporal + os.replace), así que un proceso nunca
+    lee un archivo a medio escribir.
+
+    Después de cada escritura, si los .npz ocupan más de `max_bytes` se borran los usados
+    hace más tiempo (cada lectura renueva la fecha de modificación del archivo).
+
+    Parámetros:
+    -------
+    - directorio: Carpeta de los archivos.
+    - max_bytes: Bytes máximos de los .npz en la carpeta (None para no limitar).
+    """
+
+    def __init__(self, directorio: str, max_bytes: int = None):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        os.makedirs(directorio, exist_ok=True)
+
+    def _ruta(self, identificador):
+        return os.path.join(self.directorio, f'{identificador}.npz')
+
+    def obtener(self, identificador):
+        ruta = self._ruta(identificador)
+        try:
+            with np.load(ruta) as archivo:
+                datos = {k: archivo[k] for k in archivo.files}
+            os.utime(ruta)
+            return datos
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def guardar(self, identificador, datos):
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as archivo:
+                np.savez(archivo, **datos)
+            os.replace(temporal, self._ruta(identificador))
+        except OSError:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+        if self.max_bytes is not None:
+            self.podar()
+
+    def podar(self):
+        """
+        Borra los .npz usados hace más tiempo hasta que la carpeta ocupe a lo más `max_bytes`.
+        """
+        archivos = []
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith('.npz'):
+                try:
+                    estado = entrada.stat()
+                except OSError:
+                    continue  # Otro proceso lo acaba de borrar
+                archivos.append((estado.st_mtime, estado.st_size, entrada.path))
+
+        total = sum(tamano for _, tamano, _ in archivos)
+        for _, tamano, ruta in sorted(archivos):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            total -= tamano
+
+
+class BackendDiskcache:
+    """
+    Guarda valores cualesquiera (con pickle) en una `diskcache.Cache`, p. ej. la del administrador
+    de callbacks en segundo plano (`segundo_plano.DISCO`), que comparten los procesos del servidor
+    y los de los trabajos en segundo plano.
+
+    Parámetros:
+    -------
+    - disco: `diskcache.Cache` donde se guardan los valores.
+    - prefijo: Texto que se antepone a cada identificador (separa los valores de cada caché).
+    - expiracion: Segundos que se guarda cada valor (None para no expirar).
+    """
+
+    def __init__(self, disco, prefijo: str = '', expiracion: float = None):
+        self.disco = disco
+        self.prefijo = prefijo
+        self.expiracion = expiracion
+
+    def obtener(self, identificador):
+        return self.disco.get(self.prefijo + identificador)
+
+    def guardar(self, identificador, datos):
+        self.disco.set(self.prefijo + identificador, datos, expire=self.expiracion)
+
+
+class BackendMemoriaCompartida:
+    """
+    Guarda trayectorias (como .npz, igual que `BackendDisco`) en un segmento de memoria
+    compartida anónimo. Los procesos creados con fork después de construirlo (los workers
+    de gunicorn con `preload_app`) ven el mismo segmento: lo que calcula uno lo leen todos.
+
+    Los datos se escriben uno tras otro en un buffer circular de `tamano` bytes; al dar la
+    vuelta se pisan los más antiguos. Un índice de `ranuras` entradas (huella, posición, largo)
+    ubica cada trayectoria por su huella; dos huellas en la misma ranura se reemplazan.
+    Una entrada es válida mientras no se hayan escrito más de `tamano` bytes después de ella.
+
+    Junto al candado se guarda el pid de quien lo tiene: si un worker muere con el candado
+    tomado (gunicorn mata con SIGKILL a los que superan `timeout`), el siguiente que espere
+    `espera` segundos sin obtenerlo lo libera, así solo esa consulta cuenta como fallo.
+
+    Parámetros:
+    -------
+    - tamano: Bytes del buffer de datos.
+    - ranuras: Cantidad de entradas del índice.
+    - espera: Segundos máximos esperando el candado antes de comprobar si su dueño sigue vivo.
+    """
+
+    _TOTAL = struct.Struct('<Q')         # Bytes escritos desde el inicio (posición absoluta)
+    _DUENO = struct.Struct('<q')         # Pid del proceso que tiene el candado (0: libre)
+    _RANURA = struct.Struct('<16sQQ')    # Huella (16 bytes), posición absoluta y largo
+
+    def __init__(self, tamano: int, ranuras: int = 4096, espera: float = 1.0):
+        self.tamano = tamano
+        self.ranuras = ranuras
+        self.espera = espera
+        self._inicio_ranuras = self._TOTAL.size + self._DUENO.size
+        self._inicio_datos = self._inicio_ranuras + ranuras * self._RANURA.size
+        self._memoria = mmap.mmap(-1, self._inicio_datos + tamano)  # MAP_SHARED: se comparte al hacer fork
+        self._candado = multiprocessing.Lock()
+        self._rescate = multiprocessing.Lock()  # Solo un proceso a la vez libera un candado abandonado
+
+    def _ubicar(self, identificador):
+        huella_bytes = bytes.fromhex(identificador[:32])
+        return huella_bytes, self._inicio_ranuras + int(identificador[32:48], 16) % self.ranuras * self._RANURA.size
+
+    def _adquirir(self):
+        """
+        Toma el candado y anota el pid propio. Retorna False si no se pudo en `espera` segundos;
+        en ese caso, si el dueño anotado ya no existe, libera el candado para las consultas siguientes.
+        """
+        if self._candado.acquire(timeout=self.espera):
+            self._DUENO.pack_into(self._memoria, self._TOTAL.size, os.getpid())
+            return True
+
+        dueno, = self._DUENO.unpack_from(self._memoria, self._TOTAL.size)
+        if dueno > 0 and not _proceso_vivo(dueno) and self._rescate.acquire(timeout=self.espera):
+            try:
+                # Otro proceso pudo rescatarlo mientras tanto: solo se libera si el dueño sigue siendo el muerto
+                if self._DUENO.unpack_from(self._memoria, self._TOTAL.size)[0] == dueno:
+                    self._DUENO.pack_into(self._memoria, self._TOTAL.size, 0)
+                    self._candado.release()
+            finally:
+                self._rescate.release()
+        return False
+
+    def _liberar(self):
+        self._DUENO.pack_into(self._memoria, self._TOTAL.size, 0)
+        self._candado.release()
+
+    def obtener(self, identificador):
+        huella_bytes, ranura = self._ubicar(identificador)
+        if not self._adquirir():
+            return None
+        try:
+            guardada, posicion, largo = self._RANURA.unpack_from(self._memoria, ranura)
+            total, = self._TOTAL.unpack_from(self._memoria, 0)
+            if guardada != huella_bytes or largo == 0 or total - posicion > self.tamano:
+                return None
+            inicio = self._inicio_datos + posicion % self.tamano
+            contenido = self._memoria[inicio:inicio + largo]
+        finally:
+            self._liberar()
+
+        try:
+            with np.load(io.BytesIO(contenido)) as archivo:
+                return {k: archivo[k] for k in archivo.files}
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def guardar(self, identificador, datos):
+        buffer = io.BytesIO()
+        np.savez(buffer, **datos)
+        contenido = buffer.getbuffer()
+        largo = len(contenido)
+        if largo > self.tamano:
+            return
+
+        huella_bytes, ranura = self._ubicar(identificador)
+        if not self._adquirir():
+            return
+        try:
+            posicion, = self._TOTAL.unpack_from(self._memoria, 0)
+            if posicion % self.tamano + largo > self.tamano:
+                posicion += self.tamano - posicion % self.tamano  # No cabe antes del final: empezar desde el inicio
+            inicio = self._inicio_datos + posicion % self.tamano
+            self._memoria[inicio:inicio + largo] = contenido
+            self._TOTAL.pack_into(self._memoria, 0, posicion + largo)
+            self._RANURA.pack_into(self._memoria, ranura, huella_bytes, posicion, largo)
+        finally:
+            self._liberar()
+
+
+class CacheLRU:
+    """
+    Cache en memoria con desalojo LRU, límite de entradas y de bytes, contadores de
+    aciertos/fallos y un backend opcional compartido (p. ej. `BackendDisco`).
+
+    Parámetros:
+    -------
+    - max_entradas: Cantidad máxima de entradas en memoria.
+    - max_bytes: Bytes máximos en memoria (None para no limitar).
+    - backend: Almacenamiento de segundo nivel con `obtener(id)` y `guardar(id, datos)`.
+    - tamano: Función que estima los bytes de un valor.
+    - nombre: Nombre de la caché en las métricas (/metrics); sin nombre no se cuenta por página.
+    """
+
+    def __init__(self, max_entradas: int = 256, max_bytes: int = None, backend=None, tamano=None, nombre: str = None):
+        self.nombre = nombre
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self.tamano = tamano or (lambda valor: 0)
+        self._datos = OrderedDict()
+        self._bytes = 0
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.aciertos_backend = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        """
+        Retorna el valor guardado o None si no está.
+        """
+        with self._candado:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                valor = self._datos[clave][0]
+            else:
+                valor = None
+        if valor is not None:
+            self._contar('acierto')
+            return valor
+
+        if self.backend is not None:
+            valor = self.backend.obtener(huella(clave))
+            if valor is not None:
+                valor = solo_lectura(valor)
+                self._guardar_memoria(clave, valor)
+                with self._candado:
+                    self.aciertos_backend += 1
+                self._contar('acierto_backend')
+                return valor
+
+        with self._candado:
+            self.fallos += 1
+        self._contar('fallo')
+        return None
+
+    def _contar(self, resultado: str):
+        if self.nombre is not None:
+            contar_cache(self.nombre, resultado)
+
+    def guardar(self, clave, valor):
+        """
+        Guarda un valor en memoria y en el backend.
+        """
+        self._guardar_memoria(clave, valor)
+        if self.backend is not None:
+            self.backend.guardar(huella(clave), valor)
+
+    def _guardar_memoria(self, clave, valor):
+        tamano = self.tamano(valor)
+        if self.max_bytes is not None and tamano > self.max_bytes:
+            return
+
+        with self._candado:
+            if clave in self._datos:
+                self._bytes -= self._datos.pop(clave)[1]
+            self._datos[clave] = (valor, tamano)
+            self._bytes += tamano
+
+            # Desalojar las entradas menos usadas recientemente
+            while len(self._datos) > self.max_entradas or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, (_, tamano_viejo) = self._datos.popitem(last=False)
+                self._bytes -= tamano_viejo
+
+    def limpiar(self):
+        """
+        Vacía la memoria y reinicia los contadores (el backend no se toca).
+        """
+        with self._candado:
+            self._datos.clear()
+            self._bytes = 0
+            self.aciertos = self.aciertos_backend = self.fallos = 0
+
+    def estadisticas(self):
+        """
+        Retorna un diccionario con los contadores y la ocupación de la cache.
+        """
+        with self._candado:
+            return {
+                'aciertos': self.aciertos,
+                'aciertos_backend': self.aciertos_backend,
+                'fallos': self.fallos,
+                'entradas': len(self._datos),
+                'bytes': self._bytes
+            }
+
+
+# Caches compartidas por todos los callbacks
+# (con TM_CACHE_DIR las trayectorias también se guardan en disco, hasta TM_CACHE_DIR_MB megabytes)
+
+CACHE_TRAYECTORIAS = CacheLRU(
+    max_entradas=512,
+    max_bytes=256 * 2**20,
+    backend=BackendDisco(os.environ['TM_CACHE_DIR'], int(os.environ.get('TM_CACHE_DIR_MB', '1024')) * 2**20) if os.environ.get('TM_CACHE_DIR') else None,
+    tamano=tamano_trayectoria,
+    nombre='trayectorias'
+)
+
+CACHE_FIGURAS = CacheLRU(max_entradas=128, nombre='figuras')
+
+# Cachés cuya ocupación se reporta en /metrics
+CACHES = {cache.nombre: cache for cache in (CACHE_TRAYECTORIAS, CACHE_FIGURAS)}
+
+
+def usar_memoria_compartida(tamano: int, bytes_locales: int = 0):
+    """
+    Cambia el segundo nivel de `CACHE_TRAYECTORIAS` por un `BackendMemoriaCompartida` y limita
+    la copia que guarda cada proceso a `bytes_locales` (0: ninguna, todos leen del segmento).
+    Debe llamarse antes de crear los procesos (fork), p. ej. al importar wsgi.py.
+
+    Parámetros:
+    -------
+    - tamano: Bytes del segmento compartido.
+    - bytes_locales: Bytes de trayectorias en la memoria de cada proceso.
+    """
+    CACHE_TRAYECTORIAS.backend = BackendMemoriaCompartida(tamano)
+    CACHE_TRAYECTORIAS.max_bytes = bytes_locales
+    CACHE_TRAYECTORIAS.limpiar()
+    return CACHE_TRAYECTORIAS.backend
+
+
+# True mientras se calcula una función cacheada (las llamadas internas no descartan la petición)
+_ANIDADA = contextvars.ContextVar('anidada', default=False)
+
+
+def cachear(cache: CacheLRU, preparar=None, etapa: str = None):
+    """
+    Decorador que guarda en `cache` el resultado de una función según sus parámetros normalizados.
+
+    La función original queda disponible en `.__wrapped__` (p. ej. para medir sin cache).
+
+    Las llamadas concurrentes con los mismos parámetros calculan una sola vez (las demás
+    esperan el resultado, ver `coalescencia.UnVuelo`), y después de calcular se descarta la
+    petición si la pestaña ya pidió otros valores (ver `coalescencia.verificar_vigente`).
+    Una función cacheada que llama a otra (figura -> trayectoria) solo verifica al final de
+    la exterior, fuera del vuelo, para no propagar el descarte a las otras pestañas.
+
+    Parámetros:
+    -------
+    - cache: Cache donde se guardan los resultados.
+    - preparar: Función aplicada al resultado antes de guardarlo (p. ej. `solo_lectura`).
+    - etapa: Etapa del callback en la que se mide el tiempo de la función cuando no está
+      en caché ('calculo' o 'figura', ver `metricas.medir_etapa`).
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            clave = clave_canonica(funcion, args, kwargs)
+            valor = cache.obtener(clave)
+            if valor is None:
+                def calcular():
+                    token = _ANIDADA.set(True)
+                    try:
+                        resultado = funcion(*args, **kwargs)
+                    finally:
+                        _ANIDADA.reset(token)
+                    if preparar is not None:
+                        resultado = preparar(resultado)
+                    cache.guardar(clave, resultado)
+                    return resultado
+
+                with medir_etapa(etapa):
+                    valor, compartido = UN_VUELO.ejecutar((id(cache), clave), calcular)
+                if compartido:
+                    cache._contar('compartido')
+                # Solo la llamada exterior descarta: dentro de un vuelo el resultado es de todos
+                if not _ANIDADA.get():
+                    verificar_vigente()
+            return valor
+        return envoltura
+    return decorador
+
+# Trayectorias: diccionarios de arreglos en solo lectura, compartibles por disco
+cache_trayectorias = cachear(CACHE_TRAYECTORIAS, preparar=solo_lectura, etapa='calculo')
+
+# Figuras: solo en memoria. La figura retornada es compartida, no debe modificarse.
+cache_figuras = cachear(CACHE_FIGURAS, etapa='figura')
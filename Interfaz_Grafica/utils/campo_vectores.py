@@ -0,0 +1,94 @@
+# Librerias
+import math
+import numpy as np
+from .figuras import traza # Traza como diccionario
+
+
+# Funciones
+
+def coordenadas_campo_vectores(x, y, u, v, scale: float = 0.1, arrow_scale: float = 0.3, angle: float = math.pi / 9, normalizar: bool = False):
+    """
+    Retorna las coordenadas (x, y) de todas las flechas de un campo de vectores,
+    separadas por NaN para dibujarse en una sola traza.
+
+    Reproduce la geometría de `plotly.figure_factory.create_quiver` (primero
+    todos los tallos y luego todas las puntas), pero calcula la malla completa
+    en una sola pasada de NumPy en lugar de recorrerla con bucles de Python.
+
+    Parámetros:
+    -------
+    - x, y: Coordenadas de origen de cada flecha (cualquier forma, p. ej. un meshgrid).
+    - u, v: Componentes horizontal y vertical del vector en cada punto.
+    - scale: Factor que multiplica el largo de cada vector.
+    - arrow_scale: Fracción del largo del tallo usada para la punta de la flecha.
+    - angle: Apertura de la punta respecto al tallo (radianes).
+    - normalizar: Si es True todas las flechas tienen el mismo largo (`scale`)
+      y solo se conserva la dirección; si es False el largo es proporcional a la magnitud.
+    """
+
+    # Aplanar la malla en vectores de una dimensión
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    u = np.asarray(u, dtype=float).ravel()
+    v = np.asarray(v, dtype=float).ravel()
+
+    # Normalizar los vectores (los de magnitud cero se quedan en cero)
+    if normalizar:
+        magnitud = np.hypot(u, v)
+        magnitud[magnitud == 0] = 1
+        u = u / magnitud
+        v = v / magnitud
+
+    # Extremo final de cada tallo
+    dx = u * scale
+    dy = v * scale
+    fin_x = x + dx
+    fin_y = y + dy
+
+    # Largo y ángulo de cada tallo para construir la punta
+    largo_punta = np.hypot(dx, dy) * arrow_scale
+    angulo_tallo = np.arctan2(dy, dx)
+    angulo_1 = angulo_tallo + angle
+    angulo_2 = angulo_tallo - angle
+
+    n = x.size
+
+    # Tallos: (inicio, fin, NaN) por cada punto
+    tallos_x = np.empty((n, 3))
+    tallos_y = np.empty((n, 3))
+    tallos_x[:, 0], tallos_x[:, 1], tallos_x[:, 2] = x, fin_x, np.nan
+    tallos_y[:, 0], tallos_y[:, 1], tallos_y[:, 2] = y, fin_y, np.nan
+
+    # Puntas: (lado 1, fin, lado 2, NaN) por cada punto
+    puntas_x = np.empty((n, 4))
+    puntas_y = np.empty((n, 4))
+    puntas_x[:, 0] = fin_x - largo_punta * np.cos(angulo_1)
+    puntas_x[:, 1] = fin_x
+    puntas_x[:, 2] = fin_x - largo_punta * np.cos(angulo_2)
+    puntas_x[:, 3] = np.nan
+    puntas_y[:, 0] = fin_y - largo_punta * np.sin(angulo_1)
+    puntas_y[:, 1] = fin_y
+    puntas_y[:, 2] = fin_y - largo_punta * np.sin(angulo_2)
+    puntas_y[:, 3] = np.nan
+
+    return (
+        np.concatenate((tallos_x.ravel(), puntas_x.ravel())),
+        np.concatenate((tallos_y.ravel(), puntas_y.ravel()))
+    )
+
+def crear_campo_vectores(x, y, u, v, scale: float = 0.1, arrow_scale: float = 0.3, angle: float = math.pi / 9, normalizar: bool = False, **kwargs):
+    """
+    Retorna una única traza de dispersión (diccionario, ver `figuras.traza`) con el campo de vectores completo.
+
+    Sustituye a `plotly.figure_factory.create_quiver`: en lugar de una figura
+    entrega solo la traza, lista para añadirse a la lista de trazas de una figura.
+
+    Parámetros:
+    -------
+    - x, y, u, v, scale, arrow_scale, angle, normalizar: Ver `coordenadas_campo_vectores`.
+    - kwargs: Propiedades adicionales de la traza (line, name, showlegend, ...).
+    """
+
+    flechas_x, flechas_y = coordenadas_campo_vectores(x, y, u, v, scale, arrow_scale, angle, normalizar)
+
+    return traza('scatter', x=flechas_x, y=flechas_y, mode='lines', **kwargs)
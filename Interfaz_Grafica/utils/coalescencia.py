@@ -0,0 +1,186 @@
+# Librerias
+import contextvars
+import copy
+import functools
+import threading
+import uuid
+from collections import OrderedDict
+
+
+# Segundos sin escribir antes de enviar el valor de un dcc.Input al servidor (debounce).
+# Escribir "1000" envía un solo valor en lugar de 1, 10, 100 y 1000.
+ESPERA_ESCRITURA = 0.4
+
+# Cookie que identifica la sesión del navegador (para descartar peticiones superadas)
+COOKIE_SESION = 'tm_sesion'
+
+# dcc.Store de app.py con un id distinto en cada pestaña (la cookie es la misma en todas)
+ID_PESTANA = 'id_pestana'
+
+# Pestañas x callbacks que se recuerdan (las más antiguas se olvidan)
+MAX_TURNOS = 10000
+
+
+def _es_descarte(error):
+    from dash.exceptions import PreventUpdate
+    return isinstance(error, PreventUpdate)
+
+def _copia(error):
+    # Cada hilo lanza su propia instancia (el traceback se escribe en la excepción)
+    try:
+        copia = copy.copy(error)
+    except Exception:
+        return error
+    copia.__cause__ = error
+    return copia
+
+
+class _Vuelo:
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+        self.error = None
+        self.abandonado = False
+        self.esperando = 0
+
+
+class UnVuelo:
+    """
+    Agrupa las llamadas concurrentes con la misma clave (como `singleflight` de Go): la primera
+    ejecuta la función y las demás esperan y reciben el mismo resultado (o una copia de la misma
+    excepción). Solo agrupa hilos del mismo proceso.
+
+    Si la primera termina con `PreventUpdate` (su petición fue superada) el error no se comparte:
+    las que esperaban vuelven a intentar y una de ellas calcula.
+    """
+
+    def __init__(self):
+        self._candado = threading.Lock()
+        self._vuelos = {}
+
+    def ejecutar(self, clave, funcion):
+        """
+        Retorna (resultado de `funcion()`, True si se compartió un cálculo ya en curso).
+        """
+        while True:
+            with self._candado:
+                vuelo = self._vuelos.get(clave)
+                propio = vuelo is None
+                if propio:
+                    vuelo = self._vuelos[clave] = _Vuelo()
+                else:
+                    vuelo.esperando += 1
+
+            if propio:
+                break
+            vuelo.listo.wait()
+            if vuelo.error is not None:
+                raise _copia(vuelo.error)
+            if not vuelo.abandonado:
+                return vuelo.resultado, True
+
+        try:
+            vuelo.resultado = funcion()
+        except BaseException as error:
+            if _es_descarte(error):
+                vuelo.abandonado = True
+            else:
+                vuelo.error = error
+            raise
+        finally:
+            with self._candado:
+                del self._vuelos[clave]
+            vuelo.listo.set()
+        return vuelo.resultado, False
+
+
+# Cálculos en curso de las cachés (ver `cache.cachear`)
+UN_VUELO = UnVuelo()
+
+# (pestaña o sesión, callback) -> número de la última petición recibida
+_TURNOS = OrderedDict()
+_CANDADO_TURNOS = threading.Lock()
+
+# (clave, número) de la petición del callback en curso (None fuera de `solo_vigentes`)
+_TURNO = contextvars.ContextVar('turno', default=None)
+
+
+# Funciones
+
+def sesion_actual():
+    """
+    Retorna el id de sesión de la petición en curso (cookie `COOKIE_SESION`) o None
+    (fuera de una petición, p. ej. en lote.py o en un proceso en segundo plano).
+    """
+    from flask import has_request_context, request
+    return request.cookies.get(COOKIE_SESION) if has_request_context() else None
+
+def registrar_sesiones(servidor):
+    """
+    Agrega al servidor Flask la cookie `COOKIE_SESION` (un uuid por navegador) en las
+    respuestas a quien todavía no la tiene.
+    """
+    from flask import request
+
+    @servidor.after_request
+    def asignar_sesion(respuesta):
+        if COOKIE_SESION not in request.cookies:
+            respuesta.set_cookie(COOKIE_SESION, uuid.uuid4().hex, httponly=True, samesite='Lax')
+        return respuesta
+
+def solo_vigentes(funcion):
+    """
+    Decorador para callbacks: numera las peticiones de cada pestaña a este callback para que
+    `verificar_vigente` descarte las que ya fueron superadas por una más nueva (el usuario
+    cambió las entradas mientras se calculaba). Se aplica debajo de `@callback`.
+
+    El callback debe declarar `State(ID_PESTANA, 'data')` como última dependencia: el
+    decorador toma ese valor y no se lo pasa a la función. Dos pestañas del mismo navegador
+    comparten la cookie de sesión, así que solo se usa la cookie si la pestaña no tiene id.
+    """
+    nombre = f'{funcion.__module__}.{funcion.__qualname__}'
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        *args, pestana = args
+        origen = pestana or sesion_actual()
+        if origen is None:
+            return funcion(*args, **kwargs)
+
+        clave = (origen, nombre)
+        with _CANDADO_TURNOS:
+            numero = _TURNOS.pop(clave, 0) + 1
+            _TURNOS[clave] = numero
+            while len(_TURNOS) > MAX_TURNOS:
+                _TURNOS.popitem(last=False)
+
+        token = _TURNO.set((clave, numero))
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            _TURNO.reset(token)
+
+    return envoltura
+
+def superada():
+    """
+    Retorna True si la petición en curso fue reemplazada por otra más nueva de la misma
+    pestaña al mismo callback.
+    """
+    turno = _TURNO.get()
+    if turno is None:
+        return False
+    clave, numero = turno
+    with _CANDADO_TURNOS:
+        return _TURNOS.get(clave, numero) != numero
+
+def verificar_vigente():
+    """
+    Lanza `PreventUpdate` si la petición en curso fue superada: su resultado ya no se
+    mostraría, así que no se construye la figura ni se serializa.
+    """
+    if superada():
+        from dash.exceptions import PreventUpdate
+        from .metricas import REGISTRO, pagina_actual
+        REGISTRO.contar('tm_callback_superados_total', pagina=pagina_actual() or 'ninguna')
+        raise PreventUpdate
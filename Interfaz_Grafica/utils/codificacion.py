@@ -0,0 +1,94 @@
+# Librerias
+import base64
+import os
+import numpy as np
+
+
+# Con TM_FLOAT32=1 los arreglos de punto flotante se envían en precisión simple (la mitad de bytes)
+FLOAT32 = os.environ.get('TM_FLOAT32', '') == '1'
+
+# Propiedades de las trazas que se codifican como arreglos binarios
+PROPIEDADES_ARREGLO = ('x', 'y', 'z')
+
+# Tipos que entiende Plotly.js en el formato {'dtype', 'bdata'}
+TIPOS_ENTEROS = ('i1', 'u1', 'i2', 'u2', 'i4', 'u4')
+
+
+# Funciones
+
+def codificar_arreglo(valores, float32: bool = None):
+    """
+    Retorna `valores` en el formato binario de Plotly ({'dtype': ..., 'bdata': base64})
+    o los mismos `valores` si no son un arreglo numérico (textos, fechas, ya codificados).
+
+    Parámetros:
+    -------
+    - valores: Lista o arreglo de NumPy (de una o dos dimensiones).
+    - float32: Enviar los flotantes en precisión simple (por defecto `FLOAT32`).
+    """
+
+    if isinstance(valores, dict) or valores is None:
+        return valores
+
+    arreglo = np.asarray(valores)
+    if arreglo.dtype.kind not in 'iuf' or arreglo.ndim == 0 or arreglo.size == 0:
+        return valores
+
+    if float32 is None:
+        float32 = FLOAT32
+
+    if arreglo.dtype.kind == 'f':
+        arreglo = arreglo.astype('<f4' if float32 else '<f8', copy=False)
+    else:
+        # Entero más pequeño que contiene todos los valores
+        for tipo in TIPOS_ENTEROS:
+            informacion = np.iinfo(tipo)
+            if informacion.min <= arreglo.min() and arreglo.max() <= informacion.max:
+                arreglo = arreglo.astype('<' + tipo, copy=False)
+                break
+        else:
+            arreglo = arreglo.astype('<f8')
+
+    codificado = {
+        'dtype': arreglo.dtype.str.lstrip('<|'),
+        'bdata': base64.b64encode(np.ascontiguousarray(arreglo).tobytes()).decode('ascii')
+    }
+    if arreglo.ndim > 1:
+        codificado['shape'] = ', '.join(str(n) for n in arreglo.shape)
+    return codificado
+
+def decodificar_arreglo(codificado):
+    """
+    Retorna el arreglo de NumPy de un valor en formato {'dtype', 'bdata'} (o el mismo valor).
+    """
+
+    if not isinstance(codificado, dict) or 'bdata' not in codificado:
+        return codificado
+
+    arreglo = np.frombuffer(base64.b64decode(codificado['bdata']), dtype='<' + codificado['dtype'])
+    if 'shape' in codificado:
+        arreglo = arreglo.reshape([int(n) for n in str(codificado['shape']).split(',')])
+    return arreglo
+
+def codificar_figura(fig, float32: bool = None):
+    """
+    Retorna un diccionario de la figura listo para Dash, con los datos de las trazas
+    codificados como arreglos binarios en lugar de listas JSON de números.
+
+    No modifica `fig` (las figuras de la caché se comparten entre callbacks).
+
+    Parámetros:
+    -------
+    - fig: Figura (go.Figure) o diccionario con 'data' y 'layout'.
+    - float32: Enviar los flotantes en precisión simple (por defecto `FLOAT32`).
+    """
+
+    # to_dict retorna una copia; un diccionario se copia solo en el primer nivel de cada traza
+    figura = fig.to_dict() if hasattr(fig, 'to_dict') else dict(fig, data=[dict(traza) for traza in fig['data']])
+
+    for traza in figura['data']:
+        for propiedad in PROPIEDADES_ARREGLO:
+            if propiedad in traza:
+                traza[propiedad] = codificar_arreglo(decodificar_arreglo(traza[propiedad]), float32)
+
+    return figura
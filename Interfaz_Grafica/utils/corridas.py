@@ -0,0 +1,147 @@
+# Librerias
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+import numpy as np
+from .integradores import METODOS
+
+
+# Corridas en curso o terminadas que todavía no se leyeron por completo (por id).
+# Viven en la memoria del proceso: con varios procesos las peticiones de una misma
+# corrida deben llegar al mismo (un solo worker o sesiones fijas).
+CORRIDAS = OrderedDict()
+
+# Modo "Mostrar mientras se calcula" de las páginas 5 y 6. gunicorn.conf.py lo apaga
+# (TM_TRANSMISION=0) con más de un worker: una consulta que llega a otro worker no
+# encuentra la corrida y la gráfica quedaría a medias. Con sesiones fijas en el balanceador
+# se puede volver a encender con TM_TRANSMISION=1.
+TRANSMISION = os.environ.get('TM_TRANSMISION', '1') != '0'
+CANDADO = threading.Lock()
+
+# Corridas que se guardan como máximo (las más antiguas se cancelan y descartan)
+MAX_CORRIDAS = 32
+
+# Ids de las corridas canceladas con `cancelar_corrida` (reemplazadas o ya enviadas), para
+# distinguirlas de las descartadas por `MAX_CORRIDAS`, cuya página debe avisar y dejar de consultar
+CANCELADAS = OrderedDict()
+MAX_CANCELADAS = 1024
+
+
+class Corrida:
+    """
+    Integración que se ejecuta en un hilo y guarda la salida por bloques a medida que
+    el integrador la entrega, para enviarla al navegador mientras se calcula.
+
+    Atributos:
+    -------
+    - id: Identificador de la corrida (se guarda en un dcc.Store de la página).
+    - bloques: Lista de (t_bloque, y_bloque) ya calculados.
+    - terminada: Evento que se activa al terminar, fallar o cancelarse.
+    - error: Mensaje si la integración falló.
+    """
+
+    def __init__(self, f, y0, t_values, metodo: str = 'dopri5', **opciones):
+        self.id = uuid.uuid4().hex
+        self.bloques = []
+        self.terminada = threading.Event()
+        self.cancelada = threading.Event()
+        self.error = None
+        self._hilo = threading.Thread(target=self._integrar, args=(f, y0, t_values, metodo, opciones), daemon=True)
+
+    def _integrar(self, f, y0, t_values, metodo, opciones):
+        try:
+            for bloque in METODOS[metodo](f, y0, t_values, **opciones):
+                if self.cancelada.is_set():
+                    break
+                self.bloques.append(bloque)
+        except (RuntimeError, ValueError, FloatingPointError) as error:
+            self.error = str(error)
+        finally:
+            self.terminada.set()
+
+    def iniciar(self):
+        self._hilo.start()
+        return self
+
+    def cancelar(self):
+        self.cancelada.set()
+
+    def leer(self, desde: int = 0, espera: float = 0):
+        """
+        Retorna (t, y, bloques leídos, terminada) con la salida nueva a partir del bloque `desde`.
+
+        Parámetros:
+        -------
+        - desde: Cantidad de bloques que ya se leyeron.
+        - espera: Segundos que se espera como máximo a que haya algún bloque nuevo.
+        """
+
+        limite = time.monotonic() + espera
+        while len(self.bloques) <= desde and not self.terminada.is_set() and time.monotonic() < limite:
+            time.sleep(0.005)
+
+        terminada = self.terminada.is_set()
+        nuevos = self.bloques[desde:]
+        if not nuevos:
+            return np.empty(0), np.empty(0), desde, terminada
+        t = np.concatenate([t for t, _ in nuevos])
+        y = np.concatenate([y for _, y in nuevos])
+        return t, y, desde + len(nuevos), terminada
+
+
+# Funciones
+
+def iniciar_corrida(f, y0, t_values, anterior: str = None, **opciones):
+    """
+    Retorna una `Corrida` nueva ya en marcha y cancela la corrida `anterior`
+    (la que estaba mostrando la página antes de cambiar los parámetros).
+
+    Parámetros:
+    -------
+    - f, y0, t_values: Ver `integrar_edo`.
+    - anterior: Id de la corrida que se reemplaza (None si no hay).
+    - opciones: Argumentos del integrador (metodo, rtol, atol, max_pasos, ...).
+    """
+
+    cancelar_corrida(anterior)
+    corrida = Corrida(f, y0, t_values, **opciones)
+
+    with CANDADO:
+        CORRIDAS[corrida.id] = corrida
+        while len(CORRIDAS) > MAX_CORRIDAS:
+            _, vieja = CORRIDAS.popitem(last=False)
+            vieja.cancelar()
+
+    return corrida.iniciar()
+
+def obtener_corrida(id_corrida: str):
+    """
+    Retorna la `Corrida` con ese id o None si no existe (cancelada, descartada o de otro proceso).
+    """
+    with CANDADO:
+        return CORRIDAS.get(id_corrida)
+
+def cancelar_corrida(id_corrida: str):
+    """
+    Cancela y descarta la corrida con ese id (si existe).
+    """
+    if id_corrida is None:
+        return
+    with CANDADO:
+        corrida = CORRIDAS.pop(id_corrida, None)
+        CANCELADAS[id_corrida] = True
+        while len(CANCELADAS) > MAX_CANCELADAS:
+            CANCELADAS.popitem(last=False)
+    if corrida is not None:
+        corrida.cancelar()
+
+def fue_cancelada(id_corrida: str):
+    """
+    Retorna True si la corrida se canceló con `cancelar_corrida` (la página ya la reemplazó o
+    terminó de enviarla). Una corrida que no existe y no fue cancelada se descartó por
+    `MAX_CORRIDAS` o es de otro proceso.
+    """
+    with CANDADO:
+        return id_corrida in CANCELADAS
@@ -0,0 +1,272 @@
+# Librerias
+import atexit
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .cache import cache_trayectorias
+
+
+# Réplicas que simula cada tarea. Cada bloque tiene su propia semilla, así el resultado
+# es el mismo sin importar cuántos procesos se usen.
+REPLICAS_POR_BLOQUE = 500
+
+# Paso máximo del tau-leaping (días)
+TAU = 0.1
+
+# Eventos permitidos por bloque en Gillespie (crece con N: cada persona aporta hasta dos eventos)
+MAX_EVENTOS = 2000000
+
+# Eventos estimados (todas las réplicas) que se aceptan en Gillespie: unos 2 s de cálculo
+MAX_EVENTOS_TOTALES = 20000000
+
+# Un brote se extingue si deja de haber infectados antes de alcanzar esta fracción de los susceptibles
+UMBRAL_EXTINCION = 0.1
+
+# Percentiles que se guardan de cada compartimento (bandas 5-95, 25-75 y la mediana)
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Procesos del pool (se crea la primera vez que hace falta)
+_POOL = None
+
+
+# Simuladores (vectorizados: cada réplica es una columna del estado)
+
+def _estado_inicial(N, I0, R0, replicas):
+    S = np.full(replicas, N - I0 - R0, dtype=np.int64)
+    I = np.full(replicas, I0, dtype=np.int64)
+    R = np.full(replicas, R0, dtype=np.int64)
+    return S, I, R
+
+def tau_leaping_SIR(N: int, I0: int, R0: int, t_values, beta: float, gamma: float, replicas: int, tau: float = TAU, semilla=None):
+    """
+    Retorna un arreglo (tiempos, réplicas, 3) con S, I y R de cada réplica en `t_values`,
+    simulado con tau-leaping binomial: en cada paso de largo h cada susceptible se infecta con
+    probabilidad 1 - exp(-beta I h / N) y cada infectado se recupera con 1 - exp(-gamma h).
+    Al sortear con binomiales los compartimentos nunca quedan negativos.
+
+    Parámetros:
+    -------
+    - N, I0, R0: Población total, infectados y recuperados iniciales (enteros).
+    - t_values: Tiempos donde se guarda el estado (crecientes, el primero es el inicial).
+    - beta, gamma: Tasas de transmisión y de recuperación.
+    - replicas: Cantidad de réplicas simuladas a la vez.
+    - tau: Paso máximo; cada intervalo de `t_values` se divide en pasos iguales no mayores a `tau`.
+    - semilla: Semilla o `np.random.SeedSequence` del generador.
+    """
+
+    generador = np.random.default_rng(semilla)
+    S, I, R = _estado_inicial(N, I0, R0, replicas)
+
+    registro = np.empty((len(t_values), replicas, 3), dtype=np.int32)
+    registro[0] = np.stack((S, I, R), axis=-1)
+
+    for k in range(1, len(t_values)):
+        # Solo se simulan las réplicas con infectados: las extinguidas ya no cambian
+        vivas = np.flatnonzero(I)
+        if vivas.size == 0:
+            registro[k:] = registro[k - 1]
+            break
+
+        intervalo = t_values[k] - t_values[k - 1]
+        pasos = max(1, math.ceil(intervalo / tau))
+        h = intervalo / pasos
+        p_recuperacion = -math.expm1(-gamma * h)
+        S_v, I_v, R_v = S[vivas], I[vivas], R[vivas]
+
+        for _ in range(pasos):
+            infecciones = generador.binomial(S_v, -np.expm1(-beta * h / N * I_v))
+            recuperaciones = generador.binomial(I_v, p_recuperacion)
+            S_v -= infecciones
+            I_v += infecciones - recuperaciones
+            R_v += recuperaciones
+
+        S[vivas], I[vivas], R[vivas] = S_v, I_v, R_v
+        registro[k] = np.stack((S, I, R), axis=-1)
+
+    return registro
+
+def gillespie_SIR(N: int, I0: int, R0: int, t_values, beta: float, gamma: float, replicas: int, semilla=None, max_eventos: int = MAX_EVENTOS):
+    """
+    Retorna un arreglo (tiempos, réplicas, 3) con S, I y R de cada réplica en `t_values`,
+    simulado con el algoritmo exacto de Gillespie. Todas las réplicas avanzan juntas: en cada
+    iteración cada una sortea su próximo evento (infección o recuperación) y su tiempo.
+
+    El costo crece con N (hasta dos eventos por persona), por eso tau-leaping es el modo rápido.
+
+    Parámetros:
+    -------
+    - N, I0, R0, t_values, beta, gamma, replicas, semilla: Ver `tau_leaping_SIR`.
+    - max_eventos: Iteraciones permitidas antes de abortar.
+    """
+
+    generador = np.random.default_rng(semilla)
+    S, I, R = _estado_inicial(N, I0, R0, replicas)
+    t_values = np.asarray(t_values, dtype=float)
+    cant = len(t_values)
+
+    registro = np.empty((cant, replicas, 3), dtype=np.int32)
+    registro[0] = np.stack((S, I, R), axis=-1)
+
+    tiempo = np.full(replicas, t_values[0])
+    siguiente = np.ones(replicas, dtype=int)  # Próximo índice de t_values que falta guardar
+    columnas = np.arange(replicas)
+
+    for _ in range(max_eventos):
+        activas = siguiente < cant
+        if not activas.any():
+            return registro
+
+        # Tasas de cada evento; sin infectados el tiempo del próximo evento es infinito
+        infeccion = beta * S * I / N
+        total = infeccion + gamma * I
+        with np.errstate(divide='ignore'):
+            nuevo = tiempo + generador.exponential(1.0, replicas) / total
+
+        # Guardar el estado actual en los tiempos de la malla que pasan antes del evento
+        pendiente = activas & (t_values[np.minimum(siguiente, cant - 1)] < nuevo)
+        while pendiente.any():
+            registro[siguiente[pendiente], columnas[pendiente]] = np.stack((S[pendiente], I[pendiente], R[pendiente]), axis=-1)
+            siguiente[pendiente] += 1
+            pendiente &= siguiente < cant
+            pendiente[pendiente] = t_values[siguiente[pendiente]] < nuevo[pendiente]
+
+        # Aplicar el evento en las réplicas que siguen dentro del horizonte
+        ocurre = (siguiente < cant) & (total > 0)
+        es_infeccion = generador.random(replicas) * total < infeccion
+        cambio_S = ocurre & es_infeccion
+        cambio_R = ocurre & ~es_infeccion
+        S -= cambio_S
+        I += cambio_S.astype(np.int64) - cambio_R
+        R += cambio_R
+        tiempo = nuevo
+
+    raise RuntimeError(f'Gillespie superó {max_eventos} eventos; usar tau-leaping para poblaciones grandes')
+
+SIMULADORES = {'tau': tau_leaping_SIR, 'gillespie': gillespie_SIR}
+
+
+# Funciones
+
+def _simular_bloque(metodo, argumentos, replicas, semilla):
+    return SIMULADORES[metodo](*argumentos, replicas, semilla=semilla)
+
+def _pool(procesos: int):
+    # Los procesos no se crean con fork desde el servidor (que tiene hilos): forkserver donde exista
+    global _POOL
+    if _POOL is None:
+        contexto = multiprocessing.get_context('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+        _POOL = ProcessPoolExecutor(max_workers=procesos, mp_context=contexto)
+        atexit.register(_POOL.shutdown, wait=False, cancel_futures=True)
+    return _POOL
+
+def validar_compartimentos(N: int, I0: int, R0: int):
+    """
+    Lanza ValueError si N, I0 y R0 no son enteros con 0 <= I0, 0 <= R0 e I0 + R0 <= N
+    (con S0 = N - I0 - R0 negativo las tasas serían negativas y el tiempo retrocedería).
+    """
+    if any(valor is None or not float(valor).is_integer() for valor in (N, I0, R0)):
+        raise ValueError('N, I0 y R0 deben ser enteros')
+    if not (int(N) >= 1 and int(I0) >= 0 and int(R0) >= 0 and int(I0) + int(R0) <= int(N)):
+        raise ValueError('Se necesita N >= 1, I0 >= 0, R0 >= 0 e I0 + R0 <= N')
+
+def eventos_gillespie(N: int, I0: int, R0: int):
+    """
+    Retorna la cota de eventos por réplica de Gillespie: cada susceptible puede infectarse
+    y recuperarse, y cada infectado inicial recuperarse (2 (N - I0 - R0) + I0).
+    Lanza ValueError si los compartimentos no son válidos (ver `validar_compartimentos`).
+    """
+    validar_compartimentos(N, I0, R0)
+    return 2 * (int(N) - int(I0) - int(R0)) + int(I0)
+
+def admite_gillespie(N: int, I0: int, R0: int, replicas: int):
+    """
+    Retorna True si Gillespie termina en un tiempo razonable: a lo más `MAX_EVENTOS` por réplica
+    y `MAX_EVENTOS_TOTALES` entre todas. Si no, conviene tau-leaping.
+    """
+    eventos = eventos_gillespie(N, I0, R0)
+    return eventos <= MAX_EVENTOS and eventos * int(replicas) <= MAX_EVENTOS_TOTALES
+
+def simular_SIR_estocastico(N: int, I0: int, R0: int, t_values, beta: float, gamma: float, replicas: int,
+                            metodo: str = 'tau', semilla: int = 0, procesos: int = None):
+    """
+    Retorna un arreglo (tiempos, réplicas, 3) con las réplicas del SIR estocástico.
+
+    Las réplicas se dividen en bloques de `REPLICAS_POR_BLOQUE` con semillas independientes
+    (`SeedSequence.spawn`) y, si hay más de un bloque, se reparten entre procesos.
+
+    Parámetros:
+    -------
+    - N, I0, R0, t_values, beta, gamma, replicas: Ver `tau_leaping_SIR`.
+    - metodo: 'tau' (tau-leaping) o 'gillespie' (exacto, solo si `admite_gillespie`).
+    - semilla: Semilla base (el mismo valor da las mismas réplicas).
+    - procesos: Procesos a usar (por defecto TM_PROCESOS o la cantidad de CPUs; 1 para no usar el pool).
+
+    Lanza ValueError si los compartimentos no son válidos o Gillespie sería demasiado largo.
+    """
+
+    if metodo not in SIMULADORES:
+        raise ValueError(f'Método estocástico desconocido: {metodo!r}')
+    validar_compartimentos(N, I0, R0)
+    if metodo == 'gillespie' and not admite_gillespie(N, I0, R0, replicas):
+        raise ValueError(f'Gillespie necesitaría hasta {eventos_gillespie(N, I0, R0) * int(replicas):.2g} eventos '
+                         f'(máximo {MAX_EVENTOS_TOTALES:.0e}); usar tau-leaping o menos réplicas')
+
+    argumentos = (int(N), int(I0), int(R0), np.asarray(t_values, dtype=float), float(beta), float(gamma))
+    tamanos = [min(REPLICAS_POR_BLOQUE, replicas - inicio) for inicio in range(0, replicas, REPLICAS_POR_BLOQUE)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+
+    if procesos is None:
+        procesos = int(os.environ.get('TM_PROCESOS') or os.cpu_count() or 1)
+
+    if procesos <= 1 or len(tamanos) == 1:
+        bloques = [_simular_bloque(metodo, argumentos, n, s) for n, s in zip(tamanos, semillas)]
+    else:
+        bloques = list(_pool(procesos).map(_simular_bloque, [metodo] * len(tamanos), [argumentos] * len(tamanos), tamanos, semillas))
+
+    return np.concatenate(bloques, axis=1)
+
+@cache_trayectorias
+def resumen_SIR_estocastico(N: int, I0: int, R0: int, t: float, beta: float, gamma: float, replicas: int,
+                            metodo: str = 'tau', cant: int = 200, semilla: int = 0):
+    """
+    Retorna un diccionario con el resumen de las réplicas del SIR estocástico:
+    't', 'percentiles', 'S', 'I' y 'R' (forma (percentiles, tiempos)), 'extincion'
+    (fracción de réplicas en que el brote se extinguió sin crecer) y 'extincion_teorica'
+    ((gamma / beta)^I0, la aproximación de procesos de ramificación).
+
+    Parámetros:
+    -------
+    - N: Población total.
+    - I0: Infectados iniciales.
+    - R0: Recuperados iniciales.
+    - t: Tiempo total de simulación.
+    - beta: Tasa de transmisión.
+    - gamma: Tasa de recuperación.
+    - replicas: Cantidad de réplicas.
+    - metodo: 'tau' o 'gillespie'.
+    - cant: Cantidad de puntos en el eje temporal.
+    - semilla: Semilla base.
+    """
+
+    t_values = np.linspace(0, t, cant)
+    trayectorias = simular_SIR_estocastico(N, I0, R0, t_values, beta, gamma, replicas, metodo, semilla)
+
+    # Percentiles por tiempo y compartimento: forma (percentiles, tiempos, 3)
+    bandas = np.percentile(trayectorias, PERCENTILES, axis=1)
+
+    # Extinción temprana: sin infectados al final y pocos susceptibles alcanzados
+    S_final, I_final = trayectorias[-1, :, 0], trayectorias[-1, :, 1]
+    alcanzados = int(N) - int(R0) - S_final
+    extinto = (I_final == 0) & (alcanzados - int(I0) <= UMBRAL_EXTINCION * (int(N) - int(I0) - int(R0)))
+
+    return {
+        't': t_values,
+        'percentiles': np.array(PERCENTILES),
+        'S': bandas[..., 0],
+        'I': bandas[..., 1],
+        'R': bandas[..., 2],
+        'extincion': np.array(extinto.mean()),
+        'extincion_teorica': np.array(min(1.0, (gamma / beta) ** I0) if beta > 0 else 1.0)
+    }
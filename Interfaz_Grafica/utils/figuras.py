@@ -0,0 +1,118 @@
+# Librerias
+import functools
+import plotly.io as pio
+
+
+# Las figuras se arman como diccionarios ({'data': [...], 'layout': {...}}) con la misma forma
+# que da `go.Figure(...).to_dict()`, sin pasar por la validación de `graph_objects` en cada
+# propiedad. Dash y Plotly.js los reciben igual que una go.Figure.
+
+# Plantilla 'plotly_white' convertida a diccionario una sola vez. La comparten todas las
+# figuras (y las de la caché), así que no debe modificarse.
+PLANTILLA = pio.templates['plotly_white'].to_plotly_json()
+
+# Contorno de los ejes que usan las gráficas de los modelos
+CONTORNO = {
+    'mirror': True,
+    'showline': True,
+    'linecolor': 'green',
+    'gridcolor': 'gray',
+    'showgrid': False
+}
+
+# Márgenes y leyenda horizontal sobre la gráfica
+MARGEN = {'l': 10, 'r': 10, 't': 90, 'b': 0}
+LEYENDA = {'orientation': 'h', 'y': 1.1}
+
+
+# Funciones
+
+def traza(tipo: str, **propiedades):
+    """
+    Retorna una traza como diccionario (p. ej. traza('scatter', x=..., y=..., mode='lines')).
+    Los arreglos de NumPy se dejan tal cual; `codificacion.codificar_figura` los pasa a binario.
+    """
+    return {'type': tipo, **propiedades}
+
+def eje(titulo: str = None, contorno: bool = True, **propiedades):
+    """
+    Retorna las propiedades de un eje: título, el contorno de `CONTORNO` y otras (range, ...).
+    """
+    resultado = {} if titulo is None else {'title': {'text': titulo}}
+    if contorno:
+        resultado.update(CONTORNO)
+    resultado.update(propiedades)
+    return resultado
+
+def layout(titulo, eje_x: dict = None, eje_y: dict = None, **propiedades):
+    """
+    Retorna un layout con la plantilla compartida.
+
+    Parámetros:
+    -------
+    - titulo: Texto del título o diccionario (text, x, y, xanchor, ...).
+    - eje_x, eje_y: Propiedades de los ejes (ver `eje`).
+    - propiedades: Otras propiedades del layout (width, height, margin, hovermode, ...).
+      Las que valen None se omiten, como en Plotly.
+    """
+    resultado = {'template': PLANTILLA, 'title': titulo if isinstance(titulo, dict) else {'text': titulo}}
+    if eje_x is not None:
+        resultado['xaxis'] = eje_x
+    if eje_y is not None:
+        resultado['yaxis'] = eje_y
+    resultado.update((clave, valor) for clave, valor in propiedades.items() if valor is not None)
+    return resultado
+
+def layout_modelo(titulo, titulo_x: str, titulo_y: str, contorno: bool = True, rango_x=None, **propiedades):
+    """
+    Retorna el layout común de las gráficas de los modelos: ancho 800, márgenes,
+    leyenda horizontal y ejes con contorno.
+
+    Parámetros:
+    -------
+    - titulo: Ver `layout`.
+    - titulo_x, titulo_y: Títulos de los ejes.
+    - contorno: Aplicar `CONTORNO` a los ejes.
+    - rango_x: Rango [min, max] del eje x (None para automático).
+    - propiedades: Otras propiedades del layout.
+    """
+    eje_x = eje(titulo_x, contorno) if rango_x is None else eje(titulo_x, contorno, range=list(rango_x))
+    return layout(titulo, eje_x, eje(titulo_y, contorno), width=800, margin=MARGEN, legend=LEYENDA, **propiedades)
+
+def figura(trazas, layout_figura: dict):
+    """
+    Retorna la figura {'data': trazas, 'layout': layout_figura}.
+    """
+    return {'data': list(trazas), 'layout': layout_figura}
+
+def figura_vacia():
+    """
+    Retorna una figura sin trazas, como `go.Figure()` (con la plantilla por defecto de Plotly).
+    """
+    return {'data': [], 'layout': {'template': _plantilla_por_defecto()}}
+
+@functools.lru_cache(maxsize=None)
+def _plantilla_por_defecto():
+    return pio.templates[pio.templates.default].to_plotly_json()
+
+@functools.lru_cache(maxsize=None)
+def subplots(filas: int, espacio_vertical: float, titulos: tuple):
+    """
+    Retorna el layout de una columna de `filas` subgráficas con eje x compartido (dominios,
+    anclas y anotaciones de los títulos), calculado una vez con `make_subplots`.
+    El resultado se comparte: copiar los ejes antes de modificarlos.
+    """
+    from plotly.subplots import make_subplots
+    esqueleto = make_subplots(rows=filas, cols=1, shared_xaxes=True, vertical_spacing=espacio_vertical, subplot_titles=list(titulos))
+    resultado = esqueleto.to_dict()['layout']
+    resultado.pop('template', None)
+    return resultado
+
+@functools.lru_cache(maxsize=None)
+def escala_colores(nombre: str):
+    """
+    Retorna la escala de colores con nombre (p. ej. 'Viridis') expandida a [[posición, color], ...]
+    como la deja Plotly al validar una traza. El resultado se comparte.
+    """
+    from plotly.graph_objects import Heatmap
+    return Heatmap(colorscale=nombre).to_plotly_json()['colorscale']
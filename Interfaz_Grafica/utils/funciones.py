@@ -1,513 +1,578 @@
-# Librerias
-import numpy as np 
-import plotly.graph_objects as go # Grafica
-import plotly.figure_factory as ff # mallado de vectores
-
-
-# Funciones
-
-def ley_enfriamiento_newton(Ta: float, T0: float, k: float, t0: float, t: float, cant: float, scale: float, show_field: bool):
-    """
-    Retorna una gráfica de la ley de enfriamiento de Newton con su campo vectorial opcionalmente.
-
-    Parámetros:
-    -------
-    - Ta: temperatura del ambiente.
-    - T0: temperatura inicial.
-    - k: tasa de enfriamiento.
-    - t0: Tiempo inicial.
-    - t: Tiempo final.
-    - cant: Las particiones para el eje temporal y espacial.
-    - scale: Tamaño del vector del campo vectorial.
-    - show_field: Booleano para mostrar o no el campo de vectores.
-    """
-
-    # Rango de T y t
-    T_values = np.linspace(0, T0, cant)  # Va desde 0 hasta T0
-    t_values = np.linspace(0, t, cant)
-
-    # Crear una malla de puntos (T, t)
-    ti, T = np.meshgrid(t_values, T_values)
-
-    # Definir la EDO
-    dT_dt = k * (T - Ta)
-
-    # Solución exacta de la ley de enfriamiento de Newton
-    funcion = (T0 - Ta) * np.exp(k * t_values) + Ta
-
-    # Crear la figura para la gráfica
-    fig = go.Figure()
-
-    # Condicional para mostrar el campo de vectores
-    if show_field:
-        # Campo vectorial: dT/dt (componente vertical)
-        U = np.ones_like(ti)  # Componente en t (horizontal)
-        V = dT_dt             # Componente en T (vertical)
-
-        # Añadir el campo de vectores
-        fig = ff.create_quiver(
-            ti, T, U, V,
-            scale=scale,
-            line=dict(color='black', width=1),
-            showlegend=False
-        )
-
-    # Añadir la función de la ley de enfriamiento
-    fig.add_trace(
-        go.Scatter(
-            x=t_values,
-            y=funcion,
-            line=dict(color='blue'),
-            name='Ley de enfriamiento de Newton'
-        )
-    )
-
-    # Añadir la línea de la temperatura ambiente
-    fig.add_trace(
-        go.Scatter(
-            x=[0, t],
-            y=[Ta, Ta],
-            mode='lines',
-            line=dict(color='red', dash='dash'),
-            name='Temperatura Ambiente'
-        )
-    )
-
-    # Etiquetas para la gráfica
-    fig.update_layout(
-        title={
-            'text': 'Campo de vectores de dT/dt = k(T-Ta)',
-            'x': 0.5,
-            'y': 0.92,
-            'xanchor': 'center'
-        },
-        xaxis_title='Tiempo (t)',
-        yaxis_title='Temperatura (T)',
-        width=800,
-        template='plotly_white',
-        margin=dict(l=10, r=10, t=90, b=0),
-        legend=dict(orientation='h', y=1.1)
-    )
-
-    # Añadir contorno a la gráfica
-    fig.update_xaxes(
-        mirror=True,
-        showline=True,
-        linecolor='green',
-        gridcolor='gray',
-        showgrid=False
-    )
-    fig.update_yaxes(
-        mirror=True,
-        showline=True,
-        linecolor='green',
-        gridcolor='gray',
-        showgrid=False
-    )
-
-    return fig
-
-def ecuacion_logistica(K: float, P0: float, r: float, t0: float, t: float, cant: float, scale: float, show_field: bool):
-    """
-    Retorna una gráfica de la ecuacion logistica con su campo vectorial opcionalmente.
-
-    Parámetros:
-    -------
-    - K: Capacidad de carga.
-    - P0: Poblacion Inicial.
-    - r: Tasa de crecimineto poblacional.
-    - t0: Tiempo inicial.
-    - t: Tiempo final.
-    - cant: Las particiones para el eje temporal y espacial.
-    - scale: Tamaño del vector del campo vectorial.
-    - show_field: Booleano para mostrar o no el campo de vectores.
-    """
-
-    # Rango de P y t
-    P_values = np.linspace(0, K+5, cant)
-    t_values = np.linspace(0, t, cant)
-
-    # Crear una malla de puntos (P, t)
-    T, P = np.meshgrid(t_values, P_values)
-
-    # Definir la EDO
-    dP_dt = r * P * (1 - P / K)
-
-    # Solución exacta de la Ecuación Logística
-    funcion = K*P0*np.exp(r*t_values) / (P0*np.exp(r*t_values) + (K-P0)*np.exp(r*t0))
-
-    # Crear la figura para la gráfica
-    fig = go.Figure()
-
-    # Condicional para mostrar el campo de vectores
-    if show_field:
-        # Campo vectorial: dP/dt (componente vertical)
-        U = np.ones_like(T)  # Componente en t (horizontal)
-        V = dP_dt           # Componente en P (vertical)
-
-        # Añadir el campo de vectores
-        fig = ff.create_quiver(
-            T, P, U, V,
-            scale=scale,
-            line=dict(color='black', width=1),
-            showlegend=False
-        )
-
-    # Añadir la función logística
-    fig.add_trace(
-        go.Scatter(
-            x=t_values,
-            y=funcion,
-            line=dict(color='blue'),
-            name='Ecuación Logística'
-        )
-    )
-
-    # Añadir la línea de capacidad de carga
-    fig.add_trace(
-        go.Scatter(
-            x=[0, t],
-            y=[K, K],
-            mode='lines',
-            line=dict(color='red', dash='dash'),
-            name='Capacidad de carga'
-        )
-    )
-
-    # Etiquetas para la gráfica
-    fig.update_layout(
-        title={
-            'text': 'Campo de vectores de dP/dt = rP(1 - P/K)',
-            'x': 0.5,
-            'y': 0.92,
-            'xanchor': 'center'
-        },
-        xaxis_title='Tiempo (t)',
-        yaxis_title='Población (P)',
-        width=800,
-        template='plotly_white',
-        margin=dict(l=10, r=10, t=90, b=0),
-        legend=dict(orientation='h', y=1.1)
-    )
-
-    # Añadir contorno a la gráfica
-    fig.update_xaxes(
-        mirror=True,
-        showline=True,
-        linecolor='green',
-        gridcolor='gray',
-        showgrid=False
-    )
-    fig.update_yaxes(
-        mirror=True,
-        showline=True,
-        linecolor='green',
-        gridcolor='gray',
-        showgrid=False
-    )
-
-    return fig
-
-# Función para el modelo de decaimiento radioactivo
-def modelo_decaimiento_radioactivo(N0: float, k: float, t0: float, t: float, cant: int, scale: float, show_field: bool):
-    """
-    Retorna una gráfica del modelo de decaimiento radioactivo con su campo vectorial (opcional).
-
-    Parámetros:
-    -------
-    - N0: Número de núcleos inicial.
-    - k: Tasa de desintegración.
-    - t0: Tiempo inicial.
-    - t: Tiempo final.
-    - cant: Las particiones para el eje temporal y espacial.
-    - scale: Tamaño del vector del campo vectorial.
-    - show_field: Bool que indica si se debe mostrar el campo de vectores.
-    """
-
-    # Rango de N y t
-    N_values = np.linspace(0, N0, cant)
-    t_values = np.linspace(t0, t, cant)
-
-    # Crear una malla de puntos (N, t)
-    T, N = np.meshgrid(t_values, N_values)
-
-    # Definir la EDO
-    dN_dt = -k * N
-
-    # Solución exacta del modelo de decaimiento radioactivo
-    funcion = N0 * np.exp(-k * t_values)
-
-    # Crear la figura para la gráfica
-    fig = go.Figure()
-
-    # Añadir el campo vectorial solo si show_field es True
-    if show_field:
-        # Campo vectorial: dN/dt (componente vertical)
-        U = np.ones_like(T)  # Componente en t (horizontal)
-        V = dN_dt           # Componente en N (vertical)
-
-        # Crear el campo de vectores con Plotly
-        fig = ff.create_quiver(
-            T, N, U, V,
-            scale=scale,
-            line=dict(color='black', width=1),
-            showlegend=False
-        )
-   
-    # Crear la función del modelo de decaimiento radioactivo
-    fig.add_trace(
-        go.Scatter(
-            x=t_values,
-            y=funcion,
-            line=dict(color='blue'),
-            name='Modelo de Decaimiento Radioactivo'
-        )
-    )
-
-    # Etiquetas para la gráfica
-    fig.update_layout(
-        title={
-            'text': 'Campo de vectores de dN/dt = -kN' if show_field else 'Decaimiento Radioactivo',
-            'x': 0.5,
-            'y': 0.92,
-            'xanchor': 'center'
-        },
-        xaxis_title='Tiempo (t)',
-        yaxis_title='Número de Núcleos (N)',
-        width=800,
-        template='plotly_white',
-        margin=dict(l=10, r=10, t=90, b=0),
-        legend=dict(orientation='h', y=1.1)
-    )
-
-    # Contorno a la gráfica
-    fig.update_xaxes(
-        mirror=True,
-        showline=True,
-        linecolor='green',
-        gridcolor='gray',
-        showgrid=False
-    )
-    fig.update_yaxes(
-        mirror=True,
-        showline=True,
-        linecolor='green',
-        gridcolor='gray',
-        showgrid=False
-    )
-
-    return fig
-
-# Función para el modelo de crecimiento exponencial
-def modelo_crecimiento_exponencial(N0: float, r: float, t0: float, t: float, cant: int, scale: float, show_field: bool):
-    """
-    Retorna una gráfica del modelo de crecimiento exponencial con su campo vectorial (opcional).
-
-    Parámetros:
-    -------
-    - N0: Población inicial.
-    - r: Tasa de crecimiento exponencial.
-    - t0: Tiempo inicial.
-    - t: Tiempo final.
-    - cant: Cantidad de particiones para el eje temporal y espacial.
-    - scale: Tamaño del vector del campo vectorial.
-    - show_field: Bool que indica si se debe mostrar el campo de vectores.
-    """
-
-    # Rango de N y t (se aumenta la densidad para mejor visualización y hover en más puntos)
-    N_values = np.linspace(0, N0 * 2, cant)
-    t_values = np.linspace(t0, t, cant)
-
-    # Crear una malla de puntos (N, t)
-    T, N = np.meshgrid(t_values, N_values)
-
-    # Definir la EDO: dN/dt = r * N
-    dN_dt = r * N
-
-    # Solución exacta del modelo de crecimiento exponencial
-    funcion = N0 * np.exp(r * t_values)
-
-    # Crear la figura para la gráfica
-    fig = go.Figure()
-
-    # Añadir el campo vectorial solo si show_field es True
-    if show_field:
-        # Campo vectorial: dN/dt (componente vertical)
-        U = np.ones_like(T)  # Componente en t (horizontal)
-        V = dN_dt  # Componente en N (vertical)
-
-        # Escalar los vectores para que se ajusten a la escala del gráfico y se visualicen bien
-        fig = ff.create_quiver(
-            T, N, U, V,
-            scale=scale,
-            line=dict(color='black', width=1),
-            showlegend=False
-        )
-
-    # Crear la función de crecimiento exponencial (la solución exacta)
-    fig.add_trace(
-        go.Scatter(
-            x=t_values,
-            y=funcion,
-            line=dict(color='blue'),
-            name='Crecimiento Exponencial',
-        )
-    )
-
-    # Etiquetas para la gráfica
-    fig.update_layout(
-        title={
-            'text': 'Campo de vectores de dN/dt = rN' if show_field else 'Crecimiento Exponencial',
-            'x': 0.5,
-            'y': 0.92,
-            'xanchor': 'center'
-        },
-        xaxis_title='Tiempo (t)',
-        yaxis_title='Población (N)',
-        width=800,
-        template='plotly_white',
-        margin=dict(l=10, r=10, t=90, b=0),
-        legend=dict(orientation='h', y=1.1)
-    )
-
-    # Ajustar los límites de los ejes para que solo muestre desde 0 en adelante
-    fig.update_xaxes(
-        range=[0, t],  # Limitar el eje x a partir de 0 hasta t final
-        mirror=True,
-        showline=True,
-        linecolor='green',
-        gridcolor='gray',
-        showgrid=False
-    )
-    fig.update_yaxes(
-        mirror=True,
-        showline=True,
-        linecolor='green',
-        gridcolor='gray',
-        showgrid=False
-    )
-
-    return fig
-
-# Función para el modelo SIR cambiante
-def modelo_SIR_cambiante(N: float, I0: float, R0: float, t: int, beta: float, gamma: float, cant: int):
-    """
-    Retorna una gráfica del modelo SIR.
-
-    Parámetros:
-    -------
-    - N: Población total.
-    - I0: Infectados iniciales.
-    - R0: Recuperados iniciales.
-    - t: Tiempo total de simulación.
-    - beta: Tasa de transmisión.
-    - gamma: Tasa de recuperación.
-    - cant: Cantidad de particiones para el eje temporal.
-    """
-
-    # Generar el rango de tiempo
-    t_values = np.linspace(0, t, cant)
-
-    # Inicialización de las listas de S, I, R
-    S = np.zeros(cant)
-    I = np.zeros(cant)
-    R = np.zeros(cant)
-
-    # Condiciones iniciales
-    S[0] = N - I0 - R0  # Susceptibles
-    I[0] = I0  # Infectados
-    R[0] = R0  # Recuperados
-
-    # Solución numérica del modelo SIR
-    for i in range(1, cant):
-        S[i] = S[i-1] - (beta * S[i-1] * I[i-1]) / N  # Cambios en S
-        I[i] = I[i-1] + (beta * S[i-1] * I[i-1]) / N - gamma * I[i-1]  # Cambios en I
-        R[i] = R[i-1] + gamma * I[i-1]  # Cambios en R
-
-    # Crear la figura para la gráfica
-    fig = go.Figure()
-
-    # Añadir las trazas para S, I y R
-    fig.add_trace(go.Scatter(x=t_values, y=S, mode='lines', name='Susceptibles', line=dict(color='green')))
-    fig.add_trace(go.Scatter(x=t_values, y=I, mode='lines', name='Infectados', line=dict(color='red')))
-    fig.add_trace(go.Scatter(x=t_values, y=R, mode='lines', name='Recuperados', line=dict(color='blue')))
-
-    # Etiquetas para la gráfica
-    fig.update_layout(
-        title='Modelo SIR: Dinámica de Población',
-        xaxis_title='Tiempo (t)',
-        yaxis_title='Número de Individuos',
-        width=800,
-        template='plotly_white',
-        margin=dict(l=10, r=10, t=90, b=0),
-        legend=dict(orientation='h', y=1.1)
-    )
-
-    # Ajustar los límites de los ejes para que solo muestre desde 0 en adelante
-    fig.update_xaxes(
-        range=[0, t],  # Limitar el eje x a partir de 0 hasta t final
-        mirror=True,
-        showline=True,
-        linecolor='green',
-        gridcolor='gray',
-        showgrid=False
-    )
-    fig.update_yaxes(
-        mirror=True,
-        showline=True,
-        linecolor='green',
-        gridcolor='gray',
-        showgrid=False
-    )
-
-    return fig
-
-# Función para el modelo Lotka-Volterra
-def modelo_lotka_volterra(alpha: float, beta: float, delta: float, gamma: float, x0: float, y0: float, t: int, cant: int):
-    """
-    Retorna una gráfica interactiva del modelo Lotka-Volterra.
-
-    Parámetros:
-    -------
-    - alpha: Tasa de crecimiento de presas.
-    - beta: Tasa de depredación.
-    - delta: Tasa de crecimiento de depredadores.
-    - gamma: Tasa de mortalidad de depredadores.
-    - x0: Población inicial de presas.
-    - y0: Población inicial de depredadores.
-    - t: Tiempo total de simulación.
-    - cant: Cantidad de puntos en el eje temporal.
-    """
-
-    # Generar el rango de tiempo
-    t_values = np.linspace(0, t, cant)
-
-    # Inicialización de las listas de x (presas) y y (depredadores)
-    x = np.zeros(cant)
-    y = np.zeros(cant)
-
-    # Condiciones iniciales
-    x[0] = x0
-    y[0] = y0
-
-    # Solución numérica del modelo Lotka-Volterra
-    for i in range(1, cant):
-        x[i] = x[i-1] + (alpha * x[i-1] - beta * x[i-1] * y[i-1])
-        y[i] = y[i-1] + (delta * x[i-1] * y[i-1] - gamma * y[i-1])
-
-    # Crear la figura para la gráfica
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=t_values, y=x, mode='lines', name='Presas', line=dict(color='green')))
-    fig.add_trace(go.Scatter(x=t_values, y=y, mode='lines', name='Depredadores', line=dict(color='red')))
-
-    fig.update_layout(
-        title='Modelo Lotka-Volterra',
-        xaxis_title='Tiempo (t)',
-        yaxis_title='Población',
-        width=800,
-        template='plotly_white',
-        margin=dict(l=10, r=10, t=90, b=0),
-        legend=dict(orientation='h', y=1.1)
-    )
-
-    return fig
\ No newline at end of file
+# Librerias
+import numpy as np 
+from .figuras import MARGEN, LEYENDA, traza, eje, layout, layout_modelo, figura, subplots, escala_colores # figuras como diccionarios
+from .campo_vectores import crear_campo_vectores, coordenadas_campo_vectores # mallado de vectores
+from .modelos import (  # soluciones de los modelos
+    calcular_enfriamiento_newton, calcular_ecuacion_logistica, calcular_decaimiento_radioactivo,
+    calcular_crecimiento_exponencial, trayectoria_SIR, barrido_SIR, rhs_lotka_volterra,
+    trayectoria_lotka_volterra, orbitas_lotka_volterra
+)
+from .cache import cache_figuras # figuras ya construidas
+from .submuestreo import recortar, submuestrear # reducción de puntos (LTTB)
+from .estocastico import resumen_SIR_estocastico, admite_gillespie # réplicas del SIR estocástico
+
+
+# Deriva relativa de la cantidad conservada a partir de la cual una órbita se marca como imprecisa
+TOLERANCIA_CONSERVADA = 1e-3
+
+
+# Funciones
+
+@cache_figuras
+def ley_enfriamiento_newton(Ta: float, T0: float, k: float, t0: float, t: float, cant: float, scale: float, show_field: bool):
+    """
+    Retorna una gráfica de la ley de enfriamiento de Newton con su campo vectorial opcionalmente.
+
+    Parámetros:
+    -------
+    - Ta: temperatura del ambiente.
+    - T0: temperatura inicial.
+    - k: tasa de enfriamiento.
+    - t0: Tiempo inicial.
+    - t: Tiempo final.
+    - cant: Las particiones para el eje temporal y espacial.
+    - scale: Tamaño del vector del campo vectorial.
+    - show_field: Booleano para mostrar o no el campo de vectores.
+    """
+
+    # Solución exacta y campo de la ley de enfriamiento de Newton
+    datos = calcular_enfriamiento_newton(Ta, T0, k, t0, t, cant)
+    t_values, funcion = datos['t'], datos['solucion']
+    ti, T, dT_dt = datos['malla_t'], datos['malla_y'], datos['pendiente']
+
+    # Trazas de la gráfica
+    trazas = []
+
+    # Condicional para mostrar el campo de vectores
+    if show_field:
+        # Campo vectorial: dT/dt (componente vertical)
+        U = np.ones_like(ti)  # Componente en t (horizontal)
+        V = dT_dt             # Componente en T (vertical)
+
+        # Añadir el campo de vectores
+        trazas.append(crear_campo_vectores(
+            ti, T, U, V,
+            scale=scale,
+            line=dict(color='black', width=1),
+            showlegend=False
+        ))
+
+    # Añadir la función de la ley de enfriamiento
+    trazas.append(traza(
+        'scatter',
+        x=t_values,
+        y=funcion,
+        line=dict(color='blue'),
+        name='Ley de enfriamiento de Newton'
+    ))
+
+    # Añadir la línea de la temperatura ambiente
+    trazas.append(traza(
+        'scatter',
+        x=[0, t],
+        y=[Ta, Ta],
+        mode='lines',
+        line=dict(color='red', dash='dash'),
+        name='Temperatura Ambiente'
+    ))
+
+    # Etiquetas y contorno de la gráfica (con el campo, el cursor muestra el vector más cercano)
+    return figura(trazas, layout_modelo(
+        {
+            'text': 'Campo de vectores de dT/dt = k(T-Ta)',
+            'x': 0.5,
+            'y': 0.92,
+            'xanchor': 'center'
+        },
+        'Tiempo (t)',
+        'Temperatura (T)',
+        hovermode='closest' if show_field else None
+    ))
+
+@cache_figuras
+def ecuacion_logistica(K: float, P0: float, r: float, t0: float, t: float, cant: float, scale: float, show_field: bool):
+    """
+    Retorna una gráfica de la ecuacion logistica con su campo vectorial opcionalmente.
+
+    Parámetros:
+    -------
+    - K: Capacidad de carga.
+    - P0: Poblacion Inicial.
+    - r: Tasa de crecimineto poblacional.
+    - t0: Tiempo inicial.
+    - t: Tiempo final.
+    - cant: Las particiones para el eje temporal y espacial.
+    - scale: Tamaño del vector del campo vectorial.
+    - show_field: Booleano para mostrar o no el campo de vectores.
+    """
+
+    # Solución exacta y campo de la Ecuación Logística
+    datos = calcular_ecuacion_logistica(K, P0, r, t0, t, cant)
+    t_values, funcion = datos['t'], datos['solucion']
+    T, P, dP_dt = datos['malla_t'], datos['malla_y'], datos['pendiente']
+
+    # Trazas de la gráfica
+    trazas = []
+
+    # Condicional para mostrar el campo de vectores
+    if show_field:
+        # Campo vectorial: dP/dt (componente vertical)
+        U = np.ones_like(T)  # Componente en t (horizontal)
+        V = dP_dt           # Componente en P (vertical)
+
+        # Añadir el campo de vectores
+        trazas.append(crear_campo_vectores(
+            T, P, U, V,
+            scale=scale,
+            line=dict(color='black', width=1),
+            showlegend=False
+        ))
+
+    # Añadir la función logística
+    trazas.append(traza(
+        'scatter',
+        x=t_values,
+        y=funcion,
+        line=dict(color='blue'),
+        name='Ecuación Logística'
+    ))
+
+    # Añadir la línea de capacidad de carga
+    trazas.append(traza(
+        'scatter',
+        x=[0, t],
+        y=[K, K],
+        mode='lines',
+        line=dict(color='red', dash='dash'),
+        name='Capacidad de carga'
+    ))
+
+    # Etiquetas y contorno de la gráfica (con el campo, el cursor muestra el vector más cercano)
+    return figura(trazas, layout_modelo(
+        {
+            'text': 'Campo de vectores de dP/dt = rP(1 - P/K)',
+            'x': 0.5,
+            'y': 0.92,
+            'xanchor': 'center'
+        },
+        'Tiempo (t)',
+        'Población (P)',
+        hovermode='closest' if show_field else None
+    ))
+
+# Función para el modelo de decaimiento radioactivo
+@cache_figuras
+def modelo_decaimiento_radioactivo(N0: float, k: float, t0: float, t: float, cant: int, scale: float, show_field: bool):
+    """
+    Retorna una gráfica del modelo de decaimiento radioactivo con su campo vectorial (opcional).
+
+    Parámetros:
+    -------
+    - N0: Número de núcleos inicial.
+    - k: Tasa de desintegración.
+    - t0: Tiempo inicial.
+    - t: Tiempo final.
+    - cant: Las particiones para el eje temporal y espacial.
+    - scale: Tamaño del vector del campo vectorial.
+    - show_field: Bool que indica si se debe mostrar el campo de vectores.
+    """
+
+    # Solución exacta y campo del modelo de decaimiento radioactivo
+    datos = calcular_decaimiento_radioactivo(N0, k, t0, t, cant)
+    t_values, funcion = datos['t'], datos['solucion']
+    T, N, dN_dt = datos['malla_t'], datos['malla_y'], datos['pendiente']
+
+    # Trazas de la gráfica
+    trazas = []
+
+    # Añadir el campo vectorial solo si show_field es True
+    if show_field:
+        # Campo vectorial: dN/dt (componente vertical)
+        U = np.ones_like(T)  # Componente en t (horizontal)
+        V = dN_dt           # Componente en N (vertical)
+
+        # Crear el campo de vectores con Plotly
+        trazas.append(crear_campo_vectores(
+            T, N, U, V,
+            scale=scale,
+            line=dict(color='black', width=1),
+            showlegend=False
+        ))
+   
+    # Crear la función del modelo de decaimiento radioactivo
+    trazas.append(traza(
+        'scatter',
+        x=t_values,
+        y=funcion,
+        line=dict(color='blue'),
+        name='Modelo de Decaimiento Radioactivo'
+    ))
+
+    # Etiquetas y contorno de la gráfica (con el campo, el cursor muestra el vector más cercano)
+    return figura(trazas, layout_modelo(
+        {
+            'text': 'Campo de vectores de dN/dt = -kN' if show_field else 'Decaimiento Radioactivo',
+            'x': 0.5,
+            'y': 0.92,
+            'xanchor': 'center'
+        },
+        'Tiempo (t)',
+        'Número de Núcleos (N)',
+        hovermode='closest' if show_field else None
+    ))
+
+# Función para el modelo de crecimiento exponencial
+@cache_figuras
+def modelo_crecimiento_exponencial(N0: float, r: float, t0: float, t: float, cant: int, scale: float, show_field: bool):
+    """
+    Retorna una gráfica del modelo de crecimiento exponencial con su campo vectorial (opcional).
+
+    Parámetros:
+    -------
+    - N0: Población inicial.
+    - r: Tasa de crecimiento exponencial.
+    - t0: Tiempo inicial.
+    - t: Tiempo final.
+    - cant: Cantidad de particiones para el eje temporal y espacial.
+    - scale: Tamaño del vector del campo vectorial.
+    - show_field: Bool que indica si se debe mostrar el campo de vectores.
+    """
+
+    # Solución exacta y campo del modelo de crecimiento exponencial
+    datos = calcular_crecimiento_exponencial(N0, r, t0, t, cant)
+    t_values, funcion = datos['t'], datos['solucion']
+    T, N, dN_dt = datos['malla_t'], datos['malla_y'], datos['pendiente']
+
+    # Trazas de la gráfica
+    trazas = []
+
+    # Añadir el campo vectorial solo si show_field es True
+    if show_field:
+        # Campo vectorial: dN/dt (componente vertical)
+        U = np.ones_like(T)  # Componente en t (horizontal)
+        V = dN_dt  # Componente en N (vertical)
+
+        # Escalar los vectores para que se ajusten a la escala del gráfico y se visualicen bien
+        trazas.append(crear_campo_vectores(
+            T, N, U, V,
+            scale=scale,
+            line=dict(color='black', width=1),
+            showlegend=False
+        ))
+
+    # Crear la función de crecimiento exponencial (la solución exacta)
+    trazas.append(traza(
+        'scatter',
+        x=t_values,
+        y=funcion,
+        line=dict(color='blue'),
+        name='Crecimiento Exponencial'
+    ))
+
+    # Etiquetas y contorno de la gráfica (con el campo, el cursor muestra el vector más cercano)
+    return figura(trazas, layout_modelo(
+        {
+            'text': 'Campo de vectores de dN/dt = rN' if show_field else 'Crecimiento Exponencial',
+            'x': 0.5,
+            'y': 0.92,
+            'xanchor': 'center'
+        },
+        'Tiempo (t)',
+        'Población (N)',
+        rango_x=[0, t],  # Limitar el eje x a partir de 0 hasta t final
+        hovermode='closest' if show_field else None
+    ))
+
+# Función para el modelo SIR cambiante
+@cache_figuras
+def modelo_SIR_cambiante(N: float, I0: float, R0: float, t: int, beta: float, gamma: float, cant: int, ventana: tuple = None):
+    """
+    Retorna una gráfica del modelo SIR.
+
+    La solución se calcula a resolución completa (todos los pasos del integrador) y cada
+    curva se reduce con LTTB a lo más `cant` puntos, así horizontes largos no envían
+    cientos de miles de puntos al navegador.
+
+    Parámetros:
+    -------
+    - N: Población total.
+    - I0: Infectados iniciales.
+    - R0: Recuperados iniciales.
+    - t: Tiempo total de simulación.
+    - beta: Tasa de transmisión.
+    - gamma: Tasa de recuperación.
+    - cant: Cantidad máxima de puntos por curva.
+    - ventana: Intervalo (t_min, t_max) visible; solo se grafica esa parte (None para todo).
+    """
+
+    # Solución numérica del modelo SIR a resolución completa (Runge-Kutta adaptativo)
+    datos = trayectoria_SIR(N, I0, R0, t, beta, gamma)
+    t_values, S, I, R = recortar(datos['t'], ventana, datos['S'], datos['I'], datos['R'])
+
+    # Cada curva con sus propios puntos LTTB
+    curvas = [submuestrear(t_values, valores, cant) for valores in (S, I, R)]
+
+    return figura_SIR(curvas, list(ventana) if ventana else [0, t])
+
+def figura_SIR(curvas, rango):
+    """
+    Retorna la gráfica del modelo SIR con las curvas ya calculadas (la usan
+    `modelo_SIR_cambiante` y el modo de transmisión de la página 5).
+
+    Parámetros:
+    -------
+    - curvas: Lista [(t, S), (t, I), (t, R)] con los puntos de cada curva.
+    - rango: Rango [t_min, t_max] del eje x.
+    """
+
+    # Trazas para S, I y R
+    trazas = [
+        traza('scatter', x=x, y=y, mode='lines', name=nombre, line=dict(color=color))
+        for (x, y), nombre, color in zip(curvas, ('Susceptibles', 'Infectados', 'Recuperados'), ('green', 'red', 'blue'))
+    ]
+
+    # Etiquetas y contorno; el eje x limitado a la ventana o de 0 hasta t final
+    return figura(trazas, layout_modelo('Modelo SIR: Dinámica de Población', 'Tiempo (t)', 'Número de Individuos', rango_x=rango))
+
+@cache_figuras
+def modelo_SIR_estocastico(N: float, I0: float, R0: float, t: int, beta: float, gamma: float, replicas: int, metodo: str, cant: int):
+    """
+    Retorna una gráfica del modelo SIR estocástico: la mediana de cada compartimento con
+    las bandas de los percentiles 25-75 y 5-95 de las réplicas, y la probabilidad de extinción en el título.
+
+    Parámetros:
+    -------
+    - N: Población total.
+    - I0: Infectados iniciales.
+    - R0: Recuperados iniciales.
+    - t: Tiempo total de simulación.
+    - beta: Tasa de transmisión.
+    - gamma: Tasa de recuperación.
+    - replicas: Cantidad de réplicas simuladas.
+    - metodo: 'tau' (tau-leaping) o 'gillespie' (exacto; con poblaciones grandes se usa tau-leaping y se avisa en el título).
+    - cant: Cantidad de puntos en el eje temporal.
+    """
+
+    # Gillespie simula cada infección y recuperación: con poblaciones grandes tardaría minutos
+    aviso = ''
+    if metodo == 'gillespie' and not admite_gillespie(N, I0, R0, replicas):
+        metodo, aviso = 'tau', '<br>Tau-leaping: Gillespie sería demasiado lento con esta población y réplicas'
+
+    # Resumen de las réplicas (percentiles por tiempo)
+    datos = resumen_SIR_estocastico(N, I0, R0, t, beta, gamma, replicas, metodo, cant)
+    t_values = datos['t']
+
+    # Para cada compartimento: banda 5-95, banda 25-75 y mediana (las bandas rellenan hasta la traza anterior)
+    trazas = []
+    for clave, nombre, color in (('S', 'Susceptibles', '0, 128, 0'), ('I', 'Infectados', '255, 0, 0'), ('R', 'Recuperados', '0, 0, 255')):
+        p5, p25, p50, p75, p95 = datos[clave]
+        for inferior, superior, opacidad in ((p5, p95, 0.15), (p25, p75, 0.3)):
+            trazas.append(traza('scatter', x=t_values, y=inferior, mode='lines', line=dict(width=0), legendgroup=clave, showlegend=False, hoverinfo='skip'))
+            trazas.append(traza('scatter', x=t_values, y=superior, mode='lines', line=dict(width=0), fill='tonexty', fillcolor=f'rgba({color}, {opacidad})', legendgroup=clave, showlegend=False, hoverinfo='skip'))
+        trazas.append(traza('scatter', x=t_values, y=p50, mode='lines', name=f'{nombre} (mediana)', legendgroup=clave, line=dict(color=f'rgb({color})')))
+
+    # Probabilidad de que el brote se extinga sin crecer (simulada y aproximación teórica)
+    titulo = (f'Modelo SIR estocástico ({replicas} réplicas): P(extinción) = {float(datos["extincion"]):.2f}'
+              f' (teórica {float(datos["extincion_teorica"]):.2f}){aviso}')
+
+    # Etiquetas y contorno; el eje x desde 0 hasta t final
+    return figura(trazas, layout_modelo(titulo, 'Tiempo (t)', 'Número de Individuos', rango_x=[0, t]))
+
+# Función para el modelo Lotka-Volterra
+@cache_figuras
+def modelo_lotka_volterra(alpha: float, beta: float, delta: float, gamma: float, x0: float, y0: float, t: int, cant: int, ventana: tuple = None, metodo: str = 'dopri5', paso: float = None):
+    """
+    Retorna una gráfica interactiva del modelo Lotka-Volterra.
+
+    Como en `modelo_SIR_cambiante`, cada curva se reduce con LTTB a lo más `cant` puntos.
+    Con un `metodo` simpléctico (ver `trayectoria_lotka_volterra`) las órbitas siguen cerradas
+    después de miles de períodos.
+
+    Parámetros:
+    -------
+    - alpha: Tasa de crecimiento de presas.
+    - beta: Tasa de depredación.
+    - delta: Tasa de crecimiento de depredadores.
+    - gamma: Tasa de mortalidad de depredadores.
+    - x0: Población inicial de presas.
+    - y0: Población inicial de depredadores.
+    - t: Tiempo total de simulación.
+    - cant: Cantidad máxima de puntos por curva.
+    - ventana: Intervalo (t_min, t_max) visible; solo se grafica esa parte (None para todo).
+    - metodo: 'dopri5' (Runge-Kutta adaptativo), 'verlet', 'yoshida4' o 'yoshida6' (simplécticos).
+    - paso: Paso de los métodos simplécticos (None para el de `paso_lotka_volterra`).
+    """
+
+    # Solución numérica del modelo Lotka-Volterra a resolución completa
+    datos = trayectoria_lotka_volterra(alpha, beta, delta, gamma, x0, y0, t, metodo, paso)
+    t_values, x, y = recortar(datos['t'], ventana, datos['x'], datos['y'])
+
+    # Cada curva con sus propios puntos LTTB
+    curvas = [submuestrear(t_values, valores, cant) for valores in (x, y)]
+
+    return figura_lotka_volterra(curvas, list(ventana) if ventana else [0, t])
+
+def figura_lotka_volterra(curvas, rango):
+    """
+    Retorna la gráfica del modelo Lotka-Volterra con las curvas ya calculadas (la usan
+    `modelo_lotka_volterra` y el modo de transmisión de la página 6).
+
+    Parámetros:
+    -------
+    - curvas: Lista [(t, presas), (t, depredadores)] con los puntos de cada curva.
+    - rango: Rango [t_min, t_max] del eje x.
+    """
+
+    # Trazas de presas y depredadores
+    trazas = [
+        traza('scatter', x=t_curva, y=curva, mode='lines', name=nombre, line=dict(color=color))
+        for (t_curva, curva), nombre, color in zip(curvas, ('Presas', 'Depredadores'), ('green', 'red'))
+    ]
+
+    # Etiquetas (sin contorno en los ejes)
+    return figura(trazas, layout_modelo('Modelo Lotka-Volterra', 'Tiempo (t)', 'Población', contorno=False, rango_x=rango))
+
+# Función para el retrato de fase del modelo Lotka-Volterra
+@cache_figuras
+def retrato_fase_lotka_volterra(alpha: float, beta: float, delta: float, gamma: float, orbitas: int, extension: float, t: float, cant: int, mallado: int, capas: tuple = ('campo', 'nulclinas', 'equilibrios')):
+    """
+    Retorna el retrato de fase del modelo Lotka-Volterra: una familia de órbitas que parten de una
+    malla de condiciones iniciales, con campo de direcciones, nulclinas y equilibrios opcionales.
+
+    Las órbitas cuya cantidad conservada V deriva más de `TOLERANCIA_CONSERVADA` (ver
+    `orbitas_lotka_volterra`) se dibujan aparte, en rojo, y el título indica la deriva máxima.
+
+    Parámetros:
+    -------
+    - alpha, beta, delta, gamma: Parámetros del modelo.
+    - orbitas: Condiciones iniciales por eje (orbitas x orbitas órbitas).
+    - extension: Tamaño de la región graficada en múltiplos del equilibrio (x*, y*).
+    - t: Tiempo total de cada órbita.
+    - cant: Cantidad de puntos de cada órbita.
+    - mallado: Flechas por eje del campo de direcciones.
+    - capas: Elementos adicionales a mostrar: 'campo', 'nulclinas' y/o 'equilibrios'.
+    """
+
+    # Todas las órbitas en una sola integración
+    datos = orbitas_lotka_volterra(alpha, beta, delta, gamma, orbitas, extension, t, cant)
+    x_eq, y_eq = gamma / delta, alpha / beta
+    ancho, alto = extension * x_eq, extension * y_eq
+
+    trazas = []
+
+    # Campo de direcciones: flechas del mismo largo en pantalla (se normalizan con la región en [0, 1]²)
+    if 'campo' in capas:
+        X, Y = np.meshgrid(np.linspace(0, ancho, mallado), np.linspace(0, alto, mallado))
+        U, V = np.moveaxis(rhs_lotka_volterra(alpha, beta, delta, gamma)(0, np.stack((X, Y), axis=-1)), -1, 0)
+        flechas_x, flechas_y = coordenadas_campo_vectores(X / ancho, Y / alto, U / ancho, V / alto, scale=0.6 / mallado, normalizar=True)
+        trazas.append(traza('scatter', x=flechas_x * ancho, y=flechas_y * alto, mode='lines', line=dict(color='lightgray', width=1), hoverinfo='skip', showlegend=False))
+
+    # Nulclinas: dx/dt = 0 en y = y*, dy/dt = 0 en x = x* (además de los ejes)
+    if 'nulclinas' in capas:
+        trazas.append(traza('scatter', x=[0, ancho], y=[y_eq, y_eq], mode='lines', name='dx/dt = 0', line=dict(color='green', dash='dash')))
+        trazas.append(traza('scatter', x=[x_eq, x_eq], y=[0, alto], mode='lines', name='dy/dt = 0', line=dict(color='red', dash='dash')))
+
+    # Órbitas en una sola traza por grupo, separadas por NaN (la de imprecisas puede quedar vacía)
+    imprecisas = datos['deriva'] > TOLERANCIA_CONSERVADA
+    for seleccion, nombre, color in ((~imprecisas, 'Órbitas', 'royalblue'), (imprecisas, 'Órbitas imprecisas', 'crimson')):
+        separador = np.full((int(seleccion.sum()), 1), np.nan)
+        trazas.append(traza(
+            'scattergl',
+            x=np.hstack((datos['x'][seleccion], separador)).ravel(),
+            y=np.hstack((datos['y'][seleccion], separador)).ravel(),
+            mode='lines',
+            name=nombre,
+            line=dict(color=color, width=1),
+            hoverinfo='skip'
+        ))
+
+    # Condiciones iniciales de la malla
+    trazas.append(traza('scattergl', x=datos['x0'], y=datos['y0'], mode='markers', name='Condiciones iniciales', marker=dict(color='black', size=3)))
+
+    # Equilibrios: extinción y coexistencia
+    if 'equilibrios' in capas:
+        trazas.append(traza('scatter', x=[0, x_eq], y=[0, y_eq], mode='markers', name='Equilibrios', marker=dict(color='orange', size=10, symbol='x')))
+
+    titulo = f'Retrato de fase de Lotka-Volterra ({datos["x0"].size} órbitas): deriva máxima de V = {float(np.max(datos["deriva"])):.1e}'
+    if imprecisas.any():
+        titulo += f' ({int(imprecisas.sum())} imprecisas)'
+
+    # Ejes con la región de la malla; x e y con su propia escala
+    return figura(trazas, layout(
+        titulo,
+        eje('Presas (x)', range=[0, ancho]),
+        eje('Depredadores (y)', range=[0, alto]),
+        width=800,
+        height=700,
+        margin=MARGEN,
+        legend=LEYENDA,
+        hovermode='closest'
+    ))
+
+# Función para el barrido de parámetros del modelo SIR
+@cache_figuras
+def modelo_SIR_barrido(N: float, I0: float, R0: float, t: int, beta_min: float, beta_max: float, gamma_min: float, gamma_max: float, resolucion: int):
+    """
+    Retorna una gráfica con mapas de calor del modelo SIR sobre el plano beta-gamma:
+    pico de infectados, tiempo del pico y tamaño final de la epidemia.
+
+    Parámetros:
+    -------
+    - N: Población total.
+    - I0: Infectados iniciales.
+    - R0: Recuperados iniciales.
+    - t: Tiempo total de simulación.
+    - beta_min, beta_max: Rango de la tasa de transmisión.
+    - gamma_min, gamma_max: Rango de la tasa de recuperación.
+    - resolucion: Cantidad de valores de beta y de gamma (resolucion x resolucion simulaciones).
+    """
+
+    # Malla de parámetros (filas: gamma, columnas: beta)
+    beta_values = np.linspace(beta_min, beta_max, resolucion)
+    gamma_values = np.linspace(gamma_min, gamma_max, resolucion)
+    B, G = np.meshgrid(beta_values, gamma_values)
+
+    # Todas las simulaciones a la vez
+    resumen = barrido_SIR(B, G, I0, N, R0, t)
+
+    mapas = [
+        ('pico_infectados', 'Pico de infectados'),
+        ('tiempo_pico', 'Tiempo del pico (t)'),
+        ('tamano_final', 'Tamaño final')
+    ]
+
+    # Ejes, dominios y títulos de las tres subgráficas (se calculan una sola vez)
+    base = subplots(len(mapas), 0.06, tuple(titulo for _, titulo in mapas))
+
+    # Un mapa de calor por resumen, con su barra de color a la altura de su subgráfica
+    trazas = []
+    ejes = {}
+    for fila, (clave, titulo) in enumerate(mapas, start=1):
+        sufijo = '' if fila == 1 else str(fila)
+        dominio = base['yaxis' + sufijo]['domain']
+        trazas.append(traza(
+            'heatmap',
+            x=beta_values,
+            y=gamma_values,
+            z=resumen[clave],
+            name=titulo,
+            colorscale=escala_colores('Viridis'),
+            colorbar=dict(y=(dominio[0] + dominio[1]) / 2, len=dominio[1] - dominio[0]),
+            xaxis='x' + sufijo,
+            yaxis='y' + sufijo
+        ))
+
+        # Contorno a la gráfica; gamma en cada eje y, beta solo en el eje x de abajo
+        ejes['xaxis' + sufijo] = dict(base['xaxis' + sufijo], mirror=True, showline=True, linecolor='green', showgrid=False)
+        ejes['yaxis' + sufijo] = dict(base['yaxis' + sufijo], title={'text': 'gamma'}, mirror=True, showline=True, linecolor='green', showgrid=False)
+    ejes['xaxis' + sufijo]['title'] = {'text': 'beta'}
+
+    # Etiquetas para la gráfica
+    return figura(trazas, layout(
+        'Modelo SIR: Barrido de Parámetros',
+        annotations=base['annotations'],
+        height=1000,
+        width=800,
+        margin=MARGEN,
+        **ejes
+    ))
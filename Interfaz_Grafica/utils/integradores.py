@@ -0,0 +1,417 @@
+# Librerias
+import functools
+import numpy as np
+
+
+# Coeficientes de Dormand-Prince 5(4)
+
+C_DP = np.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+A_DP = [
+    np.array([]),
+    np.array([1/5]),
+    np.array([3/40, 9/40]),
+    np.array([44/45, -56/15, 32/9]),
+    np.array([19372/6561, -25360/2187, 64448/6561, -212/729]),
+    np.array([9017/3168, -355/33, 46732/5247, 49/176, -5103/18656])
+]
+B_DP = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+
+# Diferencia entre la solución de orden 5 y la de orden 4 (estimación del error)
+E_DP = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+
+# Polinomio de salida densa (interpolación de orden 4 dentro de cada paso)
+P_DP = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423]
+])
+
+# Composiciones de Yoshida (1990): pasos de Störmer-Verlet con estos pesos dan métodos de
+# orden 4 (tres pasos) y 6 (siete pasos, solución A)
+YOSHIDA_1 = 1 / (2 - 2 ** (1 / 3))
+YOSHIDA_0 = 1 - 2 * YOSHIDA_1
+YOSHIDA_6 = (0.784513610477560, 0.235573213359357, -1.17767998417887)
+COMPOSICIONES = {
+    2: (1.0,),
+    4: (YOSHIDA_1, YOSHIDA_0, YOSHIDA_1),
+    6: YOSHIDA_6 + (1 - 2 * sum(YOSHIDA_6),) + YOSHIDA_6[::-1]
+}
+
+# Rosenbrock 2(3) de Shampine y Reichelt (1997, `ode23s` de MATLAB): L-estable, con
+# W = I - h D J en las tres etapas
+D_ROS = 1 / (2 + np.sqrt(2))
+E32_ROS = 6 + np.sqrt(2)
+
+
+# Funciones
+
+def _sin_avance(t_values, y0):
+    """
+    Retorna el bloque (t_values, y0 repetido) de una integración de duración cero
+    (t_values[-1] == t_values[0]): la solución es constante, como con `odeint`.
+    """
+    y = np.array(y0, dtype=float)
+    return t_values, np.repeat(y[np.newaxis], t_values.size, axis=0)
+
+def _norma(error, escala):
+    """
+    Norma RMS del error relativa a la escala de tolerancias. Con varios sistemas a la vez
+    (forma miembros x compartimentos) se toma la de cada sistema y la mayor: así cada miembro
+    cumple rtol/atol como si se integrara solo, sin que los demás diluyan su error.
+    """
+    return np.sqrt(np.mean((error / escala) ** 2, axis=-1)).max()
+
+def _paso_inicial(f, t0, y0, f0, rtol, atol):
+    """
+    Estima el primer paso a partir de las derivadas (Hairer, Nørsett y Wanner).
+    """
+    escala = atol + np.abs(y0) * rtol
+    d0 = _norma(y0, escala)
+    d1 = _norma(f0, escala)
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+
+    f1 = f(t0 + h0, y0 + h0 * f0)
+    d2 = _norma(f1 - f0, escala) / h0
+
+    if max(d1, d2) <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / 5)
+
+    return min(100 * h0, h1)
+
+def dormand_prince(f, y0, t_values, rtol: float = 1e-6, atol: float = 1e-9, h0: float = None, max_pasos: int = 100000, incluir_pasos: bool = False):
+    """
+    Generador que integra y' = f(t, y) con Runge-Kutta Dormand-Prince 5(4)
+    con control de error, entregando la salida densa paso a paso.
+
+    Cada vez que un paso aceptado cubre puntos de `t_values` se entrega el
+    bloque `(t_bloque, y_bloque)` interpolado en esos puntos.
+
+    Parámetros:
+    -------
+    - f: Lado derecho f(t, y). Recibe y con la forma de `y0` y debe retornar la misma forma,
+      por lo que `y0` puede ser un arreglo de varios sistemas a la vez (p. ej. miembros x compartimentos).
+      Si tiene el atributo `nucleo` se integra con el núcleo compilado de `nucleos.py` (si Numba está instalado).
+    - y0: Condición inicial en t_values[0].
+    - t_values: Tiempos (crecientes) donde se quiere la solución.
+    - rtol: Tolerancia relativa.
+    - atol: Tolerancia absoluta.
+    - h0: Paso inicial (si es None se estima).
+    - max_pasos: Cantidad máxima de pasos (aceptados y rechazados) antes de abortar.
+    - incluir_pasos: Si es True también se entrega el final de cada paso aceptado (la resolución
+      interna del integrador), intercalado en orden con los puntos de `t_values`.
+    """
+
+    # Sin tiempo que integrar no hay paso que estimar (ni en el núcleo compilado)
+    t_values = np.asarray(t_values, dtype=float)
+    if t_values[-1] == t_values[0]:
+        yield _sin_avance(t_values, y0)
+        return
+
+    # Modelos con núcleo compilado (Numba): el mismo método sin pasar por el intérprete en cada paso
+    if getattr(f, 'nucleo', None) is not None:
+        from . import nucleos
+        if nucleos.admite(f, y0):
+            yield from nucleos.dormand_prince_nucleo(f, y0, t_values, rtol, atol, h0, max_pasos, incluir_pasos)
+            return
+
+    y = np.array(y0, dtype=float)
+    n = t_values.size
+
+    t = t_values[0]
+    t_final = t_values[-1]
+    yield t_values[:1], y[np.newaxis].copy()
+
+    # Etapas del método (la séptima es f en el nuevo punto, reutilizada en el siguiente paso)
+    K = np.empty((7,) + y.shape)
+    K[0] = f(t, y)
+    h = h0 if h0 is not None else _paso_inicial(f, t, y, K[0], rtol, atol)
+
+    siguiente = 1
+    pasos = 0
+
+    while siguiente < n:
+        pasos += 1
+        if pasos > max_pasos:
+            raise RuntimeError(f'Se superó el máximo de {max_pasos} pasos en t = {t}')
+
+        ultimo = h >= t_final - t
+        if ultimo:
+            h = t_final - t
+
+        # Etapas de Runge-Kutta
+        for i in range(1, 6):
+            K[i] = f(t + C_DP[i] * h, y + h * np.tensordot(A_DP[i], K[:i], axes=1))
+
+        y_nuevo = y + h * np.tensordot(B_DP, K[:6], axes=1)
+        K[6] = f(t + h, y_nuevo)
+
+        # Error local relativo a las tolerancias
+        escala = atol + np.maximum(np.abs(y), np.abs(y_nuevo)) * rtol
+        error = _norma(h * np.tensordot(E_DP, K, axes=1), escala)
+        if not np.isfinite(error):
+            error = np.inf
+
+        if error <= 1:
+            t_nuevo = t_final if ultimo else t + h
+
+            # Interpolar en los puntos de salida que cubre este paso
+            fin = n if ultimo else np.searchsorted(t_values, t_nuevo, side='right')
+            if fin > siguiente:
+                x = (t_values[siguiente:fin] - t) / h
+                potencias = np.cumprod(np.repeat(x[:, np.newaxis], 4, axis=1), axis=1)
+                Q = np.tensordot(P_DP.T, K, axes=1)
+                t_bloque, y_bloque = t_values[siguiente:fin], y + h * np.tensordot(potencias, Q, axes=1)
+                siguiente = fin
+            else:
+                t_bloque, y_bloque = t_values[:0], np.empty((0,) + y.shape)
+
+            # Final del paso, si no coincide con el último punto de salida
+            if incluir_pasos and not ultimo and (t_bloque.size == 0 or t_bloque[-1] < t_nuevo):
+                t_bloque = np.append(t_bloque, t_nuevo)
+                y_bloque = np.concatenate((y_bloque, y_nuevo[np.newaxis]))
+
+            if t_bloque.size:
+                yield t_bloque, y_bloque
+
+            t, y = t_nuevo, y_nuevo
+            K[0] = K[6]
+            factor = 10 if error == 0 else min(10, 0.9 * error ** -0.2)
+        else:
+            factor = max(0.2, 0.9 * error ** -0.2) if np.isfinite(error) else 0.2
+
+        h *= factor
+        if h < 1e-12 * max(1, abs(t)):
+            raise RuntimeError(f'El paso se volvió demasiado pequeño en t = {t}')
+
+def verlet_separable(f, y0, t_values, paso: float = None, orden: int = 2, max_pasos: int = 10000000, incluir_pasos: bool = False):
+    """
+    Generador que integra y' = f(t, y) con un método simpléctico de paso fijo: Störmer-Verlet
+    (orden 2) o sus composiciones de Yoshida (orden 4 y 6). Entrega la salida en bloques como `dormand_prince`.
+
+    Sirve para sistemas que en otras coordenadas z son hamiltonianos separables,
+    H(u, v) = T(u) + U(v): cada mitad del campo se integra de forma exacta y la composición
+    conserva una versión cercana de H, así que la energía no deriva aunque el paso sea grande
+    (p. ej. Lotka-Volterra en coordenadas logarítmicas, ver `modelos.particion_lotka_volterra`).
+
+    Parámetros:
+    -------
+    - f: Lado derecho con el atributo `particion = (flujo_a, flujo_b, a_coordenadas, desde_coordenadas)`:
+      flujo(z, h) avanza z un tiempo h con solo una mitad del campo; a_coordenadas(y) y
+      desde_coordenadas(z) convierten entre las variables del modelo y las del hamiltoniano.
+      Vectorizado como `dormand_prince`; con el atributo `nucleo` se usa el núcleo compilado de `nucleos.py`.
+    - y0: Condición inicial en t_values[0].
+    - t_values: Tiempos (crecientes) donde se quiere la solución.
+    - paso: Paso máximo; cada intervalo entre puntos de salida se divide en pasos iguales
+      (None para un paso por intervalo).
+    - orden: 2 (Störmer-Verlet), 4 o 6 (Yoshida), ver `COMPOSICIONES`.
+    - max_pasos: Cantidad máxima de pasos antes de abortar.
+    - incluir_pasos: Si es True también se entrega el final de cada paso, como en `dormand_prince`.
+    """
+
+    if getattr(f, 'particion', None) is None:
+        raise ValueError('El método simpléctico necesita f con el atributo particion')
+    pesos = COMPOSICIONES[orden]
+
+    t_values = np.asarray(t_values, dtype=float)
+    if t_values[-1] == t_values[0]:
+        yield _sin_avance(t_values, y0)
+        return
+
+    # Modelos con núcleo compilado (Numba)
+    if getattr(f, 'nucleo', None) is not None:
+        from . import nucleos
+        if nucleos.admite_particion(f, y0):
+            yield from nucleos.verlet_nucleo(f, y0, t_values, paso, pesos, max_pasos, incluir_pasos)
+            return
+
+    flujo_a, flujo_b, a_coordenadas, desde_coordenadas = f.particion
+    y =  np.array(y0, dtype=float)
+    yield t_values[:1], y[np.newaxis].copy()
+
+    z = a_coordenadas(y)
+    pasos = 0
+    for t_inicio, t_fin in zip(t_values[:-1], t_values[1:]):
+        # Pasos iguales que terminan justo en el punto de salida
+        cantidad = max(1, int(np.ceil((t_fin - t_inicio) / paso - 1e-9))) if paso else 1
+        pasos += cantidad
+        if pasos > max_pasos:
+            raise RuntimeError(f'Se superó el máximo de {max_pasos} pasos en t = {t_inicio}')
+        h = (t_fin - t_inicio) / cantidad
+
+        bloque = []
+        for i in range(cantidad):
+            # Strang: medio flujo a, flujo b completo, medio flujo a (por cada peso de la composición)
+            for peso in pesos:
+                z = flujo_a(z, 0.5 * peso * h)
+                z = flujo_b(z, peso * h)
+                z = flujo_a(z, 0.5 * peso * h)
+            if incluir_pasos or i == cantidad - 1:
+                bloque.append(desde_coordenadas(z))
+
+        t_bloque = t_inicio + h * np.arange(cantidad - len(bloque) + 1, cantidad + 1)
+        t_bloque[-1] = t_fin
+        yield t_bloque, np.stack(bloque)
+
+def rosenbrock(f, y0, t_values, rtol: float = 1e-4, atol: float = 1e-7, h0: float = None, max_pasos: int = 100000, incluir_pasos: bool = False):
+    """
+    Generador que integra y' = f(t, y) con el método de Rosenbrock 2(3) (ver `D_ROS`), para
+    sistemas rígidos. Entrega la salida en bloques como `dormand_prince`.
+
+    Es un método implícito linealizado: en lugar de iterar Newton en cada paso resuelve tres
+    sistemas lineales con la misma matriz W = I - h D J, con J el Jacobiano exacto de f. Al ser
+    L-estable, el paso lo fija la precisión y no las escalas rápidas del sistema, que con
+    `dormand_prince` obligan a pasos diminutos aunque la solución ya sea suave.
+
+    Parámetros:
+    -------
+    - f: Lado derecho f(t, y) con el atributo `jacobiano`, una función (t, y) -> matriz n x n
+      (p. ej. compilada desde sympy, ver `simbolico.AnalisisSistema.rhs`). y0 debe ser un vector.
+    - y0: Condición inicial en t_values[0].
+    - t_values: Tiempos (crecientes) donde se quiere la solución.
+    - rtol: Tolerancia relativa (el método es de orden 2: conviene menos exigente que en `dormand_prince`).
+    - atol: Tolerancia absoluta.
+    - h0: Paso inicial (si es None se estima).
+    - max_pasos: Cantidad máxima de pasos (aceptados y rechazados) antes de abortar.
+    - incluir_pasos: Si es True también se entrega el final de cada paso aceptado, como en `dormand_prince`.
+    """
+
+    if getattr(f, 'jacobiano', None) is None:
+        raise ValueError('El método de Rosenbrock necesita f con el atributo jacobiano')
+
+    t_values = np.asarray(t_values, dtype=float)
+    y = np.array(y0, dtype=float)
+    if y.ndim != 1:
+        raise ValueError('El método de Rosenbrock integra un solo sistema (y0 debe ser un vector)')
+    if t_values[-1] == t_values[0]:
+        yield _sin_avance(t_values, y0)
+        return
+    n = t_values.size
+    identidad = np.eye(y.size)
+
+    t = t_values[0]
+    t_final = t_values[-1]
+    yield t_values[:1], y[np.newaxis].copy()
+
+    F0 = f(t, y)
+    h = h0 if h0 is not None else _paso_inicial(f, t, y, F0, rtol, atol)
+
+    siguiente = 1
+    pasos = 0
+    J = None
+
+    while siguiente < n:
+        pasos += 1
+        if pasos > max_pasos:
+            raise RuntimeError(f'Se superó el máximo de {max_pasos} pasos en t = {t}')
+
+        ultimo = h >= t_final - t
+        if ultimo:
+            h = t_final - t
+
+        # Jacobiano y derivada respecto de t (por diferencias) en el punto actual; un paso
+        # rechazado los reutiliza
+        if J is None:
+            J = np.asarray(f.jacobiano(t, y), dtype=float)
+            delta = np.sqrt(np.finfo(float).eps) * max(1.0, abs(t))
+            T = (f(t + delta, y) - F0) / delta
+
+        W = identidad - h * D_ROS * J
+
+        try:
+            k1 = np.linalg.solve(W, F0 + h * D_ROS * T)
+            F1 = f(t + 0.5 * h, y + 0.5 * h * k1)
+            k2 = np.linalg.solve(W, F1 - k1) + k1
+            y_nuevo = y + h * k2
+            F2 = f(t + h, y_nuevo)
+            k3 = np.linalg.solve(W, F2 - E32_ROS * (k2 - F1) - 2 * (k1 - F0) + h * D_ROS * T)
+            escala = atol + np.maximum(np.abs(y), np.abs(y_nuevo)) * rtol
+            error = _norma(h / 6 * (k1 - 2 * k2 + k3), escala)
+        except np.linalg.LinAlgError:
+            error = np.inf
+        if not np.isfinite(error):
+            error = np.inf
+
+        if error <= 1:
+            t_nuevo = t_final if ultimo else t + h
+
+            # Interpolar en los puntos de salida que cubre este paso (salida densa de orden 2)
+            fin = n if ultimo else np.searchsorted(t_values, t_nuevo, side='right')
+            if fin > siguiente:
+                s = ((t_values[siguiente:fin] - t) / h)[:, np.newaxis]
+                t_bloque = t_values[siguiente:fin]
+                y_bloque = y + h * (s * (1 - s) * k1 + s * (s - 2 * D_ROS) * k2) / (1 - 2 * D_ROS)
+                siguiente = fin
+            else:
+                t_bloque, y_bloque = t_values[:0], np.empty((0,) + y.shape)
+
+            # Final del paso, si no coincide con el último punto de salida
+            if incluir_pasos and not ultimo and (t_bloque.size == 0 or t_bloque[-1] < t_nuevo):
+                t_bloque = np.append(t_bloque, t_nuevo)
+                y_bloque = np.concatenate((y_bloque, y_nuevo[np.newaxis]))
+
+            if t_bloque.size:
+                yield t_bloque, y_bloque
+
+            t, y = t_nuevo, y_nuevo
+            F0 = F2
+            J = None
+            factor = 5 if error == 0 else min(5, 0.8 * error ** (-1 / 3))
+        else:
+            factor = max(0.2, 0.8 * error ** (-1 / 3)) if np.isfinite(error) else 0.2
+
+        h *= factor
+        if h < 1e-12 * max(1, abs(t)):
+            raise RuntimeError(f'El paso se volvió demasiado pequeño en t = {t}')
+
+
+METODOS = {
+    'dopri5': dormand_prince,
+    'rosenbrock': rosenbrock,
+    'verlet': functools.partial(verlet_separable, orden=2),
+    'yoshida4': functools.partial(verlet_separable, orden=4),
+    'yoshida6': functools.partial(verlet_separable, orden=6)
+}
+
+def integrador(metodo: str):
+    """
+    Retorna el generador del integrador `metodo` de `METODOS` (ValueError si no existe).
+    """
+    if metodo not in METODOS:
+        raise ValueError(f'Método desconocido: {metodo!r} (opciones: {", ".join(METODOS)})')
+    return METODOS[metodo]
+
+def integrar_edo(f, y0, t_values, metodo: str = 'dopri5', **opciones):
+    """
+    Retorna la solución de y' = f(t, y) evaluada en `t_values`,
+    con forma (len(t_values),) + forma de y0.
+
+    Parámetros:
+    -------
+    - f: Lado derecho f(t, y), vectorizado sobre la forma de y0.
+    - y0: Condición inicial en t_values[0].
+    - t_values: Tiempos (crecientes) donde se quiere la solución.
+    - metodo: Nombre del integrador en `METODOS`.
+    - opciones: Argumentos del integrador (rtol, atol, h0, max_pasos, ...).
+    """
+
+    bloques = [y for _, y in integrador(metodo)(f, y0, t_values, **opciones)]
+    return np.concatenate(bloques)
+
+def integrar_edo_pasos(f, y0, t_values, metodo: str = 'dopri5', **opciones):
+    """
+    Retorna (t, y) con la solución de y' = f(t, y) en los puntos de `t_values` y además
+    en el final de cada paso interno del integrador (la resolución completa de la solución).
+
+    Parámetros:
+    -------
+    - f, y0, t_values, metodo, opciones: Ver `integrar_edo`.
+    """
+
+    bloques = list(integrador(metodo)(f, y0, t_values, incluir_pasos=True, **opciones))
+    return np.concatenate([t for t, _ in bloques]), np.concatenate([y for _, y in bloques])
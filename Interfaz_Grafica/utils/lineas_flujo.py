@@ -0,0 +1,179 @@
+# Librerias
+import math
+import numpy as np
+from .figuras import traza # Traza como diccionario
+
+
+# Funciones
+
+def _integrar_semillas(campo, semillas, sentido, dueno, ocupacion, limites, paso, max_pasos):
+    """
+    Integra todas las semillas a la vez (RK2 del punto medio sobre el campo normalizado,
+    en coordenadas de la grilla de ocupación) y marca en `ocupacion` las celdas que recorre
+    cada línea. Una línea se detiene al salir del dominio, al llegar a un punto de equilibrio
+    o al entrar en una celda ocupada por otra línea (o por un tramo anterior de sí misma).
+
+    Retorna el arreglo (max_pasos + 1, n, 2) con las posiciones (NaN cuando la línea terminó)
+    y la cantidad de pasos dados por cada línea.
+    """
+
+    x_min, x_max, y_min, y_max = limites
+    ny, nx = ocupacion.shape
+    escala = np.array([(x_max - x_min) / nx, (y_max - y_min) / ny])
+    origen = np.array([x_min, y_min])
+
+    def velocidad(p, s):
+        # Velocidad en coordenadas de la grilla, de norma 1 (0 en los equilibrios)
+        u, v = campo(*(p * escala + origen).T)
+        w = np.stack((np.asarray(u, dtype=float) / escala[0], np.asarray(v, dtype=float) / escala[1]), axis=-1)
+        norma = np.hypot(w[:, 0], w[:, 1])
+        valida = np.isfinite(norma) & (norma > 1e-12)
+        w[valida] /= norma[valida, None]
+        w[~valida] = 0
+        return s * w, valida
+
+    n = len(semillas)
+    puntos = np.full((max_pasos + 1, n, 2), np.nan)
+    puntos[0] = semillas
+    pasos = np.zeros(n, dtype=int)
+
+    p = semillas.copy()
+    celda = np.floor(p).astype(int)
+    activas = np.arange(n)
+
+    for k in range(1, max_pasos + 1):
+        if activas.size == 0:
+            break
+
+        # Paso del punto medio
+        s = sentido[activas]
+        k1, valida_1 = velocidad(p[activas], s)
+        k2, valida_2 = velocidad(p[activas] + 0.5 * paso * k1, s)
+        nuevo = p[activas] + paso * k2
+
+        # Dentro del dominio y lejos de los equilibrios
+        sigue = valida_1 & valida_2 & (nuevo[:, 0] >= 0) & (nuevo[:, 0] < nx) & (nuevo[:, 1] >= 0) & (nuevo[:, 1] < ny)
+        nueva_celda = np.floor(np.where(sigue[:, None], nuevo, 0)).astype(int)
+        ix, iy = nueva_celda[:, 0], nueva_celda[:, 1]
+        misma = (ix == celda[activas, 0]) & (iy == celda[activas, 1])
+
+        # Al cambiar de celda solo se puede entrar a una libre
+        sigue &= misma | (ocupacion[iy, ix] == -1)
+
+        # Si dos líneas entran a la misma celda libre en el mismo paso, gana la primera
+        entran = np.flatnonzero(sigue & ~misma)
+        lineal = iy[entran] * nx + ix[entran]
+        _, primera = np.unique(lineal, return_index=True)
+        perdedoras = np.setdiff1d(np.arange(entran.size), primera)
+        sigue[entran[perdedoras]] = False
+
+        # Marcar las celdas nuevas y avanzar
+        entran = entran[primera]
+        ocupacion[iy[entran], ix[entran]] = dueno[activas[entran]]
+        activas = activas[sigue]
+        p[activas] = nuevo[sigue]
+        celda[activas] = nueva_celda[sigue]
+        puntos[k, activas] = nuevo[sigue]
+        pasos[activas] = k
+
+    return puntos * escala + origen, pasos
+
+def coordenadas_lineas_flujo(campo, x_lim, y_lim, densidad: float = 1.0, paso: float = 0.25, largo_min: float = 0.1, largo_max: float = 4.0):
+    """
+    Retorna las coordenadas (x, y) de las líneas de flujo de un campo de vectores,
+    separadas por NaN para dibujarse en una sola traza, y la lista de flechas
+    (x, y, u, v) que marcan el sentido de cada línea.
+
+    Como `matplotlib.pyplot.streamplot`, usa una grilla de ocupación de 30 x 30 celdas
+    (por `densidad`) y una línea no puede entrar a una celda que ya recorrió otra,
+    así las líneas quedan separadas de manera uniforme. Las semillas se integran todas
+    juntas con NumPy, en rondas de grillas de semillas cada vez más finas (primero
+    las líneas largas y luego las que rellenan los huecos).
+
+    Parámetros:
+    -------
+    - campo: Función (X, Y) -> (U, V) que acepta arreglos de NumPy.
+    - x_lim, y_lim: Límites (mínimo, máximo) del dominio.
+    - densidad: Factor de la cantidad de celdas por eje (más densidad, más líneas).
+    - paso: Tamaño del paso de integración en celdas.
+    - largo_min: Largo mínimo de una línea, como fracción del ancho de la grilla.
+    - largo_max: Largo máximo de cada mitad de línea, como fracción del ancho de la grilla.
+    """
+
+    nx = max(1, int(30 * densidad))
+    ny = nx
+    limites = (float(x_lim[0]), float(x_lim[1]), float(y_lim[0]), float(y_lim[1]))
+    ocupacion = np.full((ny, nx), -1, dtype=np.int64)
+    max_pasos = int(math.ceil(largo_max * nx / paso))
+
+    lineas = []
+    flechas = []
+    siguiente_id = 0
+
+    for salto in (4, 2, 1):
+        # Centros de las celdas libres de esta ronda
+        iy, ix = np.mgrid[salto // 2:ny:salto, salto // 2:nx:salto]
+        libres = ocupacion[iy, ix] == -1
+        if not libres.any():
+            continue
+        semillas = np.stack((ix[libres], iy[libres]), axis=-1) + 0.5
+        n = len(semillas)
+
+        # Cada semilla reserva su celda y se integra hacia adelante y hacia atrás
+        ids = np.arange(siguiente_id, siguiente_id + n)
+        siguiente_id += n
+        ocupacion[iy[libres], ix[libres]] = ids
+        dueno = np.concatenate((ids, ids))
+        sentido = np.concatenate((np.ones(n), -np.ones(n)))[:, None]
+        puntos, pasos = _integrar_semillas(campo, np.concatenate((semillas, semillas)), sentido, dueno, ocupacion, limites, paso, max_pasos)
+
+        # Línea completa: la mitad hacia atrás invertida y luego la mitad hacia adelante
+        adelante, atras = puntos[:, :n], puntos[:, n:]
+        total = pasos[:n] + pasos[n:]
+
+        # Las líneas demasiado cortas se descartan y liberan sus celdas
+        cortas = total * paso < largo_min * nx
+        ocupacion[np.isin(ocupacion, ids[cortas])] = -1
+
+        for j in np.flatnonzero(~cortas):
+            linea = np.concatenate((atras[pasos[n + j]:0:-1, j], adelante[:pasos[j] + 1, j]))
+            lineas.append(linea)
+
+            # Flecha en la mitad de la línea, en el sentido del flujo
+            medio = len(linea) // 2
+            flechas.append((*linea[medio - 1], *(linea[medio] - linea[medio - 1])))
+
+    if not lineas:
+        return np.array([]), np.array([]), np.empty((0, 4))
+
+    separador = np.full((1, 2), np.nan)
+    coordenadas = np.concatenate([c for linea in lineas for c in (linea, separador)])
+    return coordenadas[:, 0], coordenadas[:, 1], np.array(flechas)
+
+def crear_lineas_flujo(campo, x_lim, y_lim, densidad: float = 1.0, paso: float = 0.25, arrow_scale: float = 0.03, angle: float = math.pi / 9, **kwargs):
+    """
+    Retorna una única traza de dispersión (diccionario) con todas las líneas de flujo y una punta de
+    flecha en la mitad de cada línea. Sustituye a `matplotlib.pyplot.streamplot`.
+
+    Parámetros:
+    -------
+    - campo, x_lim, y_lim, densidad, paso: Ver `coordenadas_lineas_flujo`.
+    - arrow_scale: Largo de las puntas como fracción del ancho del dominio.
+    - angle: Apertura de la punta respecto a la línea (radianes).
+    - kwargs: Propiedades adicionales de la traza (line, name, showlegend, ...).
+    """
+
+    lineas_x, lineas_y, flechas = coordenadas_lineas_flujo(campo, x_lim, y_lim, densidad, paso)
+
+    if len(flechas):
+        # Puntas de flecha: (lado 1, fin, lado 2, NaN) con el largo fijo y el ángulo de la línea
+        x, y, u, v = flechas.T
+        largo = arrow_scale * (x_lim[1] - x_lim[0])
+        angulo = np.arctan2(v, u)
+        fin_x, fin_y = x + u, y + v
+        puntas_x = np.stack((fin_x - largo * np.cos(angulo + angle), fin_x, fin_x - largo * np.cos(angulo - angle), np.full_like(x, np.nan)), axis=-1)
+        puntas_y = np.stack((fin_y - largo * np.sin(angulo + angle), fin_y, fin_y - largo * np.sin(angulo - angle), np.full_like(y, np.nan)), axis=-1)
+        lineas_x = np.concatenate((lineas_x, puntas_x.ravel()))
+        lineas_y = np.concatenate((lineas_y, puntas_y.ravel()))
+
+    return traza('scatter', x=lineas_x, y=lineas_y, mode='lines', **kwargs)
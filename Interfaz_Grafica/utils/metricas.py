@@ -0,0 +1,394 @@
+# Librerias
+import bisect
+import contextlib
+import contextvars
+import functools
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+
+
+# Métricas de los callbacks de las páginas en formato de texto de Prometheus (ruta /metrics).
+# Solo usa la biblioteca estándar: `utils.cache` lo importa también fuera de la app (lote.py).
+# Cada llamada se mide completa y por etapas:
+# - calculo: funciones con `cache_trayectorias` (solución de los modelos), solo cuando no están en caché.
+# - figura: funciones con `cache_figuras` (construir la figura), sin contar el cálculo que hacen dentro.
+# - serializacion: el resto de la llamada (codificar los arreglos, armar el parche y el JSON de Dash).
+# Los callbacks en segundo plano calculan en otro proceso: sus peticiones (lanzar el trabajo y cada
+# consulta de progreso) se miden aparte, con etapa="consulta", y solo la primera cuenta como llamada.
+
+# Con varios procesos (workers de gunicorn) cada uno tiene su propio `REGISTRO` y /metrics lo responde
+# uno cualquiera. Con TM_METRICAS_DIR cada worker vuelca el suyo a un archivo de esa carpeta
+# (ver `compartir_metricas`) y /metrics suma los de todos, como el modo multiproceso de prometheus_client:
+# contadores e histogramas de todos los procesos (también de los que ya terminaron) y las cachés de los vivos.
+
+# Límites (segundos) de los buckets de los histogramas de tiempo
+LIMITES_SEGUNDOS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Nombre -> (tipo, ayuda) de cada métrica
+METRICAS = {
+    'tm_callback_segundos': ('histogram', 'Duración de los callbacks por página y etapa (total, calculo, figura, serializacion; consulta en los de segundo plano).'),
+    'tm_callback_llamadas_total': ('counter', 'Llamadas a los callbacks por página (sin las consultas de progreso de los de segundo plano).'),
+    'tm_callback_errores_total': ('counter', 'Callbacks que terminaron con una excepción, por página.'),
+    'tm_callback_bytes_total': ('counter', 'Bytes de las respuestas JSON de los callbacks, por página.'),
+    'tm_callback_superados_total': ('counter', 'Callbacks descartados antes de la figura porque la sesión ya pidió otros valores, por página.'),
+    'tm_cache_consultas_total': ('counter', 'Consultas a las cachés por página, caché y resultado (acierto, acierto_backend, fallo, compartido).'),
+    'tm_cache_entradas': ('gauge', 'Entradas guardadas en memoria en cada caché.'),
+    'tm_cache_bytes': ('gauge', 'Bytes ocupados en memoria por cada caché.')
+}
+
+
+class Histograma:
+    """
+    Histograma acumulable con límites fijos (como `prometheus_client.Histogram`).
+    """
+
+    def __init__(self, limites=LIMITES_SEGUNDOS):
+        self.limites = tuple(limites)
+        self.cuentas = [0] * (len(self.limites) + 1)
+        self.suma = 0.0
+
+    def observar(self, valor: float):
+        self.cuentas[bisect.bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+
+    def acumulado(self):
+        """
+        Retorna [(límite, cantidad de observaciones <= límite)], el último con límite infinito.
+        """
+        total = 0
+        resultado = []
+        for limite, cuenta in zip(self.limites + (math.inf,), self.cuentas):
+            total += cuenta
+            resultado.append((limite, total))
+        return resultado
+
+
+class Registro:
+    """
+    Contadores e histogramas con etiquetas, seguros entre hilos.
+    """
+
+    def __init__(self):
+        self._candado = threading.Lock()
+        self._contadores = {}
+        self._histogramas = {}
+
+    def contar(self, nombre: str, valor: float = 1, **etiquetas):
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        with self._candado:
+            self._contadores[clave] = self._contadores.get(clave, 0) + valor
+
+    def observar(self, nombre: str, valor: float, **etiquetas):
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        with self._candado:
+            if clave not in self._histogramas:
+                self._histogramas[clave] = Histograma()
+            self._histogramas[clave].observar(valor)
+
+    def limpiar(self):
+        with self._candado:
+            self._contadores.clear()
+            self._histogramas.clear()
+
+    def estado(self):
+        """
+        Retorna los contadores e histogramas como un diccionario serializable en JSON (ver `sumar`).
+        """
+        with self._candado:
+            return {
+                'contadores': [[nombre, etiquetas, valor] for (nombre, etiquetas), valor in self._contadores.items()],
+                'histogramas': [[nombre, etiquetas, h.cuentas, h.suma] for (nombre, etiquetas), h in self._histogramas.items()]
+            }
+
+    def sumar(self, estado):
+        """
+        Suma a este registro el `estado` de otro (p. ej. el de otro proceso).
+        """
+        with self._candado:
+            for nombre, etiquetas, valor in estado['contadores']:
+                clave = (nombre, tuple(map(tuple, etiquetas)))
+                self._contadores[clave] = self._contadores.get(clave, 0) + valor
+            for nombre, etiquetas, cuentas, suma in estado['histogramas']:
+                clave = (nombre, tuple(map(tuple, etiquetas)))
+                if clave not in self._histogramas:
+                    self._histogramas[clave] = Histograma()
+                histograma = self._histogramas[clave]
+                histograma.cuentas = [a + b for a, b in zip(histograma.cuentas, cuentas)]
+                histograma.suma += suma
+
+    def muestras(self):
+        """
+        Retorna un diccionario {métrica: [(muestra, etiquetas, valor), ...]} como las escribe
+        Prometheus (cada histograma en _bucket, _sum y _count), ordenado por etiquetas.
+        """
+        resultado = {}
+        with self._candado:
+            for (nombre, etiquetas), valor in sorted(self._contadores.items()):
+                resultado.setdefault(nombre, []).append((nombre, dict(etiquetas), valor))
+            for (nombre, etiquetas), histograma in sorted(self._histogramas.items(), key=lambda item: item[0]):
+                lista = resultado.setdefault(nombre, [])
+                etiquetas = dict(etiquetas)
+                for limite, cuenta in histograma.acumulado():
+                    lista.append((f'{nombre}_bucket', {**etiquetas, 'le': _numero(limite)}, cuenta))
+                lista.append((f'{nombre}_sum', etiquetas, histograma.suma))
+                lista.append((f'{nombre}_count', etiquetas, sum(histograma.cuentas)))
+        return resultado
+
+
+REGISTRO = Registro()
+
+# Carpeta donde este proceso vuelca sus métricas (None: solo las del proceso, ver `compartir_metricas`)
+_DIRECTORIO = None
+
+
+class Medicion:
+    """
+    Tiempos por etapa de una llamada a un callback (ver `medir_etapa`).
+    """
+
+    def __init__(self, pagina: str):
+        self.pagina = pagina
+        self.tiempos = {}
+        self.anidados = [0.0]  # Tiempo de las etapas medidas dentro de cada bloque abierto
+
+
+# Medición del callback que se está ejecutando en este hilo (None fuera de los callbacks)
+_MEDICION = contextvars.ContextVar('medicion', default=None)
+
+
+# Funciones
+
+def _numero(valor):
+    if valor == math.inf:
+        return '+Inf'
+    return str(valor) if isinstance(valor, int) else repr(float(valor))
+
+def _escapar(texto) -> str:
+    return str(texto).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def pagina_actual():
+    """
+    Retorna la página del callback en curso o None.
+    """
+    medicion = _MEDICION.get()
+    return medicion.pagina if medicion is not None else None
+
+@contextlib.contextmanager
+def medir_etapa(etapa: str):
+    """
+    Suma al callback en curso el tiempo del bloque en la etapa `etapa`, sin contar
+    el de las etapas medidas dentro (p. ej. el cálculo dentro de la figura).
+    Fuera de un callback instrumentado no hace nada.
+    """
+    medicion = _MEDICION.get()
+    if medicion is None:
+        yield
+        return
+
+    medicion.anidados.append(0.0)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracion = time.perf_counter() - inicio
+        anidado = medicion.anidados.pop()
+        medicion.tiempos[etapa] = medicion.tiempos.get(etapa, 0.0) + duracion - anidado
+        medicion.anidados[-1] += duracion
+
+def contar_cache(cache: str, resultado: str):
+    """
+    Cuenta una consulta a la caché `cache` ('acierto', 'acierto_backend', 'fallo' o
+    'compartido': un fallo que esperó el cálculo en curso de otra petición),
+    con la página del callback en curso ('ninguna' fuera de los callbacks).
+    """
+    REGISTRO.contar('tm_cache_consultas_total', pagina=pagina_actual() or 'ninguna', cache=cache, resultado=resultado)
+
+def _consulta_segundo_plano():
+    # Dash consulta el progreso de un trabajo en segundo plano con ?cacheKey=...&job=... en la URL
+    from flask import has_request_context, request
+    return has_request_context() and 'job' in request.args
+
+def instrumentar_callback(funcion, pagina: str, etapas: bool = True):
+    """
+    Retorna `funcion` (la que Dash llama para un callback: ejecuta el callback y retorna
+    el JSON de la respuesta) envuelta para medir su duración, errores y bytes.
+
+    Parámetros:
+    -------
+    - funcion: Función registrada en el mapa de callbacks de Dash.
+    - pagina: Etiqueta de la página.
+    - etapas: Registrar también los tiempos por etapa. Con False (callbacks en segundo plano,
+      que calculan en otro proceso) cada petición se registra con etapa 'consulta' y las
+      consultas de progreso no cuentan como llamadas.
+    """
+
+    from dash.exceptions import PreventUpdate
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        medicion = Medicion(pagina)
+        token = _MEDICION.set(medicion)
+        inicio = time.perf_counter()
+        try:
+            respuesta = funcion(*args, **kwargs)
+        except PreventUpdate:
+            raise
+        except Exception:
+            REGISTRO.contar('tm_callback_errores_total', pagina=pagina)
+            raise
+        finally:
+            duracion = time.perf_counter() - inicio
+            _MEDICION.reset(token)
+            if etapas or not _consulta_segundo_plano():
+                REGISTRO.contar('tm_callback_llamadas_total', pagina=pagina)
+            REGISTRO.observar('tm_callback_segundos', duracion, pagina=pagina, etapa='total' if etapas else 'consulta')
+
+        if etapas:
+            calculo = medicion.tiempos.get('calculo', 0.0)
+            figura = medicion.tiempos.get('figura', 0.0)
+            REGISTRO.observar('tm_callback_segundos', calculo, pagina=pagina, etapa='calculo')
+            REGISTRO.observar('tm_callback_segundos', figura, pagina=pagina, etapa='figura')
+            REGISTRO.observar('tm_callback_segundos', max(duracion - calculo - figura, 0.0), pagina=pagina, etapa='serializacion')
+        if isinstance(respuesta, (str, bytes)):
+            REGISTRO.contar('tm_callback_bytes_total', len(respuesta.encode() if isinstance(respuesta, str) else respuesta), pagina=pagina)
+        return respuesta
+
+    return envoltura
+
+def instrumentar(paquete: str = 'pages'):
+    """
+    Envuelve con `instrumentar_callback` todos los callbacks registrados con `@callback`
+    (o `callback_segundo_plano`) en los módulos de `paquete`. La etiqueta de la página
+    es el nombre del módulo (page1, page2, ...). Llamar después de crear la app, cuando
+    Dash ya importó las páginas; llamarla de nuevo no vuelve a envolverlos.
+
+    Retorna la cantidad de callbacks instrumentados.
+    """
+
+    from dash._callback import GLOBAL_CALLBACK_MAP
+
+    cantidad = 0
+    for datos in GLOBAL_CALLBACK_MAP.values():
+        funcion = datos.get('callback')
+        original = getattr(funcion, '__wrapped__', None)
+        modulo = getattr(original, '__module__', '') or ''
+        if funcion is None or getattr(funcion, 'instrumentado', False) or not modulo.startswith(paquete + '.'):
+            continue
+        datos['callback'] = instrumentar_callback(funcion, modulo.rsplit('.', 1)[-1], etapas=datos.get('background') is None)
+        datos['callback'].instrumentado = True
+        cantidad += 1
+    return cantidad
+
+def _estadisticas_caches():
+    from .cache import CACHES
+    return {nombre: cache.estadisticas() for nombre, cache in CACHES.items()}
+
+def _volcar(directorio: str):
+    # Escritura atómica: quien suma nunca lee un archivo a medio escribir
+    contenido = json.dumps({'registro': REGISTRO.estado(), 'caches': _estadisticas_caches()})
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+    with os.fdopen(descriptor, 'w') as archivo:
+        archivo.write(contenido)
+    os.replace(temporal, os.path.join(directorio, f'{os.getpid()}.json'))
+
+def preparar_directorio(directorio: str):
+    """
+    Crea la carpeta de `compartir_metricas` y borra lo que quedó de un arranque anterior.
+    Se llama una vez en el proceso maestro, antes de crear los workers.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    for entrada in os.scandir(directorio):
+        if entrada.name.endswith(('.json', '.tmp')):
+            os.remove(entrada.path)
+
+def compartir_metricas(directorio: str, intervalo: float = 1.0):
+    """
+    Vuelca `REGISTRO` y la ocupación de las cachés de este proceso a `directorio/<pid>.json`
+    cada `intervalo` segundos (en un hilo), y hace que /metrics sume los archivos de todos los
+    procesos. Se llama en cada worker después del fork (ver wsgi.py).
+
+    Parámetros:
+    -------
+    - directorio: Carpeta compartida por los workers (TM_METRICAS_DIR).
+    - intervalo: Segundos entre volcados (lo que tarda como máximo en verse lo de otro worker).
+    """
+    global _DIRECTORIO
+    _DIRECTORIO = directorio
+    os.makedirs(directorio, exist_ok=True)
+
+    def volcar_siempre():
+        while True:
+            try:
+                _volcar(directorio)
+            except OSError:
+                pass
+            time.sleep(intervalo)
+
+    threading.Thread(target=volcar_siempre, name='compartir_metricas', daemon=True).start()
+
+def _sumar_procesos():
+    """
+    Retorna (registro, estadísticas por caché) sumando este proceso y los archivos de los demás
+    en `_DIRECTORIO`: los contadores de todos, las cachés solo de los procesos vivos.
+    """
+    from .cache import _proceso_vivo
+
+    registro = Registro()
+    registro.sumar(REGISTRO.estado())
+    caches = _estadisticas_caches()
+
+    for entrada in os.scandir(_DIRECTORIO):
+        nombre, extension = os.path.splitext(entrada.name)
+        if extension != '.json' or not nombre.isdigit() or int(nombre) == os.getpid():
+            continue
+        try:
+            with open(entrada.path) as archivo:
+                datos = json.load(archivo)
+        except (OSError, ValueError):
+            continue  # Otro proceso lo está reemplazando o lo acaban de borrar
+        registro.sumar(datos['registro'])
+        if _proceso_vivo(int(nombre)):
+            for cache, estadisticas in datos['caches'].items():
+                if cache in caches:
+                    caches[cache] = {clave: caches[cache][clave] + estadisticas[clave] for clave in caches[cache]}
+    return registro, caches
+
+def texto_metricas(registro: Registro = None):
+    """
+    Retorna las métricas en el formato de texto de Prometheus (versión 0.0.4),
+    con la ocupación actual de las cachés. Sin `registro`, las de `REGISTRO` (sumadas
+    entre procesos si se llamó a `compartir_metricas`).
+    """
+
+    if registro is None and _DIRECTORIO is not None:
+        registro, caches = _sumar_procesos()
+    else:
+        registro, caches = registro or REGISTRO, _estadisticas_caches()
+
+    muestras = registro.muestras()
+    for nombre, estadisticas in caches.items():
+        muestras.setdefault('tm_cache_entradas', []).append(('tm_cache_entradas', {'cache': nombre}, estadisticas['entradas']))
+        muestras.setdefault('tm_cache_bytes', []).append(('tm_cache_bytes', {'cache': nombre}, estadisticas['bytes']))
+
+    lineas = []
+    for nombre, (tipo, ayuda) in METRICAS.items():
+        if nombre not in muestras:
+            continue
+        lineas.append(f'# HELP {nombre} {ayuda}')
+        lineas.append(f'# TYPE {nombre} {tipo}')
+        for muestra, etiquetas, valor in muestras[nombre]:
+            texto = ','.join(f'{clave}="{_escapar(v)}"' for clave, v in etiquetas.items())
+            lineas.append(f'{muestra}{{{texto}}} {_numero(valor)}' if texto else f'{muestra} {_numero(valor)}')
+    return '\n'.join(lineas) + '\n'
+
+def exponer_metricas():
+    """
+    Vista de Flask con las métricas de los callbacks y de las cachés para Prometheus
+    (se registra en app.py como /metrics).
+    """
+    from flask import Response
+    return Response(texto_metricas(), content_type='text/plain; version=0.0.4; charset=utf-8')
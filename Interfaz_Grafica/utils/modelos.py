@@ -0,0 +1,407 @@
+# Librerias
+import numpy as np
+from .integradores import dormand_prince, integrar_edo, integrar_edo_pasos
+from .cache import cache_trayectorias
+
+
+# Puntos uniformes que siempre tiene una trayectoria completa, además de los pasos internos
+PUNTOS_MINIMOS = 2000
+
+# Pasos internos permitidos para horizontes largos (10^5 a 10^6 pasos)
+MAX_PASOS_TRAYECTORIA = 2000000
+
+# Pasos por período de Lotka-Volterra con los métodos simplécticos (ver `paso_lotka_volterra`)
+PASOS_POR_PERIODO = 64
+
+
+# Lados derechos de los sistemas (vectorizados: la última dimensión son las variables)
+
+def con_nucleo(f, modelo: str, *parametros):
+    """
+    Retorna f marcada con el núcleo compilado del modelo (ver `nucleos.MODELOS`), que el
+    integrador usa en lugar de f cuando Numba está instalado. Solo se marca si los
+    parámetros son escalares (un solo sistema); los conjuntos siguen con NumPy.
+    """
+    if all(np.ndim(p) == 0 for p in parametros):
+        f.nucleo = (modelo, tuple(float(p) for p in parametros))
+    return f
+
+def rhs_SIR(N, beta, gamma):
+    """
+    Retorna f(t, y) del modelo SIR con y[..., 0] = S, y[..., 1] = I, y[..., 2] = R.
+    """
+    def f(t, y):
+        S, I = y[..., 0], y[..., 1]
+        infeccion = beta * S * I / N
+        recuperacion = gamma * I
+        return np.stack((-infeccion, infeccion - recuperacion, recuperacion), axis=-1)
+    return con_nucleo(f, 'SIR', N, beta, gamma)
+
+def rhs_lotka_volterra(alpha, beta, delta, gamma):
+    """
+    Retorna f(t, y) del modelo Lotka-Volterra con y[..., 0] = presas, y[..., 1] = depredadores.
+    """
+    def f(t, y):
+        x, y_ = y[..., 0], y[..., 1]
+        return np.stack((alpha * x - beta * x * y_, delta * x * y_ - gamma * y_), axis=-1)
+    f.particion = particion_lotka_volterra(alpha, beta, delta, gamma)
+    return con_nucleo(f, 'lotka_volterra', alpha, beta, delta, gamma)
+
+def particion_lotka_volterra(alpha, beta, delta, gamma):
+    """
+    Retorna la partición simpléctica del modelo Lotka-Volterra (ver `integradores.verlet_separable`).
+
+    En z = (u, v) = (ln x, ln y) el sistema es hamiltoniano separable con
+    H(u, v) = delta e^u - gamma u + beta e^v - alpha v (la cantidad conservada de
+    `conservada_lotka_volterra`): u' = alpha - beta e^v solo depende de v y v' = delta e^u - gamma
+    solo de u, así que cada mitad se integra exactamente y x, y nunca dejan de ser positivos.
+    """
+    def flujo_presas(z, h):
+        u, v = z[..., 0], z[..., 1]
+        return np.stack((u + h * (alpha - beta * np.exp(v)), v), axis=-1)
+
+    def flujo_depredadores(z, h):
+        u, v = z[..., 0], z[..., 1]
+        return np.stack((u, v + h * (delta * np.exp(u) - gamma)), axis=-1)
+
+    return flujo_presas, flujo_depredadores, np.log, np.exp
+
+def conservada_lotka_volterra(x, y, alpha, beta, delta, gamma):
+    """
+    Retorna la cantidad conservada del modelo Lotka-Volterra, V(x, y) = delta x - gamma ln x + beta y - alpha ln y,
+    constante a lo largo de cada órbita exacta (NaN si x o y no son positivos).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return delta * x - gamma * np.log(x) + beta * y - alpha * np.log(y)
+
+
+# Funciones
+
+@cache_trayectorias
+def calcular_enfriamiento_newton(Ta: float, T0: float, k: float, t0: float, t: float, cant: int):
+    """
+    Retorna un diccionario con la solución exacta de la ley de enfriamiento de Newton ('t', 'solucion')
+    y su campo de pendientes sobre una malla ('malla_t', 'malla_y', 'pendiente').
+
+    Parámetros:
+    -------
+    - Ta: temperatura del ambiente.
+    - T0: temperatura inicial.
+    - k: tasa de enfriamiento.
+    - t0: Tiempo inicial.
+    - t: Tiempo final.
+    - cant: Las particiones para el eje temporal y espacial.
+    """
+
+    # Rango de T y t
+    T_values = np.linspace(0, T0, cant)  # Va desde 0 hasta T0
+    t_values = np.linspace(0, t, cant)
+
+    # Crear una malla de puntos (T, t)
+    ti, T = np.meshgrid(t_values, T_values)
+
+    # Definir la EDO
+    dT_dt = k * (T - Ta)
+
+    # Solución exacta de la ley de enfriamiento de Newton
+    funcion = (T0 - Ta) * np.exp(k * t_values) + Ta
+
+    return {'t': t_values, 'solucion': funcion, 'malla_t': ti, 'malla_y': T, 'pendiente': dT_dt}
+
+@cache_trayectorias
+def calcular_ecuacion_logistica(K: float, P0: float, r: float, t0: float, t: float, cant: int):
+    """
+    Retorna un diccionario con la solución exacta de la ecuación logística ('t', 'solucion')
+    y su campo de pendientes sobre una malla ('malla_t', 'malla_y', 'pendiente').
+
+    Parámetros:
+    -------
+    - K: Capacidad de carga.
+    - P0: Población inicial.
+    - r: Tasa de crecimiento.
+    - t0: Tiempo inicial.
+    - t: Tiempo final.
+    - cant: Las particiones para el eje temporal y espacial.
+    """
+
+    # Rango de P y t
+    P_values = np.linspace(0, K+5, cant)
+    t_values = np.linspace(0, t, cant)
+
+    # Crear una malla de puntos (P, t)
+    T, P = np.meshgrid(t_values, P_values)
+
+    # Definir la EDO
+    dP_dt = r * P * (1 - P / K)
+
+    # Solución exacta de la Ecuación Logística
+    funcion = K*P0*np.exp(r*t_values) / (P0*np.exp(r*t_values) + (K-P0)*np.exp(r*t0))
+
+    return {'t': t_values, 'solucion': funcion, 'malla_t': T, 'malla_y': P, 'pendiente': dP_dt}
+
+@cache_trayectorias
+def calcular_decaimiento_radioactivo(N0: float, k: float, t0: float, t: float, cant: int):
+    """
+    Retorna un diccionario con la solución exacta del decaimiento radioactivo ('t', 'solucion')
+    y su campo de pendientes sobre una malla ('malla_t', 'malla_y', 'pendiente').
+
+    Parámetros:
+    -------
+    - N0: Número de núcleos inicial.
+    - k: Tasa de desintegración.
+    - t0: Tiempo inicial.
+    - t: Tiempo final.
+    - cant: Las particiones para el eje temporal y espacial.
+    """
+
+    # Rango de N y t
+    N_values = np.linspace(0, N0, cant)
+    t_values = np.linspace(t0, t, cant)
+
+    # Crear una malla de puntos (N, t)
+    T, N = np.meshgrid(t_values, N_values)
+
+    # Definir la EDO
+    dN_dt = -k * N
+
+    # Solución exacta del modelo de decaimiento radioactivo
+    funcion = N0 * np.exp(-k * t_values)
+
+    return {'t': t_values, 'solucion': funcion, 'malla_t': T, 'malla_y': N, 'pendiente': dN_dt}
+
+@cache_trayectorias
+def calcular_crecimiento_exponencial(N0: float, r: float, t0: float, t: float, cant: int):
+    """
+    Retorna un diccionario con la solución exacta del crecimiento exponencial ('t', 'solucion')
+    y su campo de pendientes sobre una malla ('malla_t', 'malla_y', 'pendiente').
+
+    Parámetros:
+    -------
+    - N0: Población inicial.
+    - r: Tasa de crecimiento exponencial.
+    - t0: Tiempo inicial.
+    - t: Tiempo final.
+    - cant: Cantidad de particiones para el eje temporal y espacial.
+    """
+
+    # Rango de N y t (se aumenta la densidad para mejor visualización y hover en más puntos)
+    N_values = np.linspace(0, N0 * 2, cant)
+    t_values = np.linspace(t0, t, cant)
+
+    # Crear una malla de puntos (N, t)
+    T, N = np.meshgrid(t_values, N_values)
+
+    # Definir la EDO: dN/dt = r * N
+    dN_dt = r * N
+
+    # Solución exacta del modelo de crecimiento exponencial
+    funcion = N0 * np.exp(r * t_values)
+
+    return {'t': t_values, 'solucion': funcion, 'malla_t': T, 'malla_y': N, 'pendiente': dN_dt}
+
+@cache_trayectorias
+def calcular_SIR(N: float, I0: float, R0: float, t: float, beta: float, gamma: float, cant: int):
+    """
+    Retorna un diccionario con la solución numérica del modelo SIR: 't', 'S', 'I' y 'R'.
+
+    Parámetros:
+    -------
+    - N: Población total.
+    - I0: Infectados iniciales.
+    - R0: Recuperados iniciales.
+    - t: Tiempo total de simulación.
+    - beta: Tasa de transmisión.
+    - gamma: Tasa de recuperación.
+    - cant: Cantidad de puntos en el eje temporal.
+    """
+
+    # Generar el rango de tiempo
+    t_values = np.linspace(0, t, cant)
+
+    # Solución numérica del modelo SIR
+    y = integrar_edo(rhs_SIR(N, beta, gamma), [N - I0 - R0, I0, R0], t_values)
+
+    return {'t': t_values, 'S': y[:, 0], 'I': y[:, 1], 'R': y[:, 2]}
+
+@cache_trayectorias
+def calcular_lotka_volterra(alpha: float, beta: float, delta: float, gamma: float, x0: float, y0: float, t: float, cant: int, metodo: str = 'dopri5', paso: float = None):
+    """
+    Retorna un diccionario con la solución numérica del modelo Lotka-Volterra: 't', 'x' (presas) e 'y' (depredadores).
+
+    Parámetros:
+    -------
+    - alpha: Tasa de crecimiento de presas.
+    - beta: Tasa de depredación.
+    - delta: Tasa de crecimiento de depredadores.
+    - gamma: Tasa de mortalidad de depredadores.
+    - x0: Población inicial de presas.
+    - y0: Población inicial de depredadores.
+    - t: Tiempo total de simulación.
+    - cant: Cantidad de puntos en el eje temporal.
+    - metodo, paso: Ver `trayectoria_lotka_volterra`.
+    """
+
+    # Generar el rango de tiempo
+    t_values = np.linspace(0, t, cant)
+
+    # Solución numérica del modelo Lotka-Volterra
+    opciones = {} if metodo == 'dopri5' else {'paso': paso or paso_lotka_volterra(alpha, gamma), 'max_pasos': MAX_PASOS_TRAYECTORIA}
+    y = integrar_edo(rhs_lotka_volterra(alpha, beta, delta, gamma), [x0, y0], t_values, metodo=metodo, **opciones)
+
+    return {'t': t_values, 'x': y[:, 0], 'y': y[:, 1]}
+
+@cache_trayectorias
+def trayectoria_SIR(N: float, I0: float, R0: float, t: float, beta: float, gamma: float):
+    """
+    Retorna un diccionario con la solución del modelo SIR a resolución completa: 't', 'S', 'I' y 'R'
+    en el final de cada paso interno del integrador y en `PUNTOS_MINIMOS` puntos uniformes.
+
+    Es la trayectoria que se guarda en caché para submuestrearla (LTTB) o recortarla
+    a la ventana visible de la gráfica sin volver a integrar.
+
+    Parámetros:
+    -------
+    - N: Población total.
+    - I0: Infectados iniciales.
+    - R0: Recuperados iniciales.
+    - t: Tiempo total de simulación.
+    - beta: Tasa de transmisión.
+    - gamma: Tasa de recuperación.
+    """
+
+    t_values, y = integrar_edo_pasos(rhs_SIR(N, beta, gamma), [N - I0 - R0, I0, R0], np.linspace(0, t, PUNTOS_MINIMOS), max_pasos=MAX_PASOS_TRAYECTORIA)
+
+    return {'t': t_values, 'S': y[:, 0], 'I': y[:, 1], 'R': y[:, 2]}
+
+def paso_lotka_volterra(alpha: float, gamma: float, pasos_por_periodo: int = PASOS_POR_PERIODO):
+    """
+    Retorna el paso de los métodos simplécticos: `pasos_por_periodo` pasos por período de las
+    oscilaciones pequeñas alrededor del equilibrio (2 pi / sqrt(alpha gamma)).
+    """
+    return 2 * np.pi / np.sqrt(alpha * gamma) / pasos_por_periodo
+
+@cache_trayectorias
+def trayectoria_lotka_volterra(alpha: float, beta: float, delta: float, gamma: float, x0: float, y0: float, t: float, metodo: str = 'dopri5', paso: float = None):
+    """
+    Retorna un diccionario con la solución del modelo Lotka-Volterra a resolución completa:
+    't', 'x' (presas) e 'y' (depredadores), como `trayectoria_SIR`.
+
+    Con `metodo` 'verlet', 'yoshida4' o 'yoshida6' se integra con paso fijo en coordenadas logarítmicas
+    (ver `particion_lotka_volterra`): la cantidad conservada no deriva aunque se integren
+    miles de períodos, y cada paso interno queda en la salida.
+
+    Parámetros:
+    -------
+    - alpha: Tasa de crecimiento de presas.
+    - beta: Tasa de depredación.
+    - delta: Tasa de crecimiento de depredadores.
+    - gamma: Tasa de mortalidad de depredadores.
+    - x0: Población inicial de presas.
+    - y0: Población inicial de depredadores.
+    - t: Tiempo total de simulación.
+    - metodo: 'dopri5' (Runge-Kutta adaptativo), 'verlet', 'yoshida4' o 'yoshida6' (simplécticos).
+    - paso: Paso de los métodos simplécticos (None para `paso_lotka_volterra`).
+    """
+
+    opciones = {} if metodo == 'dopri5' else {'paso': paso or paso_lotka_volterra(alpha, gamma)}
+    t_values, y = integrar_edo_pasos(rhs_lotka_volterra(alpha, beta, delta, gamma), [x0, y0], np.linspace(0, t, PUNTOS_MINIMOS), metodo=metodo, max_pasos=MAX_PASOS_TRAYECTORIA, **opciones)
+
+    return {'t': t_values, 'x': y[:, 0], 'y': y[:, 1]}
+
+@cache_trayectorias
+def barrido_SIR(beta, gamma, I0, N: float = 1000, R0: float = 0, t: int = 160, cant: int = 400):
+    """
+    Retorna un diccionario con el resumen del modelo SIR para un conjunto de parámetros
+    que se integran a la vez: 'beta', 'gamma', 'I0', 'pico_infectados', 'tiempo_pico' y 'tamano_final'.
+
+    `beta`, `gamma` e `I0` pueden ser escalares o arreglos; se combinan con las reglas de
+    broadcasting de NumPy y cada combinación es un miembro del conjunto. Todos los miembros
+    se integran como un solo estado de forma (miembros, 3), por lo que el costo de Python
+    no depende de la cantidad de miembros. Los resultados tienen la forma combinada de los parámetros.
+
+    Parámetros:
+    -------
+    - beta: Tasas de transmisión.
+    - gamma: Tasas de recuperación.
+    - I0: Infectados iniciales.
+    - N: Población total.
+    - R0: Recuperados iniciales.
+    - t: Tiempo total de simulación.
+    - cant: Cantidad de puntos del eje temporal donde se busca el pico.
+    """
+
+    # Combinar los parámetros y aplanarlos en la dimensión de miembros
+    beta, gamma, I0 = np.broadcast_arrays(*(np.asarray(p, dtype=float) for p in (beta, gamma, I0)))
+    forma = beta.shape
+    beta, gamma, I0 = beta.ravel(), gamma.ravel(), I0.ravel()
+
+    # Condiciones iniciales: una fila (S, I, R) por miembro
+    y0 = np.stack((N - I0 - R0, I0, np.full_like(I0, R0)), axis=-1)
+    t_values = np.linspace(0, t, cant)
+
+    # Recorrer la salida por bloques para no guardar las trayectorias completas
+    pico_infectados = np.full(I0.shape, -np.inf)
+    tiempo_pico = np.zeros(I0.shape)
+    for t_bloque, y_bloque in dormand_prince(rhs_SIR(N, beta, gamma), y0, t_values):
+        I_bloque = y_bloque[..., 1]
+        indice = np.argmax(I_bloque, axis=0)
+        maximo = I_bloque[indice, np.arange(I_bloque.shape[1])]
+        mejora = maximo > pico_infectados
+        pico_infectados[mejora] = maximo[mejora]
+        tiempo_pico[mejora] = t_bloque[indice[mejora]]
+        S_final = y_bloque[-1, :, 0]
+
+    return {
+        'beta': beta.reshape(forma),
+        'gamma': gamma.reshape(forma),
+        'I0': I0.reshape(forma),
+        'pico_infectados': pico_infectados.reshape(forma),
+        'tiempo_pico': tiempo_pico.reshape(forma),
+        'tamano_final': (N - R0 - S_final).reshape(forma)  # Total de personas que llegaron a infectarse
+    }
+
+@cache_trayectorias
+def orbitas_lotka_volterra(alpha: float, beta: float, delta: float, gamma: float, orbitas: int, extension: float, t: float, cant: int):
+    """
+    Retorna un diccionario con una familia de órbitas del modelo Lotka-Volterra que parten de una
+    malla de `orbitas` x `orbitas` condiciones iniciales sobre (0, extension * x*] x (0, extension * y*],
+    donde (x*, y*) = (gamma / delta, alpha / beta) es el equilibrio de coexistencia.
+
+    Todas las órbitas se integran a la vez como un solo estado de forma (órbitas, 2), como en
+    `barrido_SIR`. Como control de precisión se evalúa la cantidad conservada V (ver
+    `conservada_lotka_volterra`) en cada punto: 'deriva' es el máximo de |V - V0| de cada órbita,
+    relativo a V0 - V(x*, y*) (la distancia de la órbita al equilibrio); las órbitas exactas la tienen en 0.
+
+    Salidas: 't' (cant), 'x0', 'y0', 'V0' y 'deriva' (órbitas²), 'x' e 'y' (órbitas², cant).
+
+    Parámetros:
+    -------
+    - alpha: Tasa de crecimiento de presas.
+    - beta: Tasa de depredación.
+    - delta: Tasa de crecimiento de depredadores.
+    - gamma: Tasa de mortalidad de depredadores.
+    - orbitas: Condiciones iniciales por eje de la malla.
+    - extension: Tamaño de la malla en múltiplos del equilibrio.
+    - t: Tiempo total de simulación.
+    - cant: Cantidad de puntos en el eje temporal de cada órbita.
+    """
+
+    # Malla de condiciones iniciales (centros de celdas, sin tocar los ejes)
+    x_eq, y_eq = gamma / delta, alpha / beta
+    fracciones = (np.arange(orbitas) + 0.5) / orbitas
+    X0, Y0 = np.meshgrid(fracciones * extension * x_eq, fracciones * extension * y_eq)
+    x0, y0 = X0.ravel(), Y0.ravel()
+
+    # Todas las órbitas en una sola integración: y tiene forma (cant, órbitas, 2)
+    t_values = np.linspace(0, t, cant)
+    y = integrar_edo(rhs_lotka_volterra(alpha, beta, delta, gamma), np.stack((x0, y0), axis=-1), t_values)
+    x_orbitas, y_orbitas = y[..., 0].T, y[..., 1].T
+
+    # Deriva de la cantidad conservada (inf si la órbita salió del cuadrante positivo)
+    V0 = conservada_lotka_volterra(x0, y0, alpha, beta, delta, gamma)
+    V_eq = conservada_lotka_volterra(x_eq, y_eq, alpha, beta, delta, gamma)
+    V = conservada_lotka_volterra(x_orbitas, y_orbitas, alpha, beta, delta, gamma)
+    deriva = np.max(np.abs(V - V0[:, np.newaxis]), axis=1) / np.maximum(V0 - V_eq, np.finfo(float).eps)
+    deriva[~np.all(np.isfinite(V), axis=1)] = np.inf
+
+    return {'t': t_values, 'x0': x0, 'y0': y0, 'V0': V0, 'deriva': deriva, 'x': x_orbitas, 'y': y_orbitas}
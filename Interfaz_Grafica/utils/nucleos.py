@@ -0,0 +1,386 @@
+# Librerias
+import math
+import os
+import threading
+import numpy as np
+from .integradores import C_DP, A_DP, B_DP, E_DP, P_DP
+
+# Núcleos compilados con Numba (opcional: pip install numba). Sin Numba se usa el
+# integrador de NumPy de `integradores.py`, que da los mismos resultados.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# Se pueden desactivar con TM_NUCLEOS=0 (p. ej. para comparar con la versión de NumPy)
+DISPONIBLE = njit is not None and os.environ.get('TM_NUCLEOS', '1') != '0'
+
+# Modelos con lado derecho compilado: nombre -> identificador dentro de `_derivada`.
+# Para agregar un modelo: una rama nueva en `_derivada` y su nombre aquí, y que la
+# función f(t, y) del modelo tenga el atributo `nucleo = (nombre, parámetros)`.
+MODELOS = {
+    'SIR': 0,
+    'lotka_volterra': 1
+}
+
+# Modelos con partición simpléctica compilada (ver `integradores.verlet_separable`), de un grado
+# de libertad: una rama en `_flujo` y `_coordenadas` por modelo, con el mismo identificador de `MODELOS`.
+PARTICIONES = ('lotka_volterra',)
+
+# Puntos por bloque que entrega cada llamada a un núcleo (después se pausa, ver `_por_bloques`)
+PUNTOS_POR_BLOQUE = 4096
+
+# Coeficientes como arreglos rectangulares (Numba los toma como constantes)
+A_MATRIZ = np.zeros((6, 6))
+for _i, _fila in enumerate(A_DP):
+    A_MATRIZ[_i, :_fila.size] = _fila
+C_NUCLEO, B_NUCLEO, E_NUCLEO, P_NUCLEO = C_DP.copy(), B_DP.copy(), E_DP.copy(), P_DP.copy()
+
+
+def _compilar(funcion):
+    # njit con caché en disco (__pycache__), así la compilación se paga una sola vez por versión del código
+    return njit(cache=True, nogil=True)(funcion) if DISPONIBLE else funcion
+
+
+# Núcleos
+
+@_compilar
+def _derivada(modelo, t, y, p, dy):
+    if modelo == 0:
+        # SIR: p = (N, beta, gamma)
+        infeccion = p[1] * y[0] * y[1] / p[0]
+        recuperacion = p[2] * y[1]
+        dy[0] = -infeccion
+        dy[1] = infeccion - recuperacion
+        dy[2] = recuperacion
+    elif modelo == 1:
+        # Lotka-Volterra: p = (alpha, beta, delta, gamma)
+        dy[0] = p[0] * y[0] - p[1] * y[0] * y[1]
+        dy[1] = p[2] * y[0] * y[1] - p[3] * y[1]
+
+@_compilar
+def _norma(error, escala):
+    suma = 0.0
+    for j in range(error.size):
+        suma += (error[j] / escala[j]) ** 2
+    return math.sqrt(suma / error.size)
+
+@_compilar
+def _paso_inicial(modelo, p, t0, y0, f0, rtol, atol):
+    escala = atol + np.abs(y0) * rtol
+    d0 = _norma(y0, escala)
+    d1 = _norma(f0, escala)
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+
+    f1 = np.empty_like(y0)
+    _derivada(modelo, t0 + h0, y0 + h0 * f0, p, f1)
+    d2 = _norma(f1 - f0, escala) / h0
+
+    if max(d1, d2) <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / 5)
+
+    return min(100 * h0, h1)
+
+@_compilar
+def _dopri5(modelo, p, y0, t_values, rtol, atol, h0, max_pasos, incluir_pasos, memoria, max_puntos):
+    # Misma lógica que `integradores.dormand_prince`, con la salida en arreglos que crecen.
+    # Retorna (t, y, estado, t_fallo) con estado 0 (bien), 1 (máximo de pasos), 2 (paso muy
+    # pequeño) o 3 (pausa: ya entregó `max_puntos` puntos). En `memoria` (2 * d + 4 valores)
+    # guarda dónde quedó, y una llamada con la misma `memoria` sigue desde ahí; memoria[0] == 0
+    # empieza desde y0.
+    n = t_values.size
+    d = y0.size
+
+    capacidad = min(n, max_puntos + 1) + (1024 if incluir_pasos else 0)
+    t_salida = np.empty(capacidad)
+    y_salida = np.empty((capacidad, d))
+    cuenta = 0
+
+    y = y0.copy()
+    y_nuevo = np.empty(d)
+    y_etapa = np.empty(d)
+    K = np.empty((7, d))
+    pesos = np.empty(7)
+    t_final = t_values[n - 1]
+
+    if memoria[0] == 0:
+        t_salida[0] = t_values[0]
+        y_salida[0] = y0
+        cuenta = 1
+
+        t = t_values[0]
+        if n == 1:
+            return t_salida[:1], y_salida[:1], 0, t
+
+        _derivada(modelo, t, y, p, K[0])
+        h = h0 if h0 > 0 else _paso_inicial(modelo, p, t, y, K[0].copy(), rtol, atol)
+
+        siguiente = 1
+        pasos = 0
+    else:
+        siguiente, pasos, t, h = int(memoria[0]), int(memoria[1]), memoria[2], memoria[3]
+        y[:] = memoria[4:4 + d]
+        K[0] = memoria[4 + d:4 + 2 * d]
+
+    while siguiente < n:
+        if cuenta >= max_puntos:
+            memoria[0], memoria[1], memoria[2], memoria[3] = siguiente, pasos, t, h
+            memoria[4:4 + d] = y
+            memoria[4 + d:4 + 2 * d] = K[0]
+            return t_salida[:cuenta], y_salida[:cuenta], 3, t
+
+        pasos += 1
+        if pasos > max_pasos:
+            return t_salida[:cuenta], y_salida[:cuenta], 1, t
+
+        ultimo = h >= t_final - t
+        if ultimo:
+            h = t_final - t
+
+        # Etapas de Runge-Kutta
+        for i in range(1, 6):
+            for j in range(d):
+                acumulado = 0.0
+                for k in range(i):
+                    acumulado += A_MATRIZ[i, k] * K[k, j]
+                y_etapa[j] = y[j] + h * acumulado
+            _derivada(modelo, t + C_NUCLEO[i] * h, y_etapa, p, K[i])
+
+        for j in range(d):
+            acumulado = 0.0
+            for k in range(6):
+                acumulado += B_NUCLEO[k] * K[k, j]
+            y_nuevo[j] = y[j] + h * acumulado
+        _derivada(modelo, t + h, y_nuevo, p, K[6])
+
+        # Error local relativo a las tolerancias
+        suma = 0.0
+        for j in range(d):
+            acumulado = 0.0
+            for k in range(7):
+                acumulado += E_NUCLEO[k] * K[k, j]
+            escala = atol + max(abs(y[j]), abs(y_nuevo[j])) * rtol
+            suma += (h * acumulado / escala) ** 2
+        error = math.sqrt(suma / d)
+        if not math.isfinite(error):
+            error = math.inf
+
+        if error <= 1:
+            t_nuevo = t_final if ultimo else t + h
+            fin = n if ultimo else np.searchsorted(t_values, t_nuevo, side='right')
+
+            # Agrandar la salida si no alcanza para este paso
+            necesario = cuenta + (fin - siguiente) + 1
+            if necesario > capacidad:
+                capacidad = max(2 * capacidad, necesario)
+                t_mayor = np.empty(capacidad)
+                y_mayor = np.empty((capacidad, d))
+                t_mayor[:cuenta] = t_salida[:cuenta]
+                y_mayor[:cuenta] = y_salida[:cuenta]
+                t_salida, y_salida = t_mayor, y_mayor
+
+            # Interpolar en los puntos de salida que cubre este paso (salida densa)
+            for m in range(siguiente, fin):
+                x = (t_values[m] - t) / h
+                for k in range(7):
+                    pesos[k] = x * (P_NUCLEO[k, 0] + x * (P_NUCLEO[k, 1] + x * (P_NUCLEO[k, 2] + x * P_NUCLEO[k, 3])))
+                for j in range(d):
+                    acumulado = 0.0
+                    for k in range(7):
+                        acumulado += pesos[k] * K[k, j]
+                    y_salida[cuenta, j] = y[j] + h * acumulado
+                t_salida[cuenta] = t_values[m]
+                cuenta += 1
+
+            # Final del paso, si no coincide con el último punto de salida
+            if incluir_pasos and not ultimo and (fin == siguiente or t_values[fin - 1] < t_nuevo):
+                t_salida[cuenta] = t_nuevo
+                y_salida[cuenta] = y_nuevo
+                cuenta += 1
+
+            siguiente = fin
+            t = t_nuevo
+            y[:] = y_nuevo
+            K[0] = K[6]
+            factor = 10.0 if error == 0 else min(10.0, 0.9 * error ** -0.2)
+        else:
+            factor = max(0.2, 0.9 * error ** -0.2) if math.isfinite(error) else 0.2
+
+        h *= factor
+        if h < 1e-12 * max(1.0, abs(t)):
+            return t_salida[:cuenta], y_salida[:cuenta], 2, t
+
+    return t_salida[:cuenta], y_salida[:cuenta], 0, t
+
+@_compilar
+def _flujo(modelo, parte, u, v, p, h):
+    # Avanza (u, v) un tiempo h con solo una mitad del campo (de forma exacta) y retorna
+    # el valor nuevo de u (parte 0) o de v (parte 1). Sistemas de un grado de libertad.
+    if modelo == 1:
+        # Lotka-Volterra en (u, v) = (ln x, ln y): H = delta e^u - gamma u + beta e^v - alpha v
+        if parte == 0:
+            return u + h * (p[0] - p[1] * math.exp(v))
+        return v + h * (p[2] * math.exp(u) - p[3])
+    return u if parte == 0 else v
+
+@_compilar
+def _coordenadas(modelo, valor, ida):
+    # Convierte una variable del modelo a la del hamiltoniano (ida) o al revés
+    if modelo == 1:
+        return math.log(valor) if ida else math.exp(valor)
+    return valor
+
+@_compilar
+def _verlet(modelo, p, y0, t_values, paso, pesos, max_pasos, incluir_pasos, memoria, max_puntos):
+    # Misma lógica que `integradores.verlet_separable` (con y de dos componentes).
+    # Retorna (t, y, estado, t_fallo) como `_dopri5`, y se reanuda igual con `memoria` (4 valores).
+    n = t_values.size
+
+    capacidad = min(n, max_puntos + 1) + (1024 if incluir_pasos else 0)
+    t_salida = np.empty(capacidad)
+    y_salida = np.empty((capacidad, 2))
+    cuenta = 0
+
+    if memoria[0] == 0:
+        t_salida[0] = t_values[0]
+        y_salida[0] = y0
+        cuenta = 1
+
+        u = _coordenadas(modelo, y0[0], True)
+        v = _coordenadas(modelo, y0[1], True)
+        inicio = 1
+        pasos = 0
+    else:
+        inicio, pasos, u, v = int(memoria[0]), int(memoria[1]), memoria[2], memoria[3]
+
+    for m in range(inicio, n):
+        if cuenta >= max_puntos:
+            memoria[0], memoria[1], memoria[2], memoria[3] = m, pasos, u, v
+            return t_salida[:cuenta], y_salida[:cuenta], 3, t_values[m - 1]
+
+        t_inicio, t_fin = t_values[m - 1], t_values[m]
+        cantidad = max(1, int(math.ceil((t_fin - t_inicio) / paso - 1e-9))) if paso > 0 else 1
+        pasos += cantidad
+        if pasos > max_pasos:
+            return t_salida[:cuenta], y_salida[:cuenta], 1, t_inicio
+        h = (t_fin - t_inicio) / cantidad
+
+        # Agrandar la salida si no alcanza para este intervalo
+        necesario = cuenta + (cantidad if incluir_pasos else 1)
+        if necesario > capacidad:
+            capacidad = max(2 * capacidad, necesario)
+            t_mayor = np.empty(capacidad)
+            y_mayor = np.empty((capacidad, 2))
+            t_mayor[:cuenta] = t_salida[:cuenta]
+            y_mayor[:cuenta] = y_salida[:cuenta]
+            t_salida, y_salida = t_mayor, y_mayor
+
+        for i in range(cantidad):
+            for peso in pesos:
+                u = _flujo(modelo, 0, u, v, p, 0.5 * peso * h)
+                v = _flujo(modelo, 1, u, v, p, peso * h)
+                u = _flujo(modelo, 0, u, v, p, 0.5 * peso * h)
+            if incluir_pasos or i == cantidad - 1:
+                t_salida[cuenta] = t_fin if i == cantidad - 1 else t_inicio + (i + 1) * h
+                y_salida[cuenta, 0] = _coordenadas(modelo, u, False)
+                y_salida[cuenta, 1] = _coordenadas(modelo, v, False)
+                cuenta += 1
+
+    return t_salida[:cuenta], y_salida[:cuenta], 0, t_values[n - 1]
+
+# Funciones
+
+def _por_bloques(nucleo, argumentos, memoria, max_pasos: int):
+    """
+    Generador que llama al núcleo de a `PUNTOS_POR_BLOQUE` puntos y entrega cada bloque apenas
+    está listo, así una corrida (`corridas.Corrida`) lo muestra y puede cancelarse entre bloques.
+    """
+    while True:
+        t_salida, y_salida, estado, t_fallo = nucleo(*argumentos, memoria, PUNTOS_POR_BLOQUE)
+        if t_salida.size:
+            yield t_salida, y_salida
+        if estado != 3:
+            break
+
+    if estado == 1:
+        raise RuntimeError(f'Se superó el máximo de {max_pasos} pasos en t = {t_fallo}')
+    if estado == 2:
+        raise RuntimeError(f'El paso se volvió demasiado pequeño en t = {t_fallo}')
+
+def admite(f, y0):
+    """
+    Retorna True si la integración de f puede hacerse con el núcleo compilado:
+    Numba disponible, f marcada con `nucleo` y un solo sistema (y0 de una dimensión).
+    """
+    nucleo = getattr(f, 'nucleo', None)
+    return DISPONIBLE and nucleo is not None and nucleo[0] in MODELOS and np.ndim(y0) == 1
+
+def dormand_prince_nucleo(f, y0, t_values, rtol: float = 1e-6, atol: float = 1e-9, h0: float = None, max_pasos: int = 100000, incluir_pasos: bool = False):
+    """
+    Generador equivalente a `integradores.dormand_prince` que integra con el núcleo compilado
+    y entrega la salida en bloques de `PUNTOS_POR_BLOQUE` puntos: el núcleo se detiene después
+    de cada bloque y la siguiente llamada sigue desde el mismo paso (mismo resultado que de una vez).
+
+    Parámetros:
+    -------
+    - f: Lado derecho con el atributo `nucleo = (nombre del modelo, parámetros)` (ver `admite`).
+    - y0, t_values, rtol, atol, h0, max_pasos, incluir_pasos: Ver `integradores.dormand_prince`.
+    """
+
+    nombre, parametros = f.nucleo
+    y0 = np.array(y0, dtype=float)
+    argumentos = (
+        MODELOS[nombre], np.asarray(parametros, dtype=float), y0,
+        np.asarray(t_values, dtype=float), rtol, atol, h0 or 0.0, max_pasos, incluir_pasos
+    )
+    yield from _por_bloques(_dopri5, argumentos, np.zeros(2 * y0.size + 4), max_pasos)
+
+def admite_particion(f, y0):
+    """
+    Retorna True si la integración simpléctica de f puede hacerse con el núcleo compilado
+    (como `admite`, para un modelo de `PARTICIONES` con y0 de dos componentes).
+    """
+    return admite(f, y0) and f.nucleo[0] in PARTICIONES and np.size(y0) == 2
+
+def verlet_nucleo(f, y0, t_values, paso: float, pesos, max_pasos: int, incluir_pasos: bool = False):
+    """
+    Generador equivalente a `integradores.verlet_separable` que integra con el núcleo compilado,
+    por bloques como `dormand_prince_nucleo`.
+
+    Parámetros:
+    -------
+    - f: Lado derecho con el atributo `nucleo` (ver `admite_particion`).
+    - y0, t_values, paso, max_pasos, incluir_pasos: Ver `integradores.verlet_separable`.
+    - pesos: Pesos de la composición (`integradores.COMPOSICIONES`).
+    """
+
+    nombre, parametros = f.nucleo
+    argumentos = (
+        MODELOS[nombre], np.asarray(parametros, dtype=float), np.array(y0, dtype=float),
+        np.asarray(t_values, dtype=float), paso or 0.0, np.asarray(pesos, dtype=float), max_pasos, incluir_pasos
+    )
+    yield from _por_bloques(_verlet, argumentos, np.zeros(4), max_pasos)
+
+def precompilar_nucleos():
+    """
+    Compila (o carga de la caché en disco) los núcleos con una integración corta,
+    para que la primera petición no espere la compilación.
+    """
+    if not DISPONIBLE:
+        return
+    for nombre, identificador in MODELOS.items():
+        y0 = np.ones(3 if nombre == 'SIR' else 2)
+        _dopri5(identificador, np.ones(4), y0, np.linspace(0, 1e-3, 3), 1e-6, 1e-9, 0.0, 100, True, np.zeros(2 * y0.size + 4), PUNTOS_POR_BLOQUE)
+        if nombre in PARTICIONES:
+            _verlet(identificador, np.ones(4), y0, np.linspace(0, 1e-3, 3), 1e-3, np.ones(1), 100, True, np.zeros(4), PUNTOS_POR_BLOQUE)
+
+def precompilar_en_segundo_plano():
+    """
+    Lanza `precompilar_nucleos` en un hilo, sin retrasar el arranque del servidor.
+    """
+    hilo = threading.Thread(target=precompilar_nucleos, name='precompilar_nucleos', daemon=True)
+    hilo.start()
+    return hilo
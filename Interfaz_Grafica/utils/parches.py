@@ -0,0 +1,76 @@
+# Librerias
+from dash import Patch, ctx
+from .codificacion import codificar_arreglo, decodificar_arreglo, codificar_figura
+
+
+# Funciones
+
+def parche_figura(fig, rutas_layout=(('title', 'text'), ('xaxis', 'range')), trazas=None):
+    """
+    Retorna un `dash.Patch` que solo reemplaza los datos de las trazas (x, y, z)
+    y algunas propiedades del layout, dejando en el navegador el resto de la figura
+    (plantilla, ejes, estilos).
+
+    La figura del navegador debe tener las mismas trazas y en el mismo orden que `fig`.
+
+    Parámetros:
+    -------
+    - fig: Figura nueva (diccionario o go.Figure) de la que se copian los datos.
+    - rutas_layout: Propiedades del layout que se envían si están definidas en `fig`.
+    - trazas: Índices de las trazas que cambiaron (None para todas).
+    """
+
+    parche = Patch()
+
+    # La figura solo se lee (la de la caché no se modifica)
+    figura = fig.to_dict() if hasattr(fig, 'to_dict') else fig
+
+    # Datos de cada traza
+    for i, traza in enumerate(figura['data']):
+        if trazas is not None and i not in trazas:
+            continue
+        for eje in ('x', 'y', 'z'):
+            if traza.get(eje) is not None:
+                parche['data'][i][eje] = codificar_arreglo(decodificar_arreglo(traza[eje]))  # Arreglo binario, igual que la figura completa
+
+    # Propiedades del layout que dependen de los parámetros
+    for ruta in rutas_layout:
+        valor = figura['layout']
+        for clave in ruta:
+            valor = valor.get(clave) if isinstance(valor, dict) else None
+        if valor is not None:
+            destino = parche['layout']
+            for clave in ruta[:-1]:
+                destino = destino[clave]
+            destino[ruta[-1]] = valor
+
+    return parche
+
+def figura_o_parche(fig, entradas_completas=(), disparadores=None, trazas_por_entrada=None):
+    """
+    Retorna la figura completa (con los datos como arreglos binarios) en la primera llamada
+    o cuando cambió alguna entrada de `entradas_completas` (por ejemplo, la que agrega o
+    quita trazas); en otro caso un parche.
+
+    Parámetros:
+    -------
+    - fig: Figura nueva.
+    - entradas_completas: Ids de los componentes que cambian la estructura de la figura.
+    - disparadores: Ids que dispararon la actualización (por defecto los del callback actual).
+    - trazas_por_entrada: Diccionario {id: índices de trazas} para las entradas que solo
+      afectan a algunas trazas (p. ej. el tamaño del vector solo cambia el campo).
+    """
+
+    if disparadores is None:
+        disparadores = [prop_id.rsplit('.', 1)[0] for prop_id in ctx.triggered_prop_ids]
+
+    if not disparadores or set(disparadores) & set(entradas_completas):
+        return codificar_figura(fig)
+
+    # Si todas las entradas que cambiaron afectan solo a algunas trazas, enviar solo esas
+    trazas = None
+    trazas_por_entrada = trazas_por_entrada or {}
+    if all(d in trazas_por_entrada for d in disparadores):
+        trazas = set().union(*(trazas_por_entrada[d] for d in disparadores))
+
+    return parche_figura(fig, trazas=trazas)
@@ -0,0 +1,51 @@
+# Librerias
+import inspect
+import numpy as np
+from . import modelos
+from . import estocastico
+
+
+# Modelos que se pueden calcular sin la interfaz (lote.py y la API): nombre -> (función de cálculo
+# con caché de trayectorias, salidas que se entregan). Son las mismas funciones que usan las gráficas.
+MODELOS = {
+    'enfriamiento_newton': (modelos.calcular_enfriamiento_newton, ('t', 'solucion')),
+    'ecuacion_logistica': (modelos.calcular_ecuacion_logistica, ('t', 'solucion')),
+    'decaimiento_radioactivo': (modelos.calcular_decaimiento_radioactivo, ('t', 'solucion')),
+    'crecimiento_exponencial': (modelos.calcular_crecimiento_exponencial, ('t', 'solucion')),
+    'SIR': (modelos.calcular_SIR, ('t', 'S', 'I', 'R')),
+    'lotka_volterra': (modelos.calcular_lotka_volterra, ('t', 'x', 'y')),
+    'lotka_volterra_orbitas': (modelos.orbitas_lotka_volterra, ('t', 'x0', 'y0', 'V0', 'deriva', 'x', 'y')),
+    'SIR_estocastico': (estocastico.resumen_SIR_estocastico, ('t', 'S', 'I', 'R', 'extincion'))
+}
+
+
+# Funciones
+
+def firma(nombre: str):
+    """
+    Retorna la firma (`inspect.Signature`) de la función de cálculo del modelo.
+    """
+    return inspect.signature(MODELOS[nombre][0].__wrapped__)
+
+def convertir(valor, anotacion):
+    """
+    Retorna el valor de un parámetro con el tipo que espera la función: los anotados como
+    int (cant, replicas, ...) pasan a int (ValueError si el valor no es entero); los escalares
+    de NumPy a float o str.
+    """
+    if isinstance(valor, (float, np.floating)) and anotacion is int:
+        if not float(valor).is_integer():
+            raise ValueError(f'Se esperaba un entero: {valor}')
+        return int(valor)
+    if isinstance(valor, np.floating):
+        return float(valor)
+    if isinstance(valor, np.str_):
+        return str(valor)
+    return valor
+
+def faltantes(nombre: str, disponibles):
+    """
+    Retorna los parámetros sin valor por defecto del modelo que no están en `disponibles`.
+    """
+    return [parametro for parametro, datos in firma(nombre).parameters.items()
+            if datos.default is inspect.Parameter.empty and parametro not in disponibles]
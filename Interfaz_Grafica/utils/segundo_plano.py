@@ -0,0 +1,105 @@
+# Librerias
+import functools
+import os
+import tempfile
+import uuid
+import dash
+
+# Administrador de callbacks en segundo plano (opcional: pip install "dash[diskcache]")
+try:
+    import diskcache
+    from dash import DiskcacheManager
+except ImportError:
+    diskcache = None
+
+
+# Cambia en cada arranque, así los resultados guardados de una versión anterior del código no se reutilizan
+CLAVE_ARRANQUE = uuid.uuid4().hex
+
+# Segundos que se guarda el resultado de un callback sin usarse
+EXPIRACION = 3600
+
+
+def crear_disco(directorio: str = None):
+    """
+    Retorna la `diskcache.Cache` que comparten el servidor y los procesos en segundo plano
+    o None si falta `diskcache`.
+
+    Parámetros:
+    -------
+    - directorio: Carpeta de la caché (por defecto TM_CACHE_DIR/segundo_plano o una carpeta temporal).
+    """
+
+    if diskcache is None:
+        return None
+
+    if directorio is None:
+        base = os.environ.get('TM_CACHE_DIR') or tempfile.gettempdir()
+        directorio = os.path.join(base, 'tm_segundo_plano')
+
+    return diskcache.Cache(directorio)
+
+def crear_administrador(disco):
+    """
+    Retorna un `DiskcacheManager` sobre `disco` (cada callback corre en un proceso aparte y los
+    resultados y el progreso pasan por la caché en disco, sin broker externo) o None sin disco.
+
+    Con `cache_by` los resultados quedan guardados por entradas: repetir los mismos
+    parámetros responde desde el disco sin lanzar otro proceso. Las entradas que cambian
+    sin cambiar el resultado (p. ej. n_clicks de un botón) se excluyen de la clave con
+    `cache_args_to_ignore`; si no, ningún resultado se reutiliza. Lo que sirve a varios
+    resultados (p. ej. el análisis simbólico de un sistema con otras condiciones iniciales)
+    se guarda aparte en el mismo disco, ver `cache.BackendDiskcache`.
+
+    Parámetros:
+    -------
+    - disco: `diskcache.Cache` de `crear_disco` (o None).
+    """
+
+    if disco is None:
+        return None
+    return DiskcacheManager(disco, cache_by=[lambda: CLAVE_ARRANQUE], expire=EXPIRACION)
+
+# Caché en disco compartida y administrador de los callbacks en segundo plano
+DISCO = crear_disco()
+ADMINISTRADOR = crear_administrador(DISCO)
+
+
+# Funciones
+
+def _sin_progreso(*args, **kwargs):
+    # Sustituto de set_progress cuando el callback corre en el mismo proceso
+    pass
+
+def callback_segundo_plano(*dependencias, progreso=None, **opciones):
+    """
+    Decorador como `dash.callback` que ejecuta el callback en segundo plano con `ADMINISTRADOR`,
+    sin bloquear al worker web. La función recibe siempre `set_progress` como primer argumento.
+
+    Si el usuario cambia las entradas antes de que termine, Dash cancela el proceso anterior
+    (envía el id del trabajo viejo con la nueva petición). Sin `diskcache` instalado el
+    callback corre normalmente y `set_progress` no hace nada.
+
+    Parámetros:
+    -------
+    - dependencias: Output, Input y State como en `dash.callback`.
+    - progreso: Output (o lista de Output) que recibe los valores de `set_progress`.
+    - opciones: Otros argumentos de `dash.callback` (prevent_initial_call, running, cancel, ...).
+    """
+
+    def decorador(funcion):
+        if ADMINISTRADOR is None:
+            @functools.wraps(funcion)
+            def sincrono(*args):
+                return funcion(_sin_progreso, *args)
+            return dash.callback(*dependencias, **opciones)(sincrono)
+
+        if progreso is None:
+            @functools.wraps(funcion)
+            def sin_progreso(*args):
+                return funcion(_sin_progreso, *args)
+            return dash.callback(*dependencias, background=True, manager=ADMINISTRADOR, **opciones)(sin_progreso)
+
+        return dash.callback(*dependencias, background=True, manager=ADMINISTRADOR, progress=progreso, **opciones)(funcion)
+
+    return decorador
@@ -0,0 +1,284 @@
+# Librerias
+import re
+import numpy as np
+import sympy as sp
+from .cache import BackendDiskcache, CacheLRU
+from .integradores import integrador
+from .segundo_plano import CLAVE_ARRANQUE, DISCO, EXPIRACION
+
+
+# Variables simbólicas del sistema
+x, y = sp.symbols('x y')
+
+# Nombres permitidos en las ecuaciones escritas por el usuario
+NOMBRES_PERMITIDOS = {
+    'x': x, 'y': y,
+    'exp': sp.exp, 'log': sp.log, 'sqrt': sp.sqrt,
+    'sin': sp.sin, 'cos': sp.cos, 'tan': sp.tan,
+    'pi': sp.pi, 'E': sp.E
+}
+
+# Literales numéricos (también en notación científica, p. ej. 1e-3 o 2.5E+4)
+NUMERO = re.compile(r'(?<![\w.])(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+
+# Términos que puede tener una ecuación al expandirla (p. ej. (x + y + 1)**1000 tendría
+# medio millón y sympy tardaría minutos en construirla)
+MAX_TERMINOS = 2000
+
+# Análisis ya compilados (por forma canónica) y atajo desde el texto escrito
+CACHE_ANALISIS = CacheLRU(max_entradas=64)
+CACHE_TEXTOS = CacheLRU(max_entradas=256)
+
+# Equilibrios y autovalores por forma canónica, también en el disco de `segundo_plano`: cada
+# trabajo de la página 7 corre en un proceso nuevo (sin `CACHE_ANALISIS`), y así el mismo
+# sistema con otra condición inicial o tiempo no vuelve a resolverse con sympy
+CACHE_RESOLUCIONES = CacheLRU(
+    max_entradas=64,
+    backend=BackendDiskcache(DISCO, f'resolucion-{CLAVE_ARRANQUE}-', EXPIRACION) if DISCO is not None else None
+)
+
+
+class AnalisisSistema:
+    """
+    Análisis de un sistema x' = f(x, y), y' = g(x, y) compilado una sola vez.
+
+    Parámetros:
+    -------
+    - x_prima, y_prima: Ecuaciones simbólicas.
+    - resolucion: Resultado de `resolver_sistema` ya calculado (None para resolverlo aquí).
+
+    Atributos:
+    -------
+    - x_prima, y_prima: Ecuaciones simbólicas.
+    - puntos_equilibrio: Lista de puntos (x, y) simbólicos.
+    - equilibrios_resueltos: False si sympy no pudo resolver f = g = 0 (la lista queda vacía).
+    - jacobiano: Matriz Jacobiana simbólica.
+    - resultados: Lista de diccionarios con 'punto', 'Jacobiano' (evaluado) y 'autovalores'.
+    - textos: Las mismas cantidades ya convertidas a texto para mostrarlas.
+    - resolucion: Diccionario de `resolver_sistema` con todo lo anterior salvo el Jacobiano.
+    - campo: Función NumPy (X, Y) -> (U, V) del campo de vectores.
+    - jacobiano_num: Función NumPy (x, y) -> matriz Jacobiana 2x2.
+    - rhs: Lado derecho f(t, [x, y]) para los integradores, con el Jacobiano compilado en `rhs.jacobiano`.
+    """
+
+    def __init__(self, x_prima, y_prima, resolucion: dict = None):
+        self.x_prima = x_prima
+        self.y_prima = y_prima
+
+        # Matriz Jacobiana del sistema
+        self.jacobiano = sp.Matrix([
+            [sp.diff(x_prima, x), sp.diff(x_prima, y)],
+            [sp.diff(y_prima, x), sp.diff(y_prima, y)]
+        ])
+
+        # Equilibrios y autovalores (la parte lenta de sympy), salvo que ya vengan resueltos
+        if resolucion is None:
+            resolucion = resolver_sistema(x_prima, y_prima, self.jacobiano)
+        self.resolucion = resolucion
+        self.puntos_equilibrio = resolucion['puntos_equilibrio']
+        self.equilibrios_resueltos = resolucion['equilibrios_resueltos']
+        self.resultados = resolucion['resultados']
+        self.textos = resolucion['textos']
+        self.equilibrios_num = resolucion['equilibrios_num']
+
+        # Versiones compiladas con NumPy
+        f = sp.lambdify((x, y), [x_prima, y_prima], 'numpy')
+        J = sp.lambdify((x, y), self.jacobiano, 'numpy')
+
+        def campo(X, Y):
+            U, V = f(X, Y)
+            return np.broadcast_to(U, np.shape(X)).astype(float), np.broadcast_to(V, np.shape(X)).astype(float)
+
+        def jacobiano_num(x0, y0):
+            return np.asarray(J(x0, y0), dtype=float)
+
+        # Lado derecho para `integradores.py`; el método 'rosenbrock' usa el Jacobiano exacto
+        def rhs(t, z):
+            return np.array(f(z[0], z[1]), dtype=float)
+
+        rhs.jacobiano = lambda t, z: jacobiano_num(z[0], z[1])
+
+        self.campo = campo
+        self.jacobiano_num = jacobiano_num
+        self.rhs = rhs
+
+    def autovalores_num(self, x0: float, y0: float):
+        """
+        Retorna los autovalores numéricos del Jacobiano en (x0, y0), sin usar sympy.
+        """
+        return np.linalg.eigvals(self.jacobiano_num(x0, y0))
+
+    def trayectoria(self, x0: float, y0: float, t: float, cant: int = 1000, metodo: str = 'rosenbrock'):
+        """
+        Retorna (t_values, solución con forma (cant, 2), pasos del integrador) desde (x0, y0) hasta t.
+
+        Parámetros:
+        -------
+        - x0, y0: Condición inicial.
+        - t: Tiempo final.
+        - cant: Cantidad de puntos de salida.
+        - metodo: Integrador de `integradores.METODOS` ('rosenbrock' para sistemas rígidos, 'dopri5', ...).
+        """
+
+        t_values = np.linspace(0, t, cant)
+
+        # Con incluir_pasos cada paso aceptado entrega un bloque (más el bloque inicial)
+        bloques = list(integrador(metodo)(self.rhs, (x0, y0), t_values, incluir_pasos=True))
+        t_todos = np.concatenate([t_bloque for t_bloque, _ in bloques])
+        y_todos = np.concatenate([y_bloque for _, y_bloque in bloques])
+
+        # Los finales de paso quedan entre puntos de salida; solo se retornan los de `t_values`
+        return t_values, y_todos[np.isin(t_todos, t_values)], len(bloques) - 1
+
+
+# Funciones
+
+def resolver_sistema(x_prima, y_prima, jacobiano):
+    """
+    Retorna un diccionario (que se puede guardar con pickle) con los puntos de equilibrio,
+    el Jacobiano evaluado en cada uno con sus autovalores y los textos para la página.
+
+    Parámetros:
+    -------
+    - x_prima, y_prima: Ecuaciones simbólicas.
+    - jacobiano: Matriz Jacobiana simbólica del sistema.
+    """
+
+    # Puntos de equilibrio (solo los que quedan totalmente determinados). Sistemas como
+    # x' = x - cos(x) no tienen solución cerrada: se analizan sin puntos de equilibrio
+    try:
+        soluciones = sp.solve([x_prima, y_prima], (x, y), dict=True)
+        resueltos = True
+    except NotImplementedError:
+        soluciones = []
+        resueltos = False
+    puntos_equilibrio = [(s[x], s[y]) for s in soluciones if x in s and y in s]
+
+    # Evaluamos el Jacobiano en cada punto de equilibrio y hallamos los autovalores
+    resultados = []
+    for punto in puntos_equilibrio:
+        evaluado = jacobiano.subs({x: punto[0], y: punto[1]})
+        resultados.append({
+            'punto': punto,
+            'Jacobiano': evaluado,
+            'autovalores': evaluado.eigenvals()
+        })
+
+    # Textos para la página (así las repeticiones no vuelven a usar sympy)
+    textos = {
+        'puntos_equilibrio': str(puntos_equilibrio) if resueltos else 'sin forma cerrada (sympy no pudo resolver el sistema)',
+        'jacobiano': str(jacobiano),
+        'resultados': [
+            {'punto': str(r['punto']), 'Jacobiano': str(r['Jacobiano']), 'autovalores': str(r['autovalores'])}
+            for r in resultados
+        ]
+    }
+
+    # Puntos de equilibrio reales como números, para graficarlos
+    equilibrios_num = []
+    for punto in puntos_equilibrio:
+        valores = [complex(sp.N(c)) for c in punto]
+        if all(abs(v.imag) < 1e-12 for v in valores):
+            equilibrios_num.append(tuple(v.real for v in valores))
+
+    return {
+        'puntos_equilibrio': puntos_equilibrio,
+        'equilibrios_resueltos': resueltos,
+        'resultados': resultados,
+        'textos': textos,
+        'equilibrios_num': equilibrios_num
+    }
+
+def leer_ecuacion(texto: str):
+    """
+    Convierte el texto de una ecuación en una expresión de sympy.
+
+    Solo se aceptan números, operadores, x, y y las funciones de `NOMBRES_PERMITIDOS`.
+    Lanza ValueError si el texto no es una ecuación válida.
+    """
+    nombres = set(re.findall(r'[A-Za-z_]\w*', NUMERO.sub(' ', texto)))
+    desconocidos = nombres - set(NOMBRES_PERMITIDOS)
+    if desconocidos or not re.fullmatch(r'[\w\s+\-*/^().]*', texto):
+        raise ValueError(f'Ecuación no válida: {texto!r}')
+
+    try:
+        return sp.sympify(texto.replace('^', '**'), locals=NOMBRES_PERMITIDOS)
+    except (sp.SympifyError, SyntaxError, TypeError) as error:
+        raise ValueError(f'Ecuación no válida: {texto!r}') from error
+
+def terminos_expandidos(expresion):
+    """
+    Retorna la cantidad de términos de `sp.expand(expresion)` sin expandirla (una cota
+    superior: no descuenta los términos que se cancelan o se agrupan).
+    Lanza ValueError si la expresión o alguna de sus partes supera `MAX_TERMINOS`.
+    """
+    if expresion.is_Add:
+        terminos = sum(terminos_expandidos(termino) for termino in expresion.args)
+    elif expresion.is_Mul:
+        terminos = 1
+        for factor in expresion.args:
+            terminos *= terminos_expandidos(factor)
+            if terminos > MAX_TERMINOS:
+                break
+    elif expresion.is_Pow and expresion.exp.is_Integer:
+        # Multinomio: (a_1 + ... + a_k)**n tiene C(n + k - 1, k - 1) términos (con n < 0 se
+        # expande el denominador y la fracción queda como un solo término)
+        base = terminos_expandidos(expresion.base)
+        exponente = abs(int(expresion.exp))
+        terminos = sp.binomial(exponente + base - 1, base - 1) if base > 1 else 1
+        if terminos <= MAX_TERMINOS and expresion.exp < 0:
+            terminos = 1
+    else:
+        # Funciones y potencias no enteras: expand también actúa sobre sus argumentos
+        for argumento in expresion.args:
+            terminos_expandidos(argumento)
+        terminos = 1
+
+    if terminos > MAX_TERMINOS:
+        raise ValueError(f'Ecuación demasiado grande: al expandirla tendría más de {MAX_TERMINOS} términos')
+    return int(terminos)
+
+def forma_canonica(x_prima, y_prima):
+    """
+    Retorna una clave que identifica el sistema sin importar cómo se escribió
+    (x*(5-y) y 5*x - x*y dan la misma clave).
+    Lanza ValueError si alguna ecuación es demasiado grande para expandirla (`MAX_TERMINOS`).
+    """
+    terminos_expandidos(x_prima)
+    terminos_expandidos(y_prima)
+    return (sp.srepr(sp.expand(x_prima)), sp.srepr(sp.expand(y_prima)))
+
+def analizar_sistema(f_x: str, f_y: str):
+    """
+    Retorna el `AnalisisSistema` de x' = f_x, y' = f_y.
+
+    Cada sistema distinto se resuelve y compila una sola vez; si el mismo texto
+    ya se analizó se retorna el resultado guardado sin tocar sympy.
+
+    Parámetros:
+    -------
+    - f_x: Texto de la ecuación de x' (p. ej. 'x*(5 - y)').
+    - f_y: Texto de la ecuación de y' (p. ej. 'y*(5 - x)').
+    """
+
+    texto = (re.sub(r'\s+', '', f_x), re.sub(r'\s+', '', f_y))
+    clave = CACHE_TEXTOS.obtener(texto)
+
+    if clave is None:
+        x_prima, y_prima = leer_ecuacion(texto[0]), leer_ecuacion(texto[1])
+        clave = forma_canonica(x_prima, y_prima)
+        CACHE_TEXTOS.guardar(texto, clave)
+    else:
+        x_prima = y_prima = None
+
+    analisis = CACHE_ANALISIS.obtener(clave)
+    if analisis is None:
+        if x_prima is None:
+            x_prima, y_prima = leer_ecuacion(texto[0]), leer_ecuacion(texto[1])
+        resolucion = CACHE_RESOLUCIONES.obtener(clave)
+        analisis = AnalisisSistema(x_prima, y_prima, resolucion)
+        if resolucion is None:
+            CACHE_RESOLUCIONES.guardar(clave, analisis.resolucion)
+        CACHE_ANALISIS.guardar(clave, analisis)
+
+    return analisis
@@ -0,0 +1,98 @@
+# Librerias
+import numpy as np
+
+
+# Funciones
+
+def lttb(x, y, max_puntos: int):
+    """
+    Retorna los índices de los puntos elegidos con Largest-Triangle-Three-Buckets:
+    el primero, el último y en cada cubeta intermedia el punto que forma el triángulo
+    de mayor área con el punto elegido en la cubeta anterior y el promedio de la siguiente.
+    Conserva los picos y la forma de la curva con muchos menos puntos.
+
+    Parámetros:
+    -------
+    - x: Valores del eje horizontal (crecientes).
+    - y: Valores de la serie.
+    - max_puntos: Cantidad máxima de puntos a conservar (al menos 3).
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+
+    if max_puntos >= n or max_puntos < 3:
+        return np.arange(n)
+
+    # Límites de las cubetas: el primer y el último punto van solos
+    bordes = np.floor(np.linspace(1, n - 1, max_puntos - 1)).astype(int)
+
+    # Promedio de cada cubeta (para usarlo como tercer vértice del triángulo)
+    suma_x = np.add.reduceat(x[:n - 1], bordes[:-1])
+    suma_y = np.add.reduceat(y[:n - 1], bordes[:-1])
+    cantidades = np.diff(bordes)
+    promedio_x = np.append(suma_x / cantidades, x[-1])
+    promedio_y = np.append(suma_y / cantidades, y[-1])
+
+    indices = np.empty(max_puntos, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    anterior = 0
+
+    for i in range(max_puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        ax, ay = x[anterior], y[anterior]
+
+        # Doble del área del triángulo (anterior, candidato, promedio de la siguiente cubeta)
+        areas = np.abs((ax - promedio_x[i + 1]) * (y[inicio:fin] - ay) - (ax - x[inicio:fin]) * (promedio_y[i + 1] - ay))
+        anterior = inicio + int(np.argmax(areas))
+        indices[i + 1] = anterior
+
+    return indices
+
+def submuestrear(x, y, max_puntos: int):
+    """
+    Retorna (x, y) reducidos con LTTB a lo más `max_puntos` puntos.
+    """
+
+    indices = lttb(x, y, max_puntos)
+    return np.asarray(x)[indices], np.asarray(y)[indices]
+
+def recortar(t, ventana, *series):
+    """
+    Retorna (t, *series) limitados a la ventana (t_min, t_max), con un punto extra a cada
+    lado para que la curva llegue hasta los bordes. Con `ventana` None retorna todo.
+    """
+
+    if ventana is None:
+        return (t, *series)
+
+    inicio = max(np.searchsorted(t, ventana[0], side='left') - 1, 0)
+    fin = min(np.searchsorted(t, ventana[1], side='right') + 1, len(t))
+    return (t[inicio:fin], *(s[inicio:fin] for s in series))
+
+def ventana_relayout(relayout, eje: str = 'xaxis'):
+    """
+    Retorna la ventana visible del eje a partir del `relayoutData` de un dcc.Graph:
+    (t_min, t_max) si se hizo zoom o se desplazó, `False` si se volvió a la vista completa
+    (doble clic / autoescala) y None si el evento no cambió ese eje (p. ej. 'autosize').
+    """
+
+    if not relayout:
+        return None
+
+    if relayout.get(f'{eje}.autorange'):
+        return False
+
+    if f'{eje}.range[0]' in relayout and f'{eje}.range[1]' in relayout:
+        limites = (relayout[f'{eje}.range[0]'], relayout[f'{eje}.range[1]'])
+    elif f'{eje}.range' in relayout:
+        limites = tuple(relayout[f'{eje}.range'])
+    else:
+        return None
+
+    try:
+        t_min, t_max = sorted(float(v) for v in limites)
+    except (TypeError, ValueError):
+        return None
+    return (t_min, t_max)
@@ -0,0 +1,64 @@
+"""
+Punto de entrada WSGI para producción, pensado para gunicorn con `preload_app`
+(ver gunicorn.conf.py):
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+Este módulo se importa una sola vez, en el proceso maestro, antes de crear los workers:
+
+- importa NumPy, Plotly, SymPy y los módulos de las gráficas (los workers los heredan ya cargados);
+- compila, o carga de la caché en disco, los núcleos de Numba;
+- crea el segmento de memoria compartida de las trayectorias, que heredan todos los workers:
+  una trayectoria calculada por un worker la leen los demás sin volver a calcularla;
+- prepara la carpeta donde los workers comparten sus métricas (TM_METRICAS_DIR).
+
+Variables de entorno:
+
+- TM_CACHE_COMPARTIDA_MB: Tamaño del segmento compartido (por defecto 256; 0 para no usarlo).
+- TM_CACHE_LOCAL_MB: Megabytes de trayectorias que además guarda cada worker en su memoria (por defecto 0).
+- TM_METRICAS_DIR: Carpeta donde cada worker vuelca sus métricas para que /metrics sume las de
+  todos (gunicorn.conf.py usa una carpeta temporal con más de un worker; sin ella cada respuesta
+  de /metrics muestra solo las del worker que la atendió).
+"""
+import importlib
+import os
+
+# Los workers ya ocupan los núcleos: el SIR estocástico no abre un pool de procesos en cada uno
+os.environ.setdefault('TM_PROCESOS', '1')
+
+from utils import cache, metricas, nucleos, segundo_plano
+from app import app
+
+# Bibliotecas pesadas, cargadas antes del fork (se comparten con los workers); solo se importan
+for modulo in ('numpy', 'plotly.io.json', 'utils.funciones', 'utils.simbolico'):
+    importlib.import_module(modulo)
+
+
+# Trayectorias compartidas entre los workers
+if int(os.environ.get('TM_CACHE_COMPARTIDA_MB', '256')) > 0:
+    cache.usar_memoria_compartida(
+        int(os.environ.get('TM_CACHE_COMPARTIDA_MB', '256')) * 2**20,
+        int(os.environ.get('TM_CACHE_LOCAL_MB', '0')) * 2**20
+    )
+
+# Núcleos de Numba listos antes de atender la primera petición
+nucleos.precompilar_nucleos()
+
+# Métricas de todos los workers en /metrics (cada uno vuelca las suyas en esta carpeta)
+if os.environ.get('TM_METRICAS_DIR'):
+    metricas.preparar_directorio(os.environ['TM_METRICAS_DIR'])
+
+# Servidor Flask de la app Dash
+server = app.server
+
+
+def despues_de_fork():
+    """
+    Prepara un worker recién creado: cierra la conexión a la caché de los callbacks en
+    segundo plano heredada del maestro (SQLite no admite compartirla entre procesos;
+    cada worker abre la suya al usarla) y, con TM_METRICAS_DIR, empieza a volcar sus métricas.
+    """
+    if segundo_plano.ADMINISTRADOR is not None:
+        segundo_plano.ADMINISTRADOR.handle.close()
+    if os.environ.get('TM_METRICAS_DIR'):
+        metricas.compartir_metricas(os.environ['TM_METRICAS_DIR'])